@@ -0,0 +1,30 @@
+"""add_execution_policy_and_score
+
+Revision ID: 1f6c7a0e93b4
+Revises: e8a3b6f1d295
+Create Date: 2026-10-18 12:31:40.118364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f6c7a0e93b4'
+down_revision: Union[str, Sequence[str], None] = 'e8a3b6f1d295'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('problem', sa.Column('execution_policy', sa.String(), nullable=True, server_default='parallel_fail_fast'))
+    op.add_column('submission', sa.Column('score', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('submission', 'score')
+    op.drop_column('problem', 'execution_policy')
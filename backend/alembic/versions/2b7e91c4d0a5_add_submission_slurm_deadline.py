@@ -0,0 +1,28 @@
+"""add_submission_slurm_deadline
+
+Revision ID: 2b7e91c4d0a5
+Revises: f7b20c9e4d16
+Create Date: 2026-10-18 18:21:05.674310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7e91c4d0a5'
+down_revision: Union[str, Sequence[str], None] = 'f7b20c9e4d16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('submission', sa.Column('slurm_deadline', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('submission', 'slurm_deadline')
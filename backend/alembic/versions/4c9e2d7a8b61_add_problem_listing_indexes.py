@@ -0,0 +1,41 @@
+"""add_problem_listing_indexes
+
+Revision ID: 4c9e2d7a8b61
+Revises: 1f6c7a0e93b4
+Create Date: 2026-10-18 13:05:12.604218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c9e2d7a8b61'
+down_revision: Union[str, Sequence[str], None] = '1f6c7a0e93b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # lookups by key on every create/update, and the keyset sort of the problem list.
+    # Fails if duplicate keys already exist; those have to be renamed first.
+    op.create_index('ix_problem_problem_key', 'problem', ['problem_key'], unique=True)
+    op.create_index('ix_problem_is_public_problem_key', 'problem', ['is_public', 'problem_key'], unique=False)
+    # must match crud.problem.TAG_ARRAY
+    op.create_index(
+        'ix_problem_tags', 'problem',
+        [sa.text("string_to_array(lower(replace(problem_tags, ' ', '')), ',')")],
+        unique=False, postgresql_using='gin'
+    )
+    op.create_index('ix_test_case_problem_order', 'test_case', ['problem_id', 'order', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_test_case_problem_order', table_name='test_case')
+    op.drop_index('ix_problem_tags', table_name='problem')
+    op.drop_index('ix_problem_is_public_problem_key', table_name='problem')
+    op.drop_index('ix_problem_problem_key', table_name='problem')
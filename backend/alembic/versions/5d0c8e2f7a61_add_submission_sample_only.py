@@ -0,0 +1,31 @@
+"""add_submission_sample_only
+
+Revision ID: 5d0c8e2f7a61
+Revises: 2b7e91c4d0a5
+Create Date: 2026-10-18 21:04:37.219846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0c8e2f7a61'
+down_revision: Union[str, Sequence[str], None] = '2b7e91c4d0a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'submission',
+        sa.Column('sample_only', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('submission', 'sample_only')
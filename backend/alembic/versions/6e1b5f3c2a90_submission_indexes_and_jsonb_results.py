@@ -0,0 +1,75 @@
+"""submission_indexes_and_jsonb_results
+
+Revision ID: 6e1b5f3c2a90
+Revises: 4c9e2d7a8b61
+Create Date: 2026-10-18 13:40:27.915402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1b5f3c2a90'
+down_revision: Union[str, Sequence[str], None] = '4c9e2d7a8b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # time in ms, memory in KB; keep the digits of whatever was stored as text
+    op.alter_column(
+        'submission', 'execute_time',
+        existing_type=sa.String(), type_=sa.Integer(), existing_nullable=True,
+        postgresql_using="NULLIF(regexp_replace(execute_time, '[^0-9]', '', 'g'), '')::integer"
+    )
+    op.alter_column(
+        'submission', 'memory_usage',
+        existing_type=sa.String(), type_=sa.Integer(), existing_nullable=True,
+        postgresql_using="NULLIF(regexp_replace(memory_usage, '[^0-9]', '', 'g'), '')::integer"
+    )
+    op.alter_column(
+        'submission', 'result_details',
+        existing_type=sa.Text(), type_=postgresql.JSONB(astext_type=sa.Text()), existing_nullable=True,
+        postgresql_using='result_details::jsonb'
+    )
+
+    # "my submissions", newest first
+    op.create_index(
+        'ix_submission_user_submit_time', 'submission',
+        ['user_id', sa.text('submit_time DESC')], unique=False
+    )
+    # scoreboard and rejudge: everything of one problem, per user and verdict
+    op.create_index(
+        'ix_submission_problem_user_status', 'submission',
+        ['problem_id', 'user_id', 'status'], unique=False
+    )
+    # per-case analytics, e.g. result_details @> '[{"status": "TLE"}]'
+    op.create_index(
+        'ix_submission_result_details', 'submission', ['result_details'],
+        unique=False, postgresql_using='gin', postgresql_ops={'result_details': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_submission_result_details', table_name='submission')
+    op.drop_index('ix_submission_problem_user_status', table_name='submission')
+    op.drop_index('ix_submission_user_submit_time', table_name='submission')
+    op.alter_column(
+        'submission', 'result_details',
+        existing_type=postgresql.JSONB(astext_type=sa.Text()), type_=sa.Text(), existing_nullable=True,
+        postgresql_using='result_details::text'
+    )
+    op.alter_column(
+        'submission', 'memory_usage',
+        existing_type=sa.Integer(), type_=sa.String(), existing_nullable=True
+    )
+    op.alter_column(
+        'submission', 'execute_time',
+        existing_type=sa.Integer(), type_=sa.String(), existing_nullable=True
+    )
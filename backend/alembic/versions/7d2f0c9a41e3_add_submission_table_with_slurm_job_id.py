@@ -0,0 +1,49 @@
+"""add_submission_table_with_slurm_job_id
+
+Revision ID: 7d2f0c9a41e3
+Revises: 3b8eac3f6172
+Create Date: 2026-10-18 10:12:45.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f0c9a41e3'
+down_revision: Union[str, Sequence[str], None] = '3b8eac3f6172'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('submission',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('problem_id', sa.UUID(), nullable=False),
+    sa.Column('code', sa.Text(), nullable=False),
+    sa.Column('language', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('result_details', sa.Text(), nullable=True),
+    sa.Column('submit_time', sa.DateTime(), nullable=True),
+    sa.Column('execute_time', sa.String(), nullable=True),
+    sa.Column('memory_usage', sa.String(), nullable=True),
+    sa.Column('slurm_job_id', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['problem_id'], ['problem.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # poll_slurm_jobs scans for in-flight submissions every tick
+    op.create_index(
+        'ix_submission_in_flight', 'submission', ['status'],
+        unique=False, postgresql_where=sa.text('slurm_job_id IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_submission_in_flight', table_name='submission')
+    op.drop_table('submission')
@@ -0,0 +1,29 @@
+"""add_testcase_output_mtime
+
+Revision ID: 8f4a1c6d2e07
+Revises: 5d0c8e2f7a61
+Create Date: 2026-10-18 21:37:12.584031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4a1c6d2e07'
+down_revision: Union[str, Sequence[str], None] = '5d0c8e2f7a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing manifests have no mtime and are not trusted until refreshed
+    op.add_column('test_case', sa.Column('output_mtime_ns', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('test_case', 'output_mtime_ns')
@@ -0,0 +1,29 @@
+"""add_submission_timings
+
+Revision ID: 9a2d4e6f8b13
+Revises: 6e1b5f3c2a90
+Create Date: 2026-10-18 15:12:44.208631
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a2d4e6f8b13'
+down_revision: Union[str, Sequence[str], None] = '6e1b5f3c2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('submission', sa.Column('timings', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('submission', 'timings')
@@ -0,0 +1,30 @@
+"""add_problem_compare_mode
+
+Revision ID: b54e19d3c8a7
+Revises: 7d2f0c9a41e3
+Create Date: 2026-10-18 11:03:27.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b54e19d3c8a7'
+down_revision: Union[str, Sequence[str], None] = '7d2f0c9a41e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('problem', sa.Column('compare_mode', sa.String(), nullable=True, server_default='exact'))
+    op.add_column('problem', sa.Column('float_tolerance', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('problem', 'float_tolerance')
+    op.drop_column('problem', 'compare_mode')
@@ -0,0 +1,35 @@
+"""add_scaling_mode
+
+Revision ID: c3f18a7d5e42
+Revises: 9a2d4e6f8b13
+Create Date: 2026-10-18 16:05:12.530947
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f18a7d5e42'
+down_revision: Union[str, Sequence[str], None] = '9a2d4e6f8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('problem', sa.Column('scaling_cores', postgresql.ARRAY(sa.Integer()), nullable=True))
+    op.add_column('problem', sa.Column('scaling_reference_time', sa.Integer(), nullable=True))
+    op.add_column('problem', sa.Column('scaling_min_efficiency', sa.Float(), nullable=True))
+    op.add_column('submission', sa.Column('scaling', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('submission', 'scaling')
+    op.drop_column('problem', 'scaling_min_efficiency')
+    op.drop_column('problem', 'scaling_reference_time')
+    op.drop_column('problem', 'scaling_cores')
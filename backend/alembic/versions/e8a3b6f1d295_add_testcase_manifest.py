@@ -0,0 +1,36 @@
+"""add_testcase_manifest
+
+Revision ID: e8a3b6f1d295
+Revises: b54e19d3c8a7
+Create Date: 2026-10-18 11:48:09.552130
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a3b6f1d295'
+down_revision: Union[str, Sequence[str], None] = 'b54e19d3c8a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('test_case', sa.Column('input_size', sa.BigInteger(), nullable=True))
+    op.add_column('test_case', sa.Column('input_sha256', sa.String(length=64), nullable=True))
+    op.add_column('test_case', sa.Column('output_size', sa.BigInteger(), nullable=True))
+    op.add_column('test_case', sa.Column('output_sha256', sa.String(length=64), nullable=True))
+    op.add_column('test_case', sa.Column('output_lines', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('test_case', 'output_lines')
+    op.drop_column('test_case', 'output_sha256')
+    op.drop_column('test_case', 'output_size')
+    op.drop_column('test_case', 'input_sha256')
+    op.drop_column('test_case', 'input_size')
@@ -0,0 +1,34 @@
+"""add_problem_placement
+
+Revision ID: f7b20c9e4d16
+Revises: c3f18a7d5e42
+Create Date: 2026-10-18 16:48:37.114205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b20c9e4d16'
+down_revision: Union[str, Sequence[str], None] = 'c3f18a7d5e42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('problem', sa.Column('nodes', sa.Integer(), nullable=True, server_default='1'))
+    op.add_column('problem', sa.Column('tasks_per_node', sa.Integer(), nullable=True))
+    op.add_column('problem', sa.Column('cpus_per_task', sa.Integer(), nullable=True, server_default='1'))
+    op.add_column('problem', sa.Column('placement', sa.String(), nullable=True, server_default='shared'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('problem', 'placement')
+    op.drop_column('problem', 'cpus_per_task')
+    op.drop_column('problem', 'tasks_per_node')
+    op.drop_column('problem', 'nodes')
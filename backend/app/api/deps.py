@@ -1,16 +1,15 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core import security
+from app import crud
+from app.core import security, user_cache
 from app.core.config import settings
-from app.db.session import SessionLocal
-from app.models.user import User
+from app.db.session import AsyncSessionLocal, SessionLocal
 from app.schemas.token import TokenPayload
-from app.services.user_service import UserService
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -23,7 +22,11 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)):
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)):
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -35,11 +38,15 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(reusabl
             detail="Could not validate credentials",
         )
     
-    user = db.query(User).filter(User.id == token_data.sub).first()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    # common path: no database round trip, see app.core.user_cache
+    user = await user_cache.get(token_data.sub)
+    if user is None:
+        db_user = await crud.aio.user.get(db, id=token_data.sub)
+        if not db_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        user = await user_cache.put(db_user)
+
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
         
-    return user
\ No newline at end of file
+    return user
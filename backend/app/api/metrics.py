@@ -0,0 +1,114 @@
+import time
+
+import redis
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+from app.core import judge_queue, password_pool, user_cache
+from app.db.session import async_engine, engine
+
+# API-only metrics, served by GET /metrics (app.main); the Celery workers never
+# import this module. Uvicorn runs one process per container, so the default
+# registry is enough; scale out by adding replicas. The pool checkout
+# histograms live next to the engines in app.db.session.
+HTTP_REQUEST_SECONDS = Histogram(
+    "poj_http_request_duration_seconds",
+    "Time from request start until the response is fully sent",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "poj_http_requests_in_flight",
+    "Requests currently being served",
+)
+_ENGINES = {"sync": engine, "async": async_engine.sync_engine}
+
+
+class _StateCollector:
+    """Gauges read on every scrape: pool usage, broker queue depth and in-process caches."""
+
+    def describe(self):
+        # without it, REGISTRY.register() calls collect() (and Redis) at import time
+        return []
+
+    def collect(self):
+        pool_size = GaugeMetricFamily("poj_db_pool_size", "Configured pool size", labels=["pool"])
+        checked_out = GaugeMetricFamily("poj_db_pool_checked_out", "Connections in use", labels=["pool"])
+        overflow = GaugeMetricFamily("poj_db_pool_overflow", "Connections above pool_size", labels=["pool"])
+        for name, db_engine in _ENGINES.items():
+            pool = db_engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue
+            pool_size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], max(0, pool.overflow()))
+        yield pool_size
+        yield checked_out
+        yield overflow
+
+        depth = GaugeMetricFamily(
+            "poj_celery_queue_depth", "Messages waiting in the broker", labels=["queue", "lane"]
+        )
+        try:
+            for lane, stats in judge_queue.lane_metrics().items():
+                depth.add_metric(["compile", lane], stats["depth"])
+            depth.add_metric(["run", ""], judge_queue.queue_depth("run"))
+        except redis.RedisError as e:
+            print(f"[Metrics] Failed to read queue depth: {e}")
+        yield depth
+
+        cache = GaugeMetricFamily("poj_user_cache", "Authenticated-user cache counters", labels=["stat"])
+        for stat, value in user_cache.cache_stats().items():
+            cache.add_metric([stat], value)
+        yield cache
+
+        hashing = GaugeMetricFamily("poj_password_pool", "Password hashing pool", labels=["stat"])
+        for stat, value in password_pool.pool_stats().items():
+            hashing.add_metric([stat], value)
+        yield hashing
+
+
+REGISTRY.register(_StateCollector())
+
+
+def render() -> tuple:
+    """(body, content type) of the current metrics."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware, so streamed responses (SSE) are timed to their last
+    byte and nothing is buffered. Requests are labelled by route template,
+    never by raw path, to keep the label set bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            # FastAPI sets scope["route"] once a route matched
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"],
+                getattr(route, "path_format", None) or "unmatched",
+                str(status)
+            ).observe(time.perf_counter() - start)
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users, login, problems
+from app.api.v1.endpoints import users, login, problems, submissions, scoreboard
 
 api_router = APIRouter()
 
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(login.router, prefix="/login", tags=["login"])
-api_router.include_router(problems.router, prefix="/problems", tags=["problems"])
\ No newline at end of file
+api_router.include_router(problems.router, prefix="/problems", tags=["problems"])
+api_router.include_router(submissions.router, prefix="/submissions", tags=["submissions"])
+api_router.include_router(scoreboard.router, prefix="/scoreboard", tags=["scoreboard"])
@@ -1,27 +1,49 @@
 from datetime import timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, models, schemas
 from app.api import deps
-from app.core import security
+from app.core import password_pool, rate_limit, security
 from app.core.config import settings
 from app.services.user_service import UserService
 
 router = APIRouter()
 
 @router.post("/access-token", response_model=schemas.Token)
-def login_access_token(
-    db: Session = Depends(deps.get_db),
+async def login_access_token(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
 
-    user = UserService.authenticate_user(
-        db, email=form_data.username, password=form_data.password
-    )
+    # throttle before bcrypt, so a flood costs a Redis INCR rather than a hash
+    client_ip = request.client.host if request.client else "unknown"
+    for key, limit in (
+        (f"login:ip:{client_ip}", settings.LOGIN_RATE_LIMIT_IP),
+        (f"login:account:{form_data.username.lower()}", settings.LOGIN_RATE_LIMIT_ACCOUNT),
+    ):
+        retry_after = await rate_limit.hit(key, limit, settings.LOGIN_RATE_WINDOW)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    try:
+        user = await UserService.authenticate_user(
+            db, email=form_data.username, password=form_data.password
+        )
+    except password_pool.PasswordPoolBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Login is busy, please retry",
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
     if not user:
         raise HTTPException(
@@ -1,30 +1,71 @@
-from typing import List, Any
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import schemas, crud
 from app.api import deps
+from app.core import problem_cache
 from app.models.user import User
+from app.services.rejudge_service import RejudgeService
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.ProblemSummary])
-def read_problems(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+async def _cached_response(key: str, version: Optional[int], if_none_match: Optional[str], load) -> Response:
+    """
+    304 when the client's ETag is current, else the cached body, else load()
+    (which builds the JSON body from the database) and cache it.
+    version None means the cache is unavailable and every request loads.
+    """
+    if version is None:
+        return Response(content=await load(), media_type="application/json")
+
+    tag = problem_cache.etag(key)
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if problem_cache.etag_matches(if_none_match, tag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = await problem_cache.get_body(key)
+    if body is None:
+        body = await load()
+        await problem_cache.store_body(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/", response_model=schemas.Page[schemas.ProblemSummary])
+async def read_problems(
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    tag: Optional[str] = None,
+    is_public: Optional[bool] = None,
+    problem_key: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None),
 ):
     """
-    取得所有題目 (不包含詳細敘述與測資)
+    取得題目列表 (依 problem_key 排序, 以 cursor 分頁; 可依標籤/公開/代號篩選)
     """
-    problems = crud.problem.get_all(db, skip=skip, limit=limit)
-    return problems
+    version = await problem_cache.list_version()
+
+    async def load():
+        try:
+            problems, next_cursor = await crud.aio.problem.get_all(
+                db, limit=limit, cursor=cursor,
+                tag=tag, is_public=is_public, problem_key=problem_key
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return schemas.Page[schemas.ProblemSummary].model_validate(
+            {"items": problems, "next_cursor": next_cursor}, from_attributes=True
+        ).model_dump_json()
+
+    key = f"problems:v{version}:{cursor}:{limit}:{tag}:{is_public}:{problem_key}"
+    return await _cached_response(key, version, if_none_match, load)
 
 @router.post("/", response_model=schemas.Problem)
-def create_problem(
+async def create_problem(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     problem_in: schemas.ProblemCreate,
     current_user: User = Depends(deps.get_current_user),
 ):
@@ -32,7 +73,7 @@ def create_problem(
     建立新題目 (需要登入)
     """
 
-    if crud.problem.get_by_problem_key(db, problem_key=problem_in.problem_key):
+    if await crud.aio.problem.get_by_problem_key(db, problem_key=problem_in.problem_key):
         raise HTTPException(
             status_code=400,
             detail="Problem key already exists (e.g. 'A' or 'HW1_P1' is taken)."
@@ -42,27 +83,35 @@ def create_problem(
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
 
-    problem = crud.problem.create(db=db, obj_in=problem_in)
+    problem = await crud.aio.problem.create(db=db, obj_in=problem_in)
     return problem
 
 @router.get("/{problem_id}", response_model=schemas.Problem)
-def read_problem(
+async def read_problem(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     problem_id: UUID,
+    if_none_match: Optional[str] = Header(default=None),
 ):
     """
     根據 ID 取得題目資料 (包含 description 與 test_cases)
     """
-    problem = crud.problem.get_by_id(db, problem_id=problem_id)
-    if not problem:
-        raise HTTPException(status_code=404, detail="Problem not found")
-    return problem
+    version = await problem_cache.problem_version(problem_id)
+
+    async def load():
+        problem = await crud.aio.problem.get_by_id(db, problem_id=problem_id)
+        if not problem:
+            raise HTTPException(status_code=404, detail="Problem not found")
+        return schemas.Problem.model_validate(problem).model_dump_json()
+
+    return await _cached_response(
+        f"problem:{problem_id}:v{version}", version, if_none_match, load
+    )
 
 @router.put("/{problem_id}", response_model=schemas.Problem)
-def update_problem(
+async def update_problem(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     problem_id: UUID,
     problem_in: schemas.ProblemUpdate,
     current_user: User = Depends(deps.get_current_user),
@@ -70,50 +119,138 @@ def update_problem(
     """
     更新題目資訊
     """
-    problem = crud.problem.get_by_id(db, problem_id=problem_id)
+    problem = await crud.aio.problem.get_by_id(db, problem_id=problem_id)
     if not problem:
         raise HTTPException(status_code=404, detail="Problem not found")
 
     if problem_in.problem_key and problem_in.problem_key != problem.problem_key:
-        if crud.problem.get_by_problem_key(db, problem_key=problem_in.problem_key):
+        if await crud.aio.problem.get_by_problem_key(db, problem_key=problem_in.problem_key):
              raise HTTPException(status_code=400, detail="Problem key already exists.")
 
-    problem = crud.problem.update(db=db, db_obj=problem, obj_in=problem_in)
+    problem = await crud.aio.problem.update(db=db, db_obj=problem, obj_in=problem_in)
     return problem
 
 @router.delete("/{problem_id}", response_model=schemas.Problem)
-def delete_problem(
+async def delete_problem(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     problem_id: UUID,
     current_user: User = Depends(deps.get_current_user),
 ):
     """
     刪除題目
     """
-    problem = crud.problem.get_by_id(db, problem_id=problem_id)
+    problem = await crud.aio.problem.get_by_id(db, problem_id=problem_id)
     if not problem:
         raise HTTPException(status_code=404, detail="Problem not found")
         
-    problem = crud.problem.delete(db=db, db_obj=problem)
+    problem = await crud.aio.problem.delete(db=db, db_obj=problem)
     return problem
 
-@router.get("/{problem_id}/testcases", response_model=List[schemas.TestCase])
-def read_problem_testcases(
+@router.get("/{problem_id}/testcases", response_model=schemas.Page[schemas.TestCaseAdmin])
+async def read_problem_testcases(
     problem_id: UUID,
+    db: AsyncSession = Depends(deps.get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=500),
+    current_user: User = Depends(deps.get_current_user),
+):
+    problem = await crud.aio.problem.get_by_id(db, problem_id=problem_id)
+    if not problem:
+        raise HTTPException(status_code=404, detail="Problem not found")
+
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    try:
+        testcases, next_cursor = await crud.aio.testcase.get_multi_by_problem(
+            db, problem_id=problem_id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": testcases, "next_cursor": next_cursor}
+
+@router.post("/{problem_id}/testcases/refresh")
+def refresh_problem_testcases(
+    *,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    problem_id: UUID,
     current_user: User = Depends(deps.get_current_user),
 ):
+    """
+    測資檔案更新後重新計算 manifest (sha256 / 大小)
+    """
+    # hashing is file I/O on the sync crud, so this one runs in the threadpool too
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
     problem = crud.problem.get_by_id(db, problem_id=problem_id)
     if not problem:
         raise HTTPException(status_code=404, detail="Problem not found")
 
+    return {"refreshed": crud.testcase.refresh_manifests(db, problem_id=problem_id)}
+
+@router.get("/{problem_id}/resource-stats", response_model=schemas.ResourceStats)
+async def read_problem_resource_stats(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    problem_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    已通過提交的執行時間與記憶體分布 (用於調整 time_limit / memory_limit)
+    """
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    testcases = crud.testcase.get_multi_by_problem(
-        db, problem_id=problem_id, skip=skip, limit=limit
-    )
-    return testcases
\ No newline at end of file
+    problem = await crud.aio.problem.get_by_id(db, problem_id=problem_id)
+    if not problem:
+        raise HTTPException(status_code=404, detail="Problem not found")
+
+    stats = await crud.aio.submission.resource_stats(db, problem_id=problem_id)
+    return {
+        "problem_id": problem.id,
+        "time_limit": problem.time_limit,
+        "memory_limit": problem.memory_limit,
+        **stats,
+    }
+
+# The rejudge endpoints stay plain `def`: RejudgeService runs on the sync crud
+# and the sync Redis / Celery clients it shares with the worker. FastAPI runs
+# them in its threadpool, so they never block the event loop.
+@router.post("/{problem_id}/rejudge", response_model=schemas.RejudgeProgress)
+def rejudge_problem(
+    *,
+    db: Session = Depends(deps.get_db),
+    problem_id: UUID,
+    rejudge_in: schemas.RejudgeRequest = schemas.RejudgeRequest(),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    重新評測此題所有已完成的提交 (低優先權批次送出)
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    problem = crud.problem.get_by_id(db, problem_id=problem_id)
+    if not problem:
+        raise HTTPException(status_code=404, detail="Problem not found")
+
+    return RejudgeService.start(db, problem_id=problem_id, statuses=rejudge_in.statuses)
+
+@router.get("/{problem_id}/rejudge/{batch_id}", response_model=schemas.RejudgeProgress)
+def read_rejudge_progress(
+    problem_id: UUID,
+    batch_id: str,
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    查詢重新評測進度 (done/total 與每秒處理量)
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    progress = RejudgeService.progress(batch_id)
+    if not progress or progress["problem_id"] != str(problem_id):
+        raise HTTPException(status_code=404, detail="Rejudge not found")
+    return progress
@@ -0,0 +1,87 @@
+import asyncio
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import schemas, crud
+from app.api import deps
+from app.models.user import User
+from app.services.scoreboard_service import ScoreboardService
+
+router = APIRouter()
+
+def _require_superuser(user: User) -> None:
+    if not user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+async def _board(db: AsyncSession, offset: int, limit: int, live: bool) -> dict:
+    # the ranking itself is read from Redis; only the page's names come from Postgres
+    board = await asyncio.to_thread(ScoreboardService.page, offset, limit, live)
+    users = await crud.aio.user.get_many(db, [UUID(e["user_id"]) for e in board["entries"]])
+    by_id = {str(u.id): u for u in users}
+    for entry in board["entries"]:
+        user = by_id.get(entry["user_id"])
+        if user:
+            entry["student_id"] = user.student_id
+            entry["full_name"] = user.full_name
+    return board
+
+@router.get("/", response_model=schemas.Scoreboard)
+async def read_scoreboard(
+    db: AsyncSession = Depends(deps.get_async_db),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+):
+    """
+    取得排行榜 (封榜期間只顯示封榜前的提交)
+    """
+    return await _board(db, offset, limit, live=False)
+
+@router.get("/live", response_model=schemas.Scoreboard)
+async def read_live_scoreboard(
+    db: AsyncSession = Depends(deps.get_async_db),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    取得即時排行榜 (含封榜後的提交, 需要管理員)
+    """
+    _require_superuser(current_user)
+    return await _board(db, offset, limit, live=True)
+
+@router.post("/freeze")
+def freeze_scoreboard(
+    freeze_in: schemas.ScoreboardFreeze = schemas.ScoreboardFreeze(),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    封榜
+    """
+    _require_superuser(current_user)
+    ScoreboardService.freeze(db, freeze_in.at)
+    return {"frozen": True}
+
+@router.post("/unfreeze")
+def unfreeze_scoreboard(
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    解除封榜
+    """
+    _require_superuser(current_user)
+    ScoreboardService.unfreeze()
+    return {"frozen": False}
+
+@router.post("/rebuild", response_model=schemas.ScoreboardRebuild)
+def rebuild_scoreboard(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    由提交紀錄重建排行榜 (並回報與增量結果不一致的使用者數)
+    """
+    _require_superuser(current_user)
+    return ScoreboardService.rebuild(db)
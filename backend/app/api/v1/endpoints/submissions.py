@@ -0,0 +1,186 @@
+import asyncio
+import json
+from contextlib import aclosing
+from typing import Any, List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from jose import jwt, JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas, crud
+from app.api import deps
+from app.core.config import settings
+from app.core.events import latest_status, publish_status, stream_status
+from app.core.judge_queue import LANE_NORMAL, LANE_SAMPLE, enqueue_judge
+from app.db.session import AsyncSessionLocal
+from app.models.submission import SubmissionStatus
+from app.models.user import User
+
+router = APIRouter()
+
+def _can_view(user: User, owner_id: Any) -> bool:
+    return user.is_superuser or str(user.id) == str(owner_id)
+
+def _queue_submission(submission_id: UUID, user_id: UUID, lane: str) -> None:
+    publish_status(str(submission_id), SubmissionStatus.PENDING, user_id=user_id)
+    enqueue_judge(submission_id, user_id, lane=lane)
+
+@router.post("/", response_model=schemas.SubmissionSummary)
+async def create_submission(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    submission_in: schemas.SubmissionCreate,
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    提交程式碼並排入評測佇列
+    """
+    problem = await crud.aio.problem.get_by_id(db, problem_id=submission_in.problem_id)
+    if not problem or (not problem.is_public and not current_user.is_superuser):
+        raise HTTPException(status_code=404, detail="Problem not found")
+    if submission_in.sample_only and not any(case.is_sample for case in problem.test_cases):
+        raise HTTPException(status_code=400, detail="Problem has no sample test cases")
+
+    submission = await crud.aio.submission.create(db, obj_in=submission_in, user_id=current_user.id)
+    # the broker and the status channel are synchronous Redis clients
+    await asyncio.to_thread(
+        _queue_submission,
+        submission.id,
+        current_user.id,
+        LANE_SAMPLE if submission.sample_only else LANE_NORMAL
+    )
+    return submission
+
+@router.get("/", response_model=List[schemas.SubmissionSummary])
+async def read_my_submissions(
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = 0,
+    limit: int = 50,
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    取得自己的提交紀錄
+    """
+    return await crud.aio.submission.get_multi_by_user(db, user_id=current_user.id, skip=skip, limit=limit)
+
+@router.get("/{submission_id}", response_model=schemas.Submission)
+async def read_submission(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    submission_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    取得提交的完整結果 (包含程式碼與每筆測資結果)
+    """
+    submission = await crud.aio.submission.get(db, id=submission_id)
+    if not submission or not _can_view(current_user, submission.user_id):
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return submission
+
+@router.get("/{submission_id}/status", response_model=schemas.SubmissionStatusSnapshot)
+async def read_submission_status(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    submission_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    取得評測狀態 (由 Redis 快照讀取, 不查資料庫)
+    """
+    snapshot = await latest_status(str(submission_id))
+    if snapshot and snapshot.get("user_id"):
+        if not _can_view(current_user, snapshot["user_id"]):
+            raise HTTPException(status_code=404, detail="Submission not found")
+        return snapshot
+
+    # snapshot expired (or predates the owner field): fall back to the database
+    submission = await crud.aio.submission.get(db, id=submission_id)
+    if not submission or not _can_view(current_user, submission.user_id):
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return {
+        "submission_id": submission.id,
+        "status": submission.status,
+        "score": submission.score,
+        "cases": (snapshot or {}).get("cases", []),
+    }
+
+async def _authorize_stream(db: AsyncSession, submission_id: UUID, user: User) -> None:
+    snapshot = await latest_status(str(submission_id))
+    owner_id = snapshot.get("user_id") if snapshot else None
+    if owner_id is None:
+        submission = await crud.aio.submission.get(db, id=submission_id)
+        if not submission:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        owner_id = submission.user_id
+    if not _can_view(user, owner_id):
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+@router.get("/{submission_id}/events")
+async def stream_submission_events(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    request: Request,
+    submission_id: UUID,
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    以 Server-Sent Events 推送評測狀態, 直到評測結束
+    """
+    await _authorize_stream(db, submission_id, current_user)
+    # don't hold a pooled connection for the lifetime of the stream
+    await db.close()
+
+    async def event_source():
+        async with aclosing(stream_status(str(submission_id))) as events:
+            async for event in events:
+                if await request.is_disconnected():
+                    return
+                if event is None:
+                    # SSE comment: keeps proxies from timing out an idle stream
+                    yield ": ping\n\n"
+                else:
+                    yield f"data: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+@router.websocket("/{submission_id}/ws")
+async def submission_ws(websocket: WebSocket, submission_id: UUID, token: str):
+    """
+    以 WebSocket 推送評測狀態 (token 以 query string 傳入)
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            user = await crud.aio.user.get(db, id=UUID(payload.get("sub")))
+            if not user or not user.is_active:
+                raise HTTPException(status_code=403, detail="Could not validate credentials")
+            await _authorize_stream(db, submission_id, user)
+        except (JWTError, ValueError, TypeError, HTTPException):
+            await websocket.close(code=1008)
+            return
+
+    await websocket.accept()
+    # the client never sends anything; receive() only returns once it has gone
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    try:
+        async with aclosing(stream_status(str(submission_id))) as events:
+            async for event in events:
+                if disconnected.done():
+                    return
+                if event is not None:
+                    await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
@@ -1,23 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import schemas
 from app.api import deps
+from app.core import password_pool
 from app.services.user_service import UserService
 from app.models.user import User
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.User)
-def create_user(
+async def create_user(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     user_in: schemas.UserCreate,
 ):
     """
     Register a new user
     """
     try:
-        user = UserService.register_user(db=db, user_in=user_in)
+        user = await UserService.register_user(db=db, user_in=user_in)
         return user
         
     except ValueError as e:
@@ -25,7 +26,13 @@ def create_user(
             status_code=400,
             detail=str(e),
         )
+    except password_pool.PasswordPoolBusy as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Registration is busy, please retry",
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
 @router.get("/me", response_model=schemas.User)
-def read_users_me(current_user: User = Depends(deps.get_current_user)):
+async def read_users_me(current_user: User = Depends(deps.get_current_user)):
     return current_user
@@ -13,7 +13,32 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="Asia/Taipei",
     enable_utc=True,
-    imports=["app.worker.tasks"]
+    imports=["app.worker.tasks"],
+    # compile workers are sized to local CPUs, run workers to cluster capacity
+    task_routes={
+        "judge_submission": {"queue": "compile"},
+        "compile_submission": {"queue": "compile"},
+        "run_submission": {"queue": "run"},
+        "poll_slurm_jobs": {"queue": "run"},
+        "check_submission": {"queue": "run"},
+        "scale_submission": {"queue": "run"},
+        "collect_scaling": {"queue": "run"},
+        "enqueue_rejudge_chunk": {"queue": "compile"},
+    },
+    # priority lanes, see app.core.judge_queue
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "sep": ":",
+        "queue_order_strategy": "priority",
+    },
+    task_default_priority=3,
+    worker_prefetch_multiplier=1,
+    beat_schedule={
+        "poll-slurm-jobs": {
+            "task": "poll_slurm_jobs",
+            "schedule": settings.SLURM_POLL_INTERVAL,
+        },
+    },
 )
 
 print(f"Loaded Celery with Broker: {settings.REDIS_URL}")
\ No newline at end of file
@@ -15,6 +15,14 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    ASYNC_SQLALCHEMY_DATABASE_URI: Optional[str] = None
+
+    # Async engine used by the API; the Celery worker keeps the sync engine
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
 
     # ==========================================
     # Redis Settings (Message Queue)
@@ -24,6 +32,30 @@ class Settings(BaseSettings):
     
     REDIS_URL: Optional[str] = None
 
+    # get_current_user cache: per-process LRU with a TTL, then the shared Redis copy
+    USER_CACHE_LOCAL_TTL: float = 5.0
+    USER_CACHE_LOCAL_MAX: int = 10000
+    USER_CACHE_TTL: int = 300
+
+    # submission status streams (SSE / WebSocket): idle ping interval and max lifetime, seconds
+    STATUS_STREAM_HEARTBEAT: float = 15.0
+    STATUS_STREAM_MAX_SECONDS: float = 1800.0
+
+    # ==========================================
+    # Judge Settings
+    # ==========================================
+    SLURM_POLL_INTERVAL: float = 2.0
+    DATA_DIR: str = "/data"
+
+    # ==========================================
+    # Login
+    # ==========================================
+    PASSWORD_HASH_WORKERS: int = 0          # 0: one bcrypt process per core
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64     # hashes waiting beyond the busy workers before 429
+    LOGIN_RATE_WINDOW: int = 60
+    LOGIN_RATE_LIMIT_ACCOUNT: int = 10      # attempts per account per window
+    LOGIN_RATE_LIMIT_IP: int = 60           # attempts per client IP per window
+
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 180
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -39,6 +71,12 @@ class Settings(BaseSettings):
                 f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
                 f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
             )
+
+        if self.ASYNC_SQLALCHEMY_DATABASE_URI is None:
+            self.ASYNC_SQLALCHEMY_DATABASE_URI = (
+                f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+                f"@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+            )
         
         if self.REDIS_URL is None:
             self.REDIS_URL = f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/0"
@@ -0,0 +1,124 @@
+import json
+import time
+from typing import AsyncIterator, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.core.judge_queue import get_redis
+from app.models.submission import SubmissionStatus
+
+# Submission status push: the worker publishes every transition on a per-submission
+# channel and keeps the latest snapshot next to it, so readers never query Postgres.
+SNAPSHOT_TTL = 24 * 3600
+IN_FLIGHT_STATUSES = {
+    SubmissionStatus.PENDING.value, SubmissionStatus.JUDGING.value, SubmissionStatus.CHECKING.value
+}
+
+_aioredis: Optional[aioredis.Redis] = None
+
+
+def _channel(submission_id: str) -> str:
+    return f"poj:submission:{submission_id}"
+
+
+def _snapshot_key(submission_id: str) -> str:
+    return f"poj:submission:{submission_id}:state"
+
+
+def get_async_redis() -> aioredis.Redis:
+    global _aioredis
+    if _aioredis is None:
+        _aioredis = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _aioredis
+
+
+def publish_status(submission_id: str, status: str, **fields) -> None:
+    """
+    Publish a status transition. Per-case results are published with a `case`
+    field and do not replace the snapshot's status. Never raises: a Redis
+    hiccup must not fail a judge.
+    """
+    status = getattr(status, "value", status)
+    event = {"submission_id": str(submission_id), "status": status, "ts": time.time(), **fields}
+    payload = json.dumps(event, default=str)
+
+    try:
+        r = get_redis()
+        pipe = r.pipeline()
+        if "case" in fields:
+            pipe.hset(_snapshot_key(submission_id), f"case:{fields['case']['index']}", json.dumps(fields["case"]))
+        else:
+            if status == SubmissionStatus.PENDING.value:
+                # a new (or re-)judge starts from an empty snapshot
+                pipe.delete(_snapshot_key(submission_id))
+            mapping = {"status": status, "event": payload}
+            if "user_id" in fields:
+                # owner, so the status endpoints can authorize without Postgres
+                mapping["user_id"] = str(fields["user_id"])
+            pipe.hset(_snapshot_key(submission_id), mapping=mapping)
+        pipe.expire(_snapshot_key(submission_id), SNAPSHOT_TTL)
+        pipe.publish(_channel(submission_id), payload)
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"[Events] Failed to publish {status} for {submission_id}: {e}")
+
+
+def _snapshot(submission_id: str, data: dict) -> Optional[dict]:
+    if not data:
+        return None
+
+    snapshot = json.loads(data["event"]) if "event" in data else {"submission_id": str(submission_id)}
+    cases = sorted(
+        (json.loads(value) for key, value in data.items() if key.startswith("case:")),
+        key=lambda case: case["index"]
+    )
+    snapshot["cases"] = cases
+    snapshot["user_id"] = data.get("user_id")
+    return snapshot
+
+
+async def latest_status(submission_id: str) -> Optional[dict]:
+    return _snapshot(submission_id, await get_async_redis().hgetall(_snapshot_key(submission_id)))
+
+
+async def stream_status(submission_id: str) -> AsyncIterator[Optional[dict]]:
+    """
+    Yields the current snapshot, then every event published for the submission
+    until it reaches a final status. Yields None after STATUS_STREAM_HEARTBEAT
+    seconds without an event, so callers can ping the client and notice it is
+    gone, and stops after STATUS_STREAM_MAX_SECONDS in any case.
+    """
+    deadline = time.monotonic() + settings.STATUS_STREAM_MAX_SECONDS
+    r = get_async_redis()
+    pubsub = r.pubsub()
+    # subscribe before reading the snapshot so no transition falls in between
+    await pubsub.subscribe(_channel(submission_id))
+    try:
+        data = await r.hgetall(_snapshot_key(submission_id))
+        if "event" in data:
+            snapshot = json.loads(data["event"])
+            yield snapshot
+            if snapshot["status"] not in IN_FLIGHT_STATUSES:
+                return
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            # subscribe confirmations come back as messages too (skipped below),
+            # so None always means the timeout ran out
+            message = await pubsub.get_message(timeout=min(settings.STATUS_STREAM_HEARTBEAT, remaining))
+            if message is None:
+                yield None
+                continue
+            if message["type"] != "message":
+                continue
+            event = json.loads(message["data"])
+            yield event
+            if "case" not in event and event["status"] not in IN_FLIGHT_STATUSES:
+                return
+    finally:
+        await pubsub.unsubscribe(_channel(submission_id))
+        await pubsub.aclose()
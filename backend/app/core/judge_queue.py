@@ -0,0 +1,119 @@
+import time
+from typing import Dict, Optional
+
+import redis
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+
+# Priority lanes. Celery/Redis priorities run 0 (first) .. 9 (last); each lane
+# owns a band and a user's recent activity pushes them down inside that band.
+LANE_SAMPLE = "sample"
+LANE_NORMAL = "normal"
+LANE_REJUDGE = "rejudge"
+
+LANES = {
+    # lane: (lowest priority value, highest priority value, Slurm --nice base)
+    LANE_SAMPLE: (0, 2, 0),
+    LANE_NORMAL: (3, 6, 100),
+    LANE_REJUDGE: (7, 9, 1000),
+}
+
+FAIR_SHARE_WINDOW = 600      # seconds of history that count against a user
+FAIR_SHARE_STEP = 5          # submissions per priority step
+NICE_PER_STEP = 10
+
+_redis: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis
+
+
+def _fair_share_step(lane: str, user_id: str) -> int:
+    """How many steps to push this user down: their submissions in the last window."""
+    key = f"poj:fair:{lane}:{user_id}"
+    r = get_redis()
+    pipe = r.pipeline()
+    pipe.incr(key)
+    pipe.expire(key, FAIR_SHARE_WINDOW, nx=True)
+    recent = pipe.execute()[0]
+    return (recent - 1) // FAIR_SHARE_STEP
+
+
+def schedule(lane: str, user_id: str) -> Dict[str, int]:
+    """Celery priority and Slurm nice value for the next submission of user_id in lane."""
+    low, high, nice_base = LANES[lane]
+    step = _fair_share_step(lane, user_id)
+    return {
+        "priority": min(low + step, high),
+        "nice": nice_base + step * NICE_PER_STEP,
+    }
+
+
+def enqueue_judge(submission_id: str, user_id: str, lane: str = LANE_NORMAL):
+    if lane not in LANES:
+        raise ValueError(f"Unknown lane: {lane}")
+
+    plan = schedule(lane, str(user_id))
+    get_redis().hincrby(f"poj:lane:{lane}", "enqueued", 1)
+    return celery_app.send_task(
+        "judge_submission",
+        args=[str(submission_id)],
+        kwargs={
+            "lane": lane,
+            "nice": plan["nice"],
+            "priority": plan["priority"],
+            "enqueued_at": time.time(),
+        },
+        priority=plan["priority"],
+    )
+
+
+def record_wait(lane: str, enqueued_at: Optional[float]) -> None:
+    """Called by the worker when it picks a judge task up."""
+    if enqueued_at is None or lane not in LANES:
+        return
+    wait = max(0.0, time.time() - enqueued_at)
+    try:
+        pipe = get_redis().pipeline()
+        pipe.hincrby(f"poj:lane:{lane}", "started", 1)
+        pipe.hincrbyfloat(f"poj:lane:{lane}", "wait_seconds_sum", wait)
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"[JudgeQueue] Failed to record wait time: {e}")
+
+
+def _queue_depth(r: redis.Redis, queue: str, low: int, high: int) -> int:
+    # kombu keeps one Redis list per priority step: `queue` for 0, `queue<sep><n>` otherwise
+    sep = celery_app.conf.broker_transport_options.get("sep", "\x06\x16")
+    depth = 0
+    for priority in range(low, high + 1):
+        depth += r.llen(queue if priority == 0 else f"{queue}{sep}{priority}")
+    return depth
+
+
+def queue_depth(queue: str) -> int:
+    """Messages waiting on a Celery queue, across all priorities."""
+    return _queue_depth(get_redis(), queue, 0, 9)
+
+
+def lane_metrics() -> Dict[str, Dict[str, float]]:
+    """Per lane: messages waiting on the compile queue, and queue wait so far."""
+    r = get_redis()
+    metrics = {}
+    for lane, (low, high, _) in LANES.items():
+        stats = r.hgetall(f"poj:lane:{lane}")
+        started = int(stats.get("started", 0))
+        wait_sum = float(stats.get("wait_seconds_sum", 0))
+        metrics[lane] = {
+            "depth": _queue_depth(r, "compile", low, high),
+            "enqueued": int(stats.get("enqueued", 0)),
+            "started": started,
+            "wait_seconds_sum": wait_sum,
+            "wait_seconds_avg": wait_sum / started if started else 0.0,
+        }
+    return metrics
@@ -0,0 +1,75 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+# bcrypt runs in a process pool sized to the cores, so a login burst uses the
+# CPUs without stalling the event loop. Admission control caps the backlog:
+# once `workers + PASSWORD_HASH_QUEUE_LIMIT` hashes are in flight new ones are
+# refused with a Retry-After estimate instead of queueing without bound.
+_pool: Optional[ProcessPoolExecutor] = None
+_in_flight = 0
+_avg_seconds = 0.25   # running average of one hash, seeds the Retry-After estimate
+
+
+class PasswordPoolBusy(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Password hashing is saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _workers() -> int:
+    return settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that runs an event loop and threads is unsafe
+        _pool = ProcessPoolExecutor(
+            max_workers=_workers(),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def pool_stats() -> dict:
+    return {"workers": _workers(), "in_flight": _in_flight, "avg_seconds": _avg_seconds}
+
+
+async def _run(fn, *args):
+    global _in_flight, _avg_seconds
+
+    workers = _workers()
+    if _in_flight >= workers + settings.PASSWORD_HASH_QUEUE_LIMIT:
+        waves = (_in_flight - workers + 1) / workers
+        raise PasswordPoolBusy(max(1, math.ceil(waves * _avg_seconds)))
+
+    _in_flight += 1
+    start = time.monotonic()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_pool(), fn, *args)
+    finally:
+        _in_flight -= 1
+        _avg_seconds = 0.9 * _avg_seconds + 0.1 * (time.monotonic() - start)
+
+
+async def verify(plain_password: str, hashed_password: str) -> bool:
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+async def hash_password(plain_password: str) -> str:
+    return await _run(get_password_hash, plain_password)
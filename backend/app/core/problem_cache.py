@@ -0,0 +1,81 @@
+from typing import Optional
+from uuid import UUID
+
+import redis
+
+from app.core.events import get_async_redis
+from app.core.judge_queue import get_redis
+
+# Serialized problem payloads for the read-mostly problem pages. Every write
+# to a problem or its test cases bumps a version counter after the commit;
+# bodies are stored under the version they were built at and the version is
+# the ETag, so a view costs one Redis GET (304) or two (cached body).
+BODY_TTL = 3600
+LIST_VERSION_KEY = "poj:problems:version"
+
+
+def _version_key(problem_id) -> str:
+    return f"poj:problem:{problem_id}:version"
+
+
+def etag(*parts) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], tag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == tag for c in candidates)
+
+
+def bump(problem_id: Optional[UUID] = None) -> None:
+    """For the sync crud. problem_id=None only invalidates the problem list."""
+    try:
+        pipe = get_redis().pipeline()
+        if problem_id is not None:
+            pipe.incr(_version_key(problem_id))
+        pipe.incr(LIST_VERSION_KEY)
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"[ProblemCache] Failed to bump {problem_id}: {e}")
+
+
+async def bump_async(problem_id: Optional[UUID] = None) -> None:
+    try:
+        pipe = get_async_redis().pipeline()
+        if problem_id is not None:
+            pipe.incr(_version_key(problem_id))
+        pipe.incr(LIST_VERSION_KEY)
+        await pipe.execute()
+    except redis.RedisError as e:
+        print(f"[ProblemCache] Failed to bump {problem_id}: {e}")
+
+
+async def problem_version(problem_id) -> Optional[int]:
+    """None when Redis is unavailable: serve from the database, uncached."""
+    try:
+        return int(await get_async_redis().get(_version_key(problem_id)) or 0)
+    except redis.RedisError:
+        return None
+
+
+async def list_version() -> Optional[int]:
+    try:
+        return int(await get_async_redis().get(LIST_VERSION_KEY) or 0)
+    except redis.RedisError:
+        return None
+
+
+async def get_body(key: str) -> Optional[str]:
+    try:
+        return await get_async_redis().get(f"poj:cache:{key}")
+    except redis.RedisError:
+        return None
+
+
+async def store_body(key: str, body: str) -> None:
+    try:
+        await get_async_redis().set(f"poj:cache:{key}", body, ex=BODY_TTL)
+    except redis.RedisError as e:
+        print(f"[ProblemCache] Failed to store {key}: {e}")
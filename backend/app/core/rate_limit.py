@@ -0,0 +1,27 @@
+from typing import Optional
+
+import redis
+
+from app.core.events import get_async_redis
+
+
+async def hit(key: str, limit: int, window: int) -> Optional[int]:
+    """
+    Fixed-window counter shared by every API process. Counts one attempt and
+    returns None while under `limit` per `window` seconds, otherwise the
+    seconds until the window resets (for Retry-After). Fails open on Redis errors.
+    """
+    redis_key = f"poj:ratelimit:{key}"
+    try:
+        pipe = get_async_redis().pipeline()
+        pipe.incr(redis_key)
+        pipe.expire(redis_key, window, nx=True)
+        pipe.ttl(redis_key)
+        count, _, ttl = await pipe.execute()
+    except redis.RedisError as e:
+        print(f"[RateLimit] {key}: {e}")
+        return None
+
+    if count <= limit:
+        return None
+    return ttl if ttl and ttl > 0 else window
@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+from uuid import UUID
+
+import redis
+
+from app.core.config import settings
+from app.core.events import get_async_redis
+from app.core.judge_queue import get_redis
+
+# Authenticated-user cache for deps.get_current_user: a short in-process TTL
+# in front of a Redis copy shared by every API process. crud.user / crud.aio.user
+# invalidate both on every write; the local TTL bounds how long another API
+# process can keep serving a stale entry. The local copy is an LRU capped at
+# USER_CACHE_LOCAL_MAX entries so a stream of distinct users cannot grow it.
+_local: "OrderedDict[str, tuple]" = OrderedDict()
+_local_lock = threading.Lock()
+_stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0}
+_stats_lock = threading.Lock()
+
+
+class CachedUser(NamedTuple):
+    """The user fields endpoints read off `current_user`."""
+    id: UUID
+    email: str
+    student_id: str
+    is_active: bool
+    is_superuser: bool
+
+
+def _key(user_id) -> str:
+    return f"poj:user:{user_id}"
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def cache_stats() -> Dict[str, float]:
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+    hits = stats["local_hits"] + stats["redis_hits"]
+    stats["hit_ratio"] = hits / lookups if lookups else 0.0
+    return stats
+
+
+def _local_get(key: str) -> Optional[CachedUser]:
+    with _local_lock:
+        entry = _local.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del _local[key]
+            return None
+        _local.move_to_end(key)
+        return entry[0]
+
+
+def _local_put(key: str, user: CachedUser) -> None:
+    with _local_lock:
+        _local[key] = (user, time.monotonic() + settings.USER_CACHE_LOCAL_TTL)
+        _local.move_to_end(key)
+        while len(_local) > settings.USER_CACHE_LOCAL_MAX:
+            _local.popitem(last=False)
+
+
+def _local_pop(key: str) -> None:
+    with _local_lock:
+        _local.pop(key, None)
+
+
+def _dump(user: CachedUser) -> str:
+    return json.dumps({**user._asdict(), "id": str(user.id)})
+
+
+def _load(raw: str) -> CachedUser:
+    data = json.loads(raw)
+    data["id"] = UUID(data["id"])
+    return CachedUser(**data)
+
+
+async def get(user_id) -> Optional[CachedUser]:
+    key = str(user_id)
+    user = _local_get(key)
+    if user is not None:
+        _count("local_hits")
+        return user
+
+    try:
+        raw = await get_async_redis().get(_key(key))
+    except redis.RedisError:
+        raw = None
+
+    if raw is None:
+        _count("misses")
+        return None
+
+    user = _load(raw)
+    _local_put(key, user)
+    _count("redis_hits")
+    return user
+
+
+async def put(user) -> CachedUser:
+    cached = CachedUser(
+        id=user.id,
+        email=user.email,
+        student_id=user.student_id,
+        is_active=bool(user.is_active),
+        is_superuser=bool(user.is_superuser),
+    )
+    key = str(user.id)
+    _local_put(key, cached)
+    try:
+        await get_async_redis().set(_key(key), _dump(cached), ex=settings.USER_CACHE_TTL)
+    except redis.RedisError as e:
+        print(f"[UserCache] Failed to store {key}: {e}")
+    return cached
+
+
+def invalidate(user_id) -> None:
+    """For the sync crud (worker, sync endpoints)."""
+    _local_pop(str(user_id))
+    _count("invalidations")
+    try:
+        get_redis().delete(_key(user_id))
+    except redis.RedisError as e:
+        print(f"[UserCache] Failed to invalidate {user_id}: {e}")
+
+
+async def invalidate_async(user_id) -> None:
+    _local_pop(str(user_id))
+    _count("invalidations")
+    try:
+        await get_async_redis().delete(_key(user_id))
+    except redis.RedisError as e:
+        print(f"[UserCache] Failed to invalidate {user_id}: {e}")
@@ -1,3 +1,5 @@
 from .user import *
 from .problem import *
-from .testcase import *
\ No newline at end of file
+from .testcase import *
+from .submission import *
+from . import aio
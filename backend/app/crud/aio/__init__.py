@@ -0,0 +1,3 @@
+# async counterparts of app.crud for the FastAPI endpoints (AsyncSession);
+# app.crud itself stays synchronous for the Celery worker
+from . import user, problem, testcase, submission
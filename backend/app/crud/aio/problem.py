@@ -0,0 +1,57 @@
+from uuid import UUID
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core import problem_cache
+from app.crud.pagination import split_page
+from app.crud.problem import page_cursor_key, page_query
+from app.models.problem import Problem
+from app.schemas.problem import ProblemCreate, ProblemUpdate
+
+async def get_by_id(db: AsyncSession, problem_id: UUID) -> Optional[Problem]:
+    # test_cases are part of the response; load them up front, no lazy loads under asyncio
+    result = await db.execute(
+        select(Problem)
+        .options(selectinload(Problem.test_cases))
+        .where(Problem.id == problem_id)
+    )
+    return result.scalars().first()
+
+async def get_by_problem_key(db: AsyncSession, problem_key: str) -> Optional[Problem]:
+    result = await db.execute(select(Problem).where(Problem.problem_key == problem_key))
+    return result.scalars().first()
+
+async def get_all(
+    db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, **filters
+) -> Tuple[List[Problem], Optional[str]]:
+    """One keyset page and the cursor of the next one; filters as in crud.problem.page_query."""
+    result = await db.execute(page_query(limit, cursor, **filters))
+    return split_page(list(result.scalars().all()), limit, page_cursor_key)
+
+async def create(db: AsyncSession, obj_in: ProblemCreate) -> Problem:
+    db_obj = Problem(**obj_in.model_dump())
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj, attribute_names=["test_cases"])
+    await problem_cache.bump_async()
+    return db_obj
+
+async def update(db: AsyncSession, db_obj: Problem, obj_in: ProblemUpdate) -> Problem:
+    update_data = obj_in.model_dump(exclude_unset=True)
+
+    for field, value in update_data.items():
+        setattr(db_obj, field, value)
+
+    db.add(db_obj)
+    await db.commit()
+    await problem_cache.bump_async(db_obj.id)
+    return db_obj
+
+async def delete(db: AsyncSession, db_obj: Problem) -> Problem:
+    await db.delete(db_obj)
+    await db.commit()
+    await problem_cache.bump_async(db_obj.id)
+    return db_obj
@@ -0,0 +1,57 @@
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.submission import Submission, SubmissionStatus
+from app.schemas.submission import SubmissionCreate
+
+async def get(db: AsyncSession, id: UUID) -> Optional[Submission]:
+    return await db.get(Submission, id)
+
+async def get_multi_by_user(
+    db: AsyncSession, user_id: UUID, skip: int = 0, limit: int = 50
+) -> List[Submission]:
+    result = await db.execute(
+        select(Submission)
+        .where(Submission.user_id == user_id)
+        .order_by(Submission.submit_time.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def create(db: AsyncSession, obj_in: SubmissionCreate, user_id: UUID) -> Submission:
+    db_obj = Submission(
+        **obj_in.model_dump(),
+        user_id=user_id,
+        status=SubmissionStatus.PENDING
+    )
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+async def resource_stats(db: AsyncSession, problem_id: UUID) -> dict:
+    """Percentiles of time and memory over accepted submissions, computed in SQL."""
+    def pct(column, p):
+        return func.percentile_cont(p).within_group(column)
+
+    row = (await db.execute(
+        select(
+            func.count(Submission.id).label("accepted"),
+            pct(Submission.execute_time, 0.5).label("time_p50"),
+            pct(Submission.execute_time, 0.95).label("time_p95"),
+            func.max(Submission.execute_time).label("time_max"),
+            pct(Submission.memory_usage, 0.5).label("memory_p50"),
+            pct(Submission.memory_usage, 0.95).label("memory_p95"),
+            func.max(Submission.memory_usage).label("memory_max"),
+        ).where(
+            Submission.problem_id == problem_id,
+            Submission.status == SubmissionStatus.AC,
+            Submission.sample_only.is_(False)
+        )
+    )).one()
+    return dict(row._mapping)
+
@@ -0,0 +1,37 @@
+import asyncio
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import problem_cache
+from app.crud.pagination import split_page
+from app.crud.testcase import page_cursor_key, page_query
+from app.models.problem import TestCase
+from app.schemas.problem import TestCaseCreate
+from app.services.testdata_service import TestDataService
+
+async def get_multi_by_problem(
+    db: AsyncSession, problem_id: UUID, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[TestCase], Optional[str]]:
+    result = await db.execute(page_query(problem_id, limit, cursor))
+    return split_page(list(result.scalars().all()), limit, page_cursor_key)
+
+async def create(db: AsyncSession, obj_in: TestCaseCreate, problem_id: UUID) -> TestCase:
+    # hashing the test data is file I/O, keep it off the event loop
+    manifest = await asyncio.to_thread(
+        TestDataService.build_manifest, obj_in.input_path, obj_in.output_path
+    )
+    db_obj = TestCase(**obj_in.model_dump(), **manifest, problem_id=problem_id)
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    await problem_cache.bump_async(problem_id)
+    return db_obj
+
+async def remove(db: AsyncSession, id: UUID) -> TestCase:
+    obj = await db.get(TestCase, id)
+    await db.delete(obj)
+    await db.commit()
+    await problem_cache.bump_async(obj.problem_id)
+    return obj
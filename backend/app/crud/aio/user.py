@@ -0,0 +1,47 @@
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import user_cache
+from app.models.user import User
+
+async def get(db: AsyncSession, id):
+    return await db.get(User, id)
+
+async def get_many(db: AsyncSession, ids: List[UUID]) -> List[User]:
+    if not ids:
+        return []
+    result = await db.execute(select(User).where(User.id.in_(ids)))
+    return list(result.scalars().all())
+
+async def get_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def get_by_student_id(db: AsyncSession, student_id: str):
+    result = await db.execute(select(User).where(User.student_id == student_id))
+    return result.scalars().first()
+
+async def create(db: AsyncSession, obj_in: dict):
+    db_obj = User(**obj_in)
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+async def update(db: AsyncSession, db_obj: User, obj_in: dict):
+    for field, value in obj_in.items():
+        setattr(db_obj, field, value)
+
+    db.add(db_obj)
+    await db.commit()
+    # after the commit, so a concurrent miss cannot re-cache the old row
+    await user_cache.invalidate_async(db_obj.id)
+    return db_obj
+
+async def remove(db: AsyncSession, db_obj: User):
+    await db.delete(db_obj)
+    await db.commit()
+    await user_cache.invalidate_async(db_obj.id)
+    return db_obj
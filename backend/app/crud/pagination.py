@@ -0,0 +1,29 @@
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque keyset cursor: the sort-key values of the last row of a page."""
+    raw = json.dumps(values, default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Raises ValueError on anything that is not a cursor we issued."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def split_page(rows: List[Any], limit: int, sort_key) -> Tuple[List[Any], Optional[str]]:
+    """rows were fetched with LIMIT limit + 1; the extra row only says there is a next page."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(sort_key(rows[-1]))
@@ -1,24 +1,68 @@
+from sqlalchemy import Select, func, literal_column, select
+from sqlalchemy.dialects.postgresql import array
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from app.core import problem_cache
+from app.crud.pagination import decode_cursor, split_page
 from app.models.problem import Problem
 from app.schemas.problem import ProblemCreate, ProblemUpdate
 
+# problem_tags is a comma-separated string; this expression is what the GIN
+# index ix_problem_tags is built on, so it must stay byte-for-byte the same
+# (constants inlined, not bound).
+TAG_ARRAY = func.string_to_array(
+    func.lower(func.replace(Problem.problem_tags, literal_column("' '"), literal_column("''"))),
+    literal_column("','")
+)
+
+def normalize_tag(tag: str) -> str:
+    return tag.replace(" ", "").lower()
+
+def page_query(
+    limit: int,
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    is_public: Optional[bool] = None,
+    problem_key: Optional[str] = None,
+) -> Select:
+    """
+    Keyset page ordered by the unique problem_key; fetches one extra row to
+    detect the next page (see split_page). Raises ValueError on a bad cursor.
+    """
+    stmt = select(Problem).order_by(Problem.problem_key).limit(limit + 1)
+    if cursor:
+        (after_key,) = decode_cursor(cursor, 1)
+        stmt = stmt.where(Problem.problem_key > after_key)
+    if tag:
+        stmt = stmt.where(TAG_ARRAY.op("@>")(array([normalize_tag(tag)])))
+    if is_public is not None:
+        stmt = stmt.where(Problem.is_public == is_public)
+    if problem_key:
+        stmt = stmt.where(Problem.problem_key == problem_key)
+    return stmt
+
+def page_cursor_key(problem: Problem) -> list:
+    return [problem.problem_key]
+
 def get_by_id(db: Session, problem_id: UUID) -> Optional[Problem]:
     return db.query(Problem).filter(Problem.id == problem_id).first()
 
 def get_by_problem_key(db: Session, problem_key: str) -> Optional[Problem]:
     return db.query(Problem).filter(Problem.problem_key == problem_key).first()
 
-def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Problem]:
-    return db.query(Problem).offset(skip).limit(limit).all()
+def get_all(db: Session, limit: int = 100, cursor: Optional[str] = None, **filters) -> Tuple[List[Problem], Optional[str]]:
+    """One keyset page and the cursor of the next one; filters as in page_query."""
+    rows = db.execute(page_query(limit, cursor, **filters)).scalars().all()
+    return split_page(list(rows), limit, page_cursor_key)
 
 def create(db: Session, obj_in: ProblemCreate) -> Problem:
     db_obj = Problem(**obj_in.model_dump())
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    problem_cache.bump()
     return db_obj
 
 def update(db: Session, db_obj: Problem, obj_in: ProblemUpdate) -> Problem:
@@ -30,9 +74,11 @@ def update(db: Session, db_obj: Problem, obj_in: ProblemUpdate) -> Problem:
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    problem_cache.bump(db_obj.id)
     return db_obj
 
 def delete(db: Session, db_obj: Problem) -> Problem:
     db.delete(db_obj)
     db.commit()
+    problem_cache.bump(db_obj.id)
     return db_obj
\ No newline at end of file
@@ -0,0 +1,72 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import update as sql_update
+from sqlalchemy.orm import Session
+
+from app.models.submission import Submission, SubmissionStatus
+from app.schemas.submission import SubmissionCreate
+
+IN_FLIGHT_STATUSES = [SubmissionStatus.PENDING, SubmissionStatus.JUDGING, SubmissionStatus.CHECKING]
+
+def get(db: Session, id: UUID) -> Optional[Submission]:
+    return db.query(Submission).filter(Submission.id == id).first()
+
+def get_multi_by_user(
+    db: Session, user_id: UUID, skip: int = 0, limit: int = 50
+) -> List[Submission]:
+    return (
+        db.query(Submission)
+        .filter(Submission.user_id == user_id)
+        .order_by(Submission.submit_time.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+def create(db: Session, obj_in: SubmissionCreate, user_id: UUID) -> Submission:
+    db_obj = Submission(
+        **obj_in.model_dump(),
+        user_id=user_id,
+        status=SubmissionStatus.PENDING
+    )
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def reset_for_rejudge(
+    db: Session, problem_id: UUID, statuses: Optional[List[str]] = None
+) -> List[Tuple[UUID, UUID]]:
+    """
+    Put every finished submission of a problem back to Pending with a single
+    UPDATE ... RETURNING, instead of loading and committing row by row.
+    Returns (submission_id, user_id) pairs.
+    """
+    stmt = (
+        sql_update(Submission)
+        .where(
+            Submission.problem_id == problem_id,
+            Submission.status.notin_(IN_FLIGHT_STATUSES),
+            Submission.sample_only.is_(False)
+        )
+        .values(
+            status=SubmissionStatus.PENDING,
+            score=None,
+            result_details=None,
+            execute_time=None,
+            memory_usage=None,
+            slurm_job_id=None,
+            slurm_deadline=None,
+            timings=None,
+            scaling=None
+        )
+        .returning(Submission.id, Submission.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    if statuses:
+        stmt = stmt.where(Submission.status.in_(statuses))
+
+    rows = db.execute(stmt).all()
+    db.commit()
+    return [(row.id, row.user_id) for row in rows]
@@ -1,33 +1,81 @@
-from typing import List
+from typing import List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import Select, select, tuple_
 from sqlalchemy.orm import Session
+from app.core import problem_cache
+from app.crud.pagination import decode_cursor, split_page
 from app.models.problem import TestCase
 from app.schemas.problem import TestCaseCreate, TestCaseUpdate
+from app.services.testdata_service import TestDataService
 
-def get_multi_by_problem(
-    db: Session, problem_id: UUID, skip: int = 0, limit: int = 100
-) -> List[TestCase]:
-    return (
-        db.query(TestCase)
-        .filter(TestCase.problem_id == problem_id)
-        .order_by(TestCase.order)
-        .offset(skip)
-        .limit(limit)
-        .all()
+def page_query(problem_id: UUID, limit: int, cursor: Optional[str] = None) -> Select:
+    """
+    Keyset page in judge order; `order` is not unique, so id breaks ties.
+    Served by ix_test_case_problem_order. Raises ValueError on a bad cursor.
+    """
+    stmt = (
+        select(TestCase)
+        .where(TestCase.problem_id == problem_id)
+        .order_by(TestCase.order, TestCase.id)
+        .limit(limit + 1)
     )
+    if cursor:
+        after_order, after_id = decode_cursor(cursor, 2)
+        stmt = stmt.where(tuple_(TestCase.order, TestCase.id) > tuple_(int(after_order), UUID(after_id)))
+    return stmt
+
+def page_cursor_key(case: TestCase) -> list:
+    return [case.order, case.id]
+
+def get_multi_by_problem(
+    db: Session, problem_id: UUID, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[TestCase], Optional[str]]:
+    rows = db.execute(page_query(problem_id, limit, cursor)).scalars().all()
+    return split_page(list(rows), limit, page_cursor_key)
 
 def create(db: Session, obj_in: TestCaseCreate, problem_id: UUID) -> TestCase:
     db_obj = TestCase(
         **obj_in.model_dump(),
+        **TestDataService.build_manifest(obj_in.input_path, obj_in.output_path),
         problem_id=problem_id
     )
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    problem_cache.bump(problem_id)
     return db_obj
 
 def remove(db: Session, id: UUID) -> TestCase:
     obj = db.query(TestCase).get(id)
     db.delete(obj)
     db.commit()
-    return obj
\ No newline at end of file
+    problem_cache.bump(obj.problem_id)
+    return obj
+
+def refresh_manifests(db: Session, problem_id: UUID) -> int:
+    """
+    Re-hash the test cases of a problem whose files changed on disk since
+    their manifest was built (one stat per file for the rest). Returns how
+    many were refreshed.
+    """
+    cases = db.query(TestCase).filter(TestCase.problem_id == problem_id).all()
+    stale = [case for case in cases if not TestDataService.is_current(case)]
+    for case in stale:
+        for field, value in TestDataService.build_manifest(case.input_path, case.output_path).items():
+            setattr(case, field, value)
+
+    if stale:
+        db.commit()
+        problem_cache.bump(problem_id)
+    return len(stale)
+
+def refresh_manifest(db: Session, db_obj: TestCase) -> TestCase:
+    """Re-hash the files of an existing test case, e.g. after the data was replaced on disk."""
+    for field, value in TestDataService.build_manifest(db_obj.input_path, db_obj.output_path).items():
+        setattr(db_obj, field, value)
+
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    problem_cache.bump(db_obj.problem_id)
+    return db_obj
\ No newline at end of file
@@ -1,6 +1,10 @@
 from sqlalchemy.orm import Session
+from app.core import user_cache
 from app.models.user import User
 
+def get(db: Session, id):
+    return db.query(User).filter(User.id == id).first()
+
 def get_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
@@ -12,4 +16,21 @@ def create(db: Session, obj_in: dict):
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
-    return db_obj
\ No newline at end of file
+    return db_obj
+
+def update(db: Session, db_obj: User, obj_in: dict):
+    for field, value in obj_in.items():
+        setattr(db_obj, field, value)
+
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    # after the commit, so a concurrent miss cannot re-cache the old row
+    user_cache.invalidate(db_obj.id)
+    return db_obj
+
+def remove(db: Session, db_obj: User):
+    db.delete(db_obj)
+    db.commit()
+    user_cache.invalidate(db_obj.id)
+    return db_obj
@@ -1,5 +1,10 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from prometheus_client import Counter, Histogram
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
 
 SQLALCHEMY_DATABASE_URL = (
@@ -7,9 +12,72 @@ SQLALCHEMY_DATABASE_URL = (
     f"@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
 )
 
+# Shared by the API and the Celery workers, so only labelled metrics here:
+# their samples (and multiprocess files) are created on first use, not on import.
+# Served by the API's /metrics (app.api.metrics) and the worker metrics server.
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "poj_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the SQLAlchemy pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "poj_db_pool_checkout_timeouts",
+    "Checkouts that gave up after pool_timeout",
+    ["pool"],
+)
+
+
+class _TimedCheckout:
+    """Records how long each checkout waited for a free connection (or a new one)."""
+    metrics_label = ""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.metrics_label).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(self.metrics_label).observe(time.perf_counter() - start)
+
+
+# class attributes, so the label survives pool.recreate()
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    metrics_label = "sync"
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+# Sync engine: Celery worker (and the few API paths that stay synchronous)
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
-    pool_pre_ping=True
+    pool_pre_ping=True,
+    poolclass=TimedQueuePool
+)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine: FastAPI endpoints
+async_engine = create_async_engine(
+    settings.ASYNC_SQLALCHEMY_DATABASE_URI,
+    pool_pre_ping=True,
+    poolclass=TimedAsyncQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    }
+)
+
+# expire_on_commit=False: committed objects are still returned as responses,
+# and an expired attribute cannot be lazy-loaded outside the event loop's await
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
@@ -1,14 +1,28 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.api import metrics
+from app.core import password_pool
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+app.add_middleware(metrics.MetricsMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("shutdown")
+def shutdown_password_pool():
+    password_pool.shutdown()
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    # sync on purpose: collecting reads Redis with the blocking client
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Parallel Online Judge API"}
\ No newline at end of file
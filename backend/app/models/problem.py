@@ -1,10 +1,22 @@
 import uuid
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, Float, BigInteger, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 class Problem(Base):
+    # same indexes as alembic 4c9e2d7a8b61
+    __table_args__ = (
+        Index("ix_problem_problem_key", "problem_key", unique=True),
+        # keyset sort of the problem list
+        Index("ix_problem_is_public_problem_key", "is_public", "problem_key"),
+        # must match crud.problem.TAG_ARRAY
+        Index(
+            "ix_problem_tags",
+            text("string_to_array(lower(replace(problem_tags, ' ', '')), ',')"),
+            postgresql_using="gin"
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     
@@ -16,7 +28,13 @@ class Problem(Base):
     
     time_limit = Column(Integer, default=1000)
     memory_limit = Column(Integer, default=128)
-    core_number = Column(Integer, default=1)
+    core_number = Column(Integer, default=1)     # MPI ranks (Slurm --ntasks)
+
+    # placement of the ranks, see app.worker.slurm.placement
+    nodes = Column(Integer, default=1)
+    tasks_per_node = Column(Integer, nullable=True)
+    cpus_per_task = Column(Integer, default=1)   # threads per rank (OpenMP)
+    placement = Column(String, default="shared") # shared, exclusive
     
     compile_command = Column(String, nullable=True) 
     run_command = Column(String, nullable=False)
@@ -26,10 +44,22 @@ class Problem(Base):
     judge_type = Column(String, default="standard") # standard, special
     judge_script = Column(String, nullable=True)
 
+    compare_mode = Column(String, default="exact") # exact, whitespace, float
+    execution_policy = Column(String, default="parallel_fail_fast") # sequential, parallel_fail_fast, parallel_all
+    float_tolerance = Column(Float, nullable=True)
+
+    # scaling mode: accepted submissions are rerun on each core count and graded on speedup
+    scaling_cores = Column(ARRAY(Integer), nullable=True)
+    scaling_reference_time = Column(Integer, nullable=True)  # ms, serial reference
+    scaling_min_efficiency = Column(Float, nullable=True)
+
     submissions = relationship("Submission", back_populates="problem")
 
 
 class TestCase(Base):
+    __table_args__ = (
+        Index("ix_test_case_problem_order", "problem_id", "order", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     problem_id = Column(UUID(as_uuid=True), ForeignKey("problem.id"), nullable=False)
@@ -41,4 +71,12 @@ class TestCase(Base):
     score = Column(Integer, default=100)
     order = Column(Integer, default=0)
 
+    # test-data manifest, filled in by crud.testcase.create / refresh_manifests
+    input_size = Column(BigInteger, nullable=True)
+    input_sha256 = Column(String(64), nullable=True)
+    output_size = Column(BigInteger, nullable=True)
+    output_sha256 = Column(String(64), nullable=True)
+    output_lines = Column(Integer, nullable=True)
+    output_mtime_ns = Column(BigInteger, nullable=True)  # the manifest is stale once the file's differs
+
     problem = relationship("Problem", back_populates="test_cases")
\ No newline at end of file
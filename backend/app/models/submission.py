@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Enum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Column, String, ForeignKey, DateTime, Text, Enum, Integer, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 import enum
 
@@ -10,13 +10,30 @@ from app.models.base import Base
 class SubmissionStatus(str, enum.Enum):
     PENDING = "Pending"
     JUDGING = "Judging"
+    CHECKING = "Checking"
     AC = "Accepted"
     WA = "Wrong Answer"
     TLE = "Time Limit Exceeded"
+    MLE = "Memory Limit Exceeded"
+    SLOW = "Insufficient Speedup"      # correct, but below the problem's scaling threshold
+    RE = "Runtime Error"
     CE = "Compilation Error"
     ERR = "System Error"
 
 class Submission(Base):
+    # same indexes as alembic 6e1b5f3c2a90
+    __table_args__ = (
+        # "my submissions", newest first
+        Index("ix_submission_user_submit_time", "user_id", text("submit_time DESC")),
+        # scoreboard and rejudge: everything of one problem, per user and verdict
+        Index("ix_submission_problem_user_status", "problem_id", "user_id", "status"),
+        # per-case analytics, e.g. result_details @> '[{"status": "TLE"}]'
+        Index(
+            "ix_submission_result_details", "result_details",
+            postgresql_using="gin", postgresql_ops={"result_details": "jsonb_path_ops"}
+        ),
+    )
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), nullable=False)
@@ -26,11 +43,18 @@ class Submission(Base):
     language = Column(String, default="CPP")
 
     status = Column(String, default=SubmissionStatus.PENDING)
-    result_details = Column(Text,nullable=True)
+    score = Column(Integer, nullable=True)
+    result_details = Column(JSONB, nullable=True)    # per-case list, or {"msg"/"error": ...}
+    sample_only = Column(Boolean, nullable=False, default=False)  # ran the sample cases only, never scored
 
     submit_time = Column(DateTime, default=datetime.utcnow)
-    execute_time = Column(String, nullable=True)
-    memory_usage = Column(String, nullable=True)
+    execute_time = Column(Integer, nullable=True)    # ms
+    memory_usage = Column(Integer, nullable=True)    # KB
+
+    slurm_job_id = Column(String, nullable=True)
+    slurm_deadline = Column(DateTime, nullable=True) # poll_slurm_jobs gives up on the job after this
+    timings = Column(JSONB, nullable=True)           # phase -> seconds, see app/worker/metrics.py
+    scaling = Column(JSONB, nullable=True)           # speedup per core count, see app/worker/scaling.py
     
     user = relationship("User", back_populates="submissions")
     problem = relationship("Problem", back_populates="submissions")
\ No newline at end of file
@@ -2,5 +2,11 @@ from .user import User, UserCreate
 from .token import Token, TokenPayload
 from .problem import (
     Problem, ProblemCreate, ProblemUpdate, ProblemSummary,
-    TestCase, TestCaseCreate, TestCaseUpdate
-)
\ No newline at end of file
+    TestCase, TestCaseAdmin, TestCaseCreate, TestCaseUpdate
+)
+from .rejudge import RejudgeRequest, RejudgeProgress
+from .submission import (
+    Submission, SubmissionCreate, SubmissionSummary, SubmissionStatusSnapshot, ResourceStats
+)
+from .pagination import Page
+from .scoreboard import Scoreboard, ScoreboardEntry, ScoreboardFreeze, ScoreboardRebuild
@@ -7,6 +7,27 @@ class JudgeType(str, Enum):
     standard = "standard"
     special = "special"
 
+class CompareMode(str, Enum):
+    exact = "exact"
+    whitespace = "whitespace"
+    float = "float"
+
+class Placement(str, Enum):
+    shared = "shared"        # nodes may run other jobs alongside
+    exclusive = "exclusive"  # whole nodes (sbatch --exclusive), for stable timings
+
+class ExecutionPolicy(str, Enum):
+    sequential = "sequential"                  # one case at a time, stop at the first failure
+    parallel_fail_fast = "parallel_fail_fast"  # all cases at once, cancel the rest on a failure
+    parallel_all = "parallel_all"              # run every case, partial score from TestCase.score
+
+def _normalize_cores(v: Optional[List[int]]) -> Optional[List[int]]:
+    if not v:
+        return None
+    if any(cores < 1 for cores in v):
+        raise ValueError("scaling_cores must be positive")
+    return sorted(set(v))
+
 # =======================
 # TestCase Schemas
 # =======================
@@ -35,6 +56,14 @@ class TestCase(TestCaseBase):
     class Config:
         from_attributes = True
 
+class TestCaseAdmin(TestCase):
+    # the manifest fingerprints the expected output (the worker accepts any
+    # output with this size and sha256), so it is never part of a public response
+    input_size: Optional[int] = None
+    output_size: Optional[int] = None
+    output_sha256: Optional[str] = None
+    output_lines: Optional[int] = None
+
 
 # =======================
 # Problem Schemas
@@ -50,18 +79,41 @@ class ProblemBase(BaseModel):
     
     time_limit: int = 1000
     memory_limit: int = 128
-    core_number: int = 1
+    core_number: int = Field(default=1, ge=1, description="MPI ranks (Slurm --ntasks)")
+
+    # multi-node / hybrid MPI+OpenMP; with tasks_per_node the node count follows from it
+    nodes: int = Field(default=1, ge=1)
+    tasks_per_node: Optional[int] = Field(default=None, ge=1)
+    cpus_per_task: int = Field(default=1, ge=1)
+    placement: Placement = Placement.shared
     
     compile_command: Optional[str] = None
     compile_command: Optional[str] = None
     run_command: str
     
     judge_type: JudgeType = JudgeType.standard
-    judge_script: Optional[str] = None
+    # special judge: C++ checker source, run as `checker <input> <user_output> <expected_output>`
+    judge_script: Optional[str] = Field(default=None, validate_default=True)
+
+    compare_mode: CompareMode = CompareMode.exact
+    float_tolerance: Optional[float] = Field(default=None, gt=0)
+    execution_policy: ExecutionPolicy = ExecutionPolicy.parallel_fail_fast
+
+    # scaling mode: rerun accepted submissions on each core count, e.g. [1, 2, 4, 8];
+    # speedup is measured against scaling_reference_time (ms), or the smallest count
+    scaling_cores: Optional[List[int]] = None
+    scaling_reference_time: Optional[int] = Field(default=None, gt=0)
+    scaling_min_efficiency: Optional[float] = Field(default=None, gt=0)
+
+    @field_validator('scaling_cores')
+    def check_scaling_cores(cls, v):
+        return _normalize_cores(v)
 
     @field_validator('judge_script')
-    def check_script_if_special(cls, v, values):
-        return v # TODO: check script if special
+    def check_script_if_special(cls, v, info):
+        if info.data.get('judge_type') == JudgeType.special and not (v and v.strip()):
+            raise ValueError("judge_script is required when judge_type is 'special'")
+        return v
 
 class ProblemCreate(ProblemBase):
     pass
@@ -75,7 +127,12 @@ class ProblemUpdate(BaseModel):
     
     time_limit: Optional[int] = None
     memory_limit: Optional[int] = None
-    core_number: Optional[int] = None
+    core_number: Optional[int] = Field(default=None, ge=1)
+
+    nodes: Optional[int] = Field(default=None, ge=1)
+    tasks_per_node: Optional[int] = Field(default=None, ge=1)
+    cpus_per_task: Optional[int] = Field(default=None, ge=1)
+    placement: Optional[Placement] = None
     
     compile_command: Optional[str] = None
     run_command: Optional[str] = None
@@ -83,6 +140,18 @@ class ProblemUpdate(BaseModel):
     judge_type: Optional[JudgeType] = None
     judge_script: Optional[str] = None
 
+    compare_mode: Optional[CompareMode] = None
+    float_tolerance: Optional[float] = Field(default=None, gt=0)
+    execution_policy: Optional[ExecutionPolicy] = None
+
+    scaling_cores: Optional[List[int]] = None
+    scaling_reference_time: Optional[int] = Field(default=None, gt=0)
+    scaling_min_efficiency: Optional[float] = Field(default=None, gt=0)
+
+    @field_validator('scaling_cores')
+    def check_scaling_cores(cls, v):
+        return _normalize_cores(v)
+
 class ProblemSummary(BaseModel):
     id: UUID
     problem_key: str
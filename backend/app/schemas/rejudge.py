@@ -0,0 +1,16 @@
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+class RejudgeRequest(BaseModel):
+    # only rejudge submissions currently in one of these statuses (default: all finished ones)
+    statuses: Optional[List[str]] = None
+
+class RejudgeProgress(BaseModel):
+    batch_id: str
+    problem_id: UUID
+    total: int
+    done: int
+    elapsed_seconds: float
+    throughput_per_second: float
+    eta_seconds: Optional[float] = None
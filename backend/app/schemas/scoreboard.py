@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+class ScoreboardEntry(BaseModel):
+    rank: int
+    user_id: UUID
+    student_id: Optional[str] = None
+    full_name: Optional[str] = None
+    total: int
+    # submit time of the user's latest improvement; earlier wins a tie
+    last_improved_at: datetime
+    # problem_id -> best score
+    problems: Dict[str, int]
+
+class Scoreboard(BaseModel):
+    frozen_at: Optional[datetime] = None
+    # False: the frozen public view
+    live: bool
+    total_users: int
+    entries: List[ScoreboardEntry]
+
+class ScoreboardFreeze(BaseModel):
+    # submissions made at or after this time stay hidden; default now
+    at: Optional[datetime] = None
+
+class ScoreboardRebuild(BaseModel):
+    users: int
+    # users whose incrementally kept total differed from the rebuilt one
+    mismatched: int
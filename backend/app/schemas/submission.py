@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+class SubmissionCreate(BaseModel):
+    problem_id: UUID
+    code: str = Field(..., min_length=1, max_length=256 * 1024)
+    language: str = "cpp"
+    # only run the sample test cases, on the high-priority lane; never scored
+    sample_only: bool = False
+
+class SubmissionSummary(BaseModel):
+    id: UUID
+    user_id: UUID
+    problem_id: UUID
+    language: str
+    status: str
+    score: Optional[int] = None
+    sample_only: bool = False
+    submit_time: datetime
+    execute_time: Optional[int] = None    # ms
+    memory_usage: Optional[int] = None    # KB
+
+    class Config:
+        from_attributes = True
+
+class Submission(SubmissionSummary):
+    code: str
+    result_details: Optional[Any] = None
+    timings: Optional[Dict[str, float]] = None    # seconds per judge phase
+    # scaling problems: {"reference_time", "min_efficiency", "passed",
+    # "points": [{"cores", "time", "status", "speedup", "efficiency"}]}
+    scaling: Optional[Any] = None
+
+class SubmissionStatusSnapshot(BaseModel):
+    submission_id: UUID
+    status: Optional[str] = None
+    score: Optional[int] = None
+    time: Optional[int] = None
+    memory: Optional[int] = None
+    cases: List[dict] = []
+
+class ResourceStats(BaseModel):
+    """Time (ms) and peak memory (KB) of a problem's accepted submissions."""
+    problem_id: UUID
+    time_limit: int
+    memory_limit: int         # MB, as configured on the problem
+    accepted: int
+    time_p50: Optional[float] = None
+    time_p95: Optional[float] = None
+    time_max: Optional[int] = None
+    memory_p50: Optional[float] = None
+    memory_p95: Optional[float] = None
+    memory_max: Optional[int] = None
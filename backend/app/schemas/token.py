@@ -1,4 +1,5 @@
 from typing import Optional
+from uuid import UUID
 from pydantic import BaseModel
 
 class Token(BaseModel):
@@ -6,4 +7,4 @@ class Token(BaseModel):
     token_type: str
 
 class TokenPayload(BaseModel):
-    sub: Optional[str] = None
\ No newline at end of file
+    sub: Optional[UUID] = None
\ No newline at end of file
@@ -0,0 +1,88 @@
+import time
+import uuid
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.celery_app import celery_app
+from app.core.judge_queue import get_redis
+from app.crud import submission as crud_submission
+from app.crud import testcase as crud_testcase
+
+REJUDGE_CHUNK_SIZE = 200
+# progress is kept in Redis for a day after the rejudge starts
+REJUDGE_TTL = 24 * 3600
+
+
+class RejudgeService:
+    @staticmethod
+    def start(db: Session, problem_id: UUID, statuses: Optional[List[str]] = None) -> dict:
+        # a rejudge usually follows a data fix: the old hashes must not accept old answers
+        crud_testcase.refresh_manifests(db, problem_id)
+        rows = crud_submission.reset_for_rejudge(db, problem_id=problem_id, statuses=statuses)
+
+        batch_id = uuid.uuid4().hex
+        r = get_redis()
+        pipe = r.pipeline()
+        pipe.hset(f"poj:rejudge:{batch_id}", mapping={
+            "problem_id": str(problem_id),
+            "total": len(rows),
+            "done": 0,
+            "started_at": time.time(),
+        })
+        pipe.expire(f"poj:rejudge:{batch_id}", REJUDGE_TTL)
+        # a set of batch ids: a submission still owed to an earlier batch
+        # counts for both once it is judged
+        for sub_id, _ in rows:
+            pipe.sadd(f"poj:rejudge:sub:{sub_id}", batch_id)
+            pipe.expire(f"poj:rejudge:sub:{sub_id}", REJUDGE_TTL)
+        pipe.execute()
+
+        # a compile worker expands each chunk onto the rejudge lane, so the
+        # request returns without sending one message per submission
+        for i in range(0, len(rows), REJUDGE_CHUNK_SIZE):
+            chunk = [[str(sub_id), str(user_id)] for sub_id, user_id in rows[i:i + REJUDGE_CHUNK_SIZE]]
+            celery_app.send_task("enqueue_rejudge_chunk", args=[chunk], priority=9)
+
+        return RejudgeService.progress(batch_id)
+
+    @staticmethod
+    def progress(batch_id: str) -> Optional[dict]:
+        stats = get_redis().hgetall(f"poj:rejudge:{batch_id}")
+        if not stats:
+            return None
+
+        total = int(stats["total"])
+        done = int(stats["done"])
+        elapsed = max(time.time() - float(stats["started_at"]), 1e-6)
+        throughput = done / elapsed
+
+        return {
+            "batch_id": batch_id,
+            "problem_id": stats["problem_id"],
+            "total": total,
+            "done": done,
+            "elapsed_seconds": elapsed,
+            "throughput_per_second": throughput,
+            "eta_seconds": (total - done) / throughput if throughput else None,
+        }
+
+    @staticmethod
+    def mark_done(submission_id: str) -> None:
+        """Called by the worker when a submission is final; no-op unless it is part of a rejudge."""
+        try:
+            r = get_redis()
+            key = f"poj:rejudge:sub:{submission_id}"
+            # MULTI/EXEC, so two workers finishing the same submission count it once
+            pipe = r.pipeline()
+            pipe.smembers(key)
+            pipe.delete(key)
+            batch_ids, _ = pipe.execute()
+            if batch_ids:
+                pipe = r.pipeline(transaction=False)
+                for batch_id in batch_ids:
+                    pipe.hincrby(f"poj:rejudge:{batch_id}", "done", 1)
+                pipe.execute()
+        except Exception as e:
+            print(f"[Rejudge] Failed to record progress for {submission_id}: {e}")
@@ -0,0 +1,274 @@
+import calendar
+import time
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.judge_queue import get_redis
+from app.models.submission import Submission, SubmissionStatus
+
+# Ranking kept incrementally in Redis, one generation of keys at a time:
+#   poj:sb:{gen}:{ns}:best:{user_id}  hash  problem_id -> best score, problem_id:t -> its submit time
+#   poj:sb:{gen}:{ns}:rank            zset  user_id -> total * SCALE + (SCALE - 1 - last submit time)
+# ns "live" always has every result; ns "public" only exists while the board is
+# frozen and only takes submissions made before the freeze.
+# The zset score packs (total desc, time of the last improvement asc) into one
+# double, exact while total < 2**53 / SCALE (about 900k points).
+SCALE = 10 ** 10
+GEN_KEY = "poj:sb:gen"
+REBUILD_GEN_KEY = "poj:sb:rebuilding"
+FROZEN_AT_KEY = "poj:sb:frozen_at"
+REBUILD_BATCH = 1000
+# final verdicts whose score counts; System Error, Compilation Error and the
+# in-flight statuses (a scaling run is still Checking) never reach the board
+SCORED_STATUSES = [
+    status.value for status in (
+        SubmissionStatus.AC, SubmissionStatus.WA, SubmissionStatus.TLE, SubmissionStatus.MLE, SubmissionStatus.RE
+    )
+]
+
+# KEYS: best hash, rank zset. ARGV: problem_id, score, submit ts, user_id, SCALE.
+# Keeps the best score per problem (earliest submission on a tie) and
+# re-derives the user's total and last improvement time from the hash.
+_RECORD_LUA = """
+local pid, score, ts = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+local old = tonumber(redis.call('HGET', KEYS[1], pid) or '-1')
+local old_ts = tonumber(redis.call('HGET', KEYS[1], pid .. ':t') or '0')
+if score < old or (score == old and ts >= old_ts) then
+    return 0
+end
+redis.call('HSET', KEYS[1], pid, score, pid .. ':t', ts)
+
+local total, last = 0, 0
+local all = redis.call('HGETALL', KEYS[1])
+for i = 1, #all, 2 do
+    local value = tonumber(all[i + 1])
+    if string.sub(all[i], -2) == ':t' then
+        if value > last then last = value end
+    else
+        total = total + value
+    end
+end
+local scale = tonumber(ARGV[5])
+redis.call('ZADD', KEYS[2], total * scale + (scale - 1 - last), ARGV[4])
+return 1
+"""
+
+
+def _ts(dt: Optional[datetime]) -> int:
+    return calendar.timegm(dt.utctimetuple()) if dt else int(time.time())
+
+
+def _prefix(gen: int, ns: str) -> str:
+    return f"poj:sb:{gen}:{ns}"
+
+
+def decode_rank_score(value: float) -> Tuple[int, int]:
+    """(total, last improvement unix time) from a rank zset score."""
+    total, rest = divmod(int(value), SCALE)
+    return total, SCALE - 1 - rest
+
+
+class ScoreboardService:
+    _script = None
+
+    @staticmethod
+    def _record_script():
+        if ScoreboardService._script is None:
+            ScoreboardService._script = get_redis().register_script(_RECORD_LUA)
+        return ScoreboardService._script
+
+    @staticmethod
+    def _apply(pipe, gen: int, ns: str, user_id: str, problem_id: str, score: int, ts: int) -> None:
+        prefix = _prefix(gen, ns)
+        ScoreboardService._record_script()(
+            keys=[f"{prefix}:best:{user_id}", f"{prefix}:rank"],
+            args=[problem_id, score, ts, user_id, SCALE],
+            client=pipe,
+        )
+
+    @staticmethod
+    def _state() -> Tuple[int, Optional[int], Optional[int]]:
+        """(current generation, generation being rebuilt, frozen_at)"""
+        gen, rebuilding, frozen_at = get_redis().mget(GEN_KEY, REBUILD_GEN_KEY, FROZEN_AT_KEY)
+        return (
+            int(gen or 0),
+            int(rebuilding) if rebuilding else None,
+            int(frozen_at) if frozen_at else None,
+        )
+
+    @staticmethod
+    def record(sub: Submission) -> None:
+        """
+        Called by the worker once a submission is final. Only ever raises a
+        user's best score; a rejudge that lowers scores needs rebuild().
+        Never raises.
+        """
+        if sub.sample_only or not sub.score or sub.score <= 0:
+            return
+        if getattr(sub.status, "value", sub.status) not in SCORED_STATUSES:
+            return
+        try:
+            gen, rebuilding, frozen_at = ScoreboardService._state()
+            ts = _ts(sub.submit_time)
+            pipe = get_redis().pipeline(transaction=False)
+            # a running rebuild may already have read past this submission
+            for g in {gen, rebuilding} - {None}:
+                ScoreboardService._apply(pipe, g, "live", str(sub.user_id), str(sub.problem_id), sub.score, ts)
+                if frozen_at is not None and ts < frozen_at:
+                    ScoreboardService._apply(pipe, g, "public", str(sub.user_id), str(sub.problem_id), sub.score, ts)
+            pipe.execute()
+        except Exception as e:
+            print(f"[Scoreboard] Failed to record {sub.id}: {e}")
+
+    @staticmethod
+    def page(offset: int = 0, limit: int = 50, live: bool = False) -> dict:
+        """One page of the ranking: O(log N + page) in Redis."""
+        gen, _, frozen_at = ScoreboardService._state()
+        ns = "public" if frozen_at is not None and not live else "live"
+        prefix = _prefix(gen, ns)
+
+        r = get_redis()
+        rows = r.zrevrange(f"{prefix}:rank", offset, offset + limit - 1, withscores=True)
+        pipe = r.pipeline(transaction=False)
+        for user_id, _ in rows:
+            pipe.hgetall(f"{prefix}:best:{user_id}")
+        details = pipe.execute()
+
+        entries = []
+        for i, ((user_id, value), best) in enumerate(zip(rows, details)):
+            total, last = decode_rank_score(value)
+            entries.append({
+                "rank": offset + i + 1,
+                "user_id": user_id,
+                "total": total,
+                "last_improved_at": datetime.utcfromtimestamp(last),
+                "problems": {k: int(v) for k, v in best.items() if not k.endswith(":t")},
+            })
+
+        return {
+            "frozen_at": datetime.utcfromtimestamp(frozen_at) if frozen_at is not None else None,
+            "live": ns == "live",
+            "total_users": r.zcard(f"{prefix}:rank"),
+            "entries": entries,
+        }
+
+    @staticmethod
+    def _copy_namespace(gen: int, src: str, dst: str) -> None:
+        r = get_redis()
+        pipe = r.pipeline(transaction=False)
+        for key in r.scan_iter(match=f"{_prefix(gen, src)}:*", count=1000):
+            pipe.copy(key, key.replace(_prefix(gen, src), _prefix(gen, dst), 1), replace=True)
+        pipe.execute()
+
+    @staticmethod
+    def _drop_namespace(gen: int, ns: str) -> None:
+        r = get_redis()
+        keys = list(r.scan_iter(match=f"{_prefix(gen, ns)}:*", count=1000))
+        for i in range(0, len(keys), 1000):
+            r.unlink(*keys[i:i + 1000])
+
+    @staticmethod
+    def freeze(db: Session, at: Optional[datetime] = None) -> None:
+        """
+        Public ranking stops taking submissions made at or after `at` (default
+        now). The live board already has results past an `at` in the past, so
+        the public one is then rebuilt from the submissions made before it.
+        """
+        gen, _, frozen_at = ScoreboardService._state()
+        if frozen_at is not None:
+            return
+        now = int(time.time())
+        frozen_at = _ts(at) if at else now
+        # from here on record() also feeds results for pre-freeze submissions
+        # still being judged into the public board
+        get_redis().set(FROZEN_AT_KEY, frozen_at)
+
+        if frozen_at >= now:
+            # the live board as of now becomes the public one
+            ScoreboardService._copy_namespace(gen, "live", "public")
+            return
+
+        pipe = get_redis().pipeline(transaction=False)
+        pending = 0
+        before = datetime.utcfromtimestamp(frozen_at)
+        for user_id, problem_id, score, submit_time in ScoreboardService._best_results(db, before):
+            ScoreboardService._apply(pipe, gen, "public", str(user_id), str(problem_id), score, _ts(submit_time))
+            pending += 1
+            if pending >= REBUILD_BATCH:
+                pipe.execute()
+                pending = 0
+        pipe.execute()
+
+    @staticmethod
+    def unfreeze() -> None:
+        gen, _, _ = ScoreboardService._state()
+        get_redis().delete(FROZEN_AT_KEY)
+        ScoreboardService._drop_namespace(gen, "public")
+
+    @staticmethod
+    def _best_results(db: Session, before: Optional[datetime] = None) -> Iterable:
+        """
+        Per (user, problem): best positive score and the earliest submission
+        reaching it, counting only submissions made before `before` if given.
+        """
+        query = (
+            db.query(Submission.user_id, Submission.problem_id, Submission.score, Submission.submit_time)
+            .filter(
+                Submission.score > 0,
+                Submission.status.in_(SCORED_STATUSES),
+                Submission.sample_only.is_(False)
+            )
+        )
+        if before is not None:
+            query = query.filter(Submission.submit_time < before)
+        return (
+            query
+            .distinct(Submission.user_id, Submission.problem_id)
+            .order_by(
+                Submission.user_id, Submission.problem_id,
+                Submission.score.desc(), Submission.submit_time.asc()
+            )
+            .yield_per(REBUILD_BATCH)
+        )
+
+    @staticmethod
+    def rebuild(db: Session) -> dict:
+        """
+        Recompute the board from submission history into a new generation,
+        switch to it, and report how many users' totals the incremental
+        board had wrong.
+        """
+        r = get_redis()
+        old_gen, _, frozen_at = ScoreboardService._state()
+        new_gen = old_gen + 1
+        ScoreboardService._drop_namespace(new_gen, "live")
+        ScoreboardService._drop_namespace(new_gen, "public")
+        r.set(REBUILD_GEN_KEY, new_gen)
+
+        try:
+            pipe = r.pipeline(transaction=False)
+            pending = 0
+            for user_id, problem_id, score, submit_time in ScoreboardService._best_results(db):
+                ts = _ts(submit_time)
+                ScoreboardService._apply(pipe, new_gen, "live", str(user_id), str(problem_id), score, ts)
+                if frozen_at is not None and ts < frozen_at:
+                    ScoreboardService._apply(pipe, new_gen, "public", str(user_id), str(problem_id), score, ts)
+                pending += 1
+                if pending >= REBUILD_BATCH:
+                    pipe.execute()
+                    pending = 0
+            pipe.execute()
+
+            old = dict(r.zrange(f"{_prefix(old_gen, 'live')}:rank", 0, -1, withscores=True))
+            new = dict(r.zrange(f"{_prefix(new_gen, 'live')}:rank", 0, -1, withscores=True))
+            mismatched = sum(1 for user_id in old.keys() | new.keys() if old.get(user_id) != new.get(user_id))
+
+            r.set(GEN_KEY, new_gen)
+        finally:
+            r.delete(REBUILD_GEN_KEY)
+
+        ScoreboardService._drop_namespace(old_gen, "live")
+        ScoreboardService._drop_namespace(old_gen, "public")
+        return {"users": len(new), "mismatched": mismatched}
@@ -0,0 +1,83 @@
+import hashlib
+import os
+from typing import Optional
+
+from app.core.config import settings
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_manifest(path: str) -> Optional[dict]:
+    """size, sha256, line count and mtime of a file, read in one streaming pass."""
+    if not os.path.isfile(path):
+        return None
+
+    # taken before reading: a file rewritten meanwhile no longer matches the manifest
+    mtime_ns = os.stat(path).st_mtime_ns
+    h = hashlib.sha256()
+    size = 0
+    lines = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+            size += len(chunk)
+            lines += chunk.count(b"\n")
+
+    return {"size": size, "sha256": h.hexdigest(), "lines": lines, "mtime_ns": mtime_ns}
+
+
+def manifest_current(path: str, size: Optional[int], mtime_ns: Optional[int]) -> bool:
+    """Whether the file is still the one a manifest describes: same size and mtime, one stat."""
+    if size is None or mtime_ns is None:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size == size and st.st_mtime_ns == mtime_ns
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class TestDataService:
+    @staticmethod
+    def build_manifest(input_path: str, output_path: str) -> dict:
+        """
+        TestCase manifest columns for files under DATA_DIR. Missing files leave
+        the columns empty; the worker then falls back to reading the shared copy.
+        """
+        input_info = file_manifest(os.path.join(settings.DATA_DIR, input_path))
+        output_info = file_manifest(os.path.join(settings.DATA_DIR, output_path))
+
+        return {
+            "input_size": input_info["size"] if input_info else None,
+            "input_sha256": input_info["sha256"] if input_info else None,
+            "output_size": output_info["size"] if output_info else None,
+            "output_sha256": output_info["sha256"] if output_info else None,
+            "output_lines": output_info["lines"] if output_info else None,
+            "output_mtime_ns": output_info["mtime_ns"] if output_info else None,
+        }
+
+    @staticmethod
+    def is_current(case) -> bool:
+        """Whether a test case's manifest still describes its files under DATA_DIR."""
+        output_path = os.path.join(settings.DATA_DIR, case.output_path)
+        if not manifest_current(output_path, case.output_size, case.output_mtime_ns):
+            return False
+        input_path = os.path.join(settings.DATA_DIR, case.input_path)
+        try:
+            return os.path.getsize(input_path) == case.input_size
+        except OSError:
+            return False
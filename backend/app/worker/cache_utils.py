@@ -0,0 +1,41 @@
+import os
+import time
+
+
+def evict_lru(cache_dir: str, max_bytes: int) -> int:
+    """
+    Remove the least recently used files (by mtime, which readers bump on
+    every hit) under cache_dir until it fits in max_bytes. Returns the number
+    of files removed.
+    """
+    entries = []
+    total = 0
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            # leftovers of a crashed store
+            if name.endswith(".tmp") and time.time() - st.st_mtime > 3600:
+                os.remove(path)
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+
+    return removed
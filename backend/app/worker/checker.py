@@ -0,0 +1,91 @@
+import os
+import shlex
+import subprocess
+import tempfile
+from typing import Optional, Tuple
+
+from app.worker import compile_cache
+
+# Special judges are run on the worker itself: `<checker> <input> <user_output> <expected_output>`
+# exit code 0 -> AC, 1 -> WA, anything else -> checker failure (System Error).
+CHECKER_COMPILE_COMMAND = os.getenv("CHECKER_COMPILE_COMMAND", "g++ -O2 -std=c++17 {source} -o {output}")
+CHECKER_DIR = os.getenv("CHECKER_DIR", "/tmp/poj-checkers")
+CHECKER_TIMEOUT = float(os.getenv("CHECKER_TIMEOUT", "10"))
+CHECKER_MSG_LIMIT = 1024
+
+
+def get_checker(judge_script: str) -> Tuple[Optional[str], str]:
+    """
+    Path of the compiled checker for this script, compiling it at most once per
+    script version: first the worker-local copy, then the shared compile cache.
+    Returns (path, "") or (None, error message).
+    """
+    if not judge_script:
+        return None, "Special judge has no checker source"
+
+    key = compile_cache.cache_key(judge_script, "checker", CHECKER_COMPILE_COMMAND)
+    checker_path = os.path.join(CHECKER_DIR, key)
+    if os.path.exists(checker_path):
+        return checker_path, ""
+
+    os.makedirs(CHECKER_DIR, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix="build-", dir=CHECKER_DIR)
+    source_file = os.path.join(build_dir, "checker.cpp")
+    exe_file = os.path.join(build_dir, "checker")
+
+    try:
+        if not compile_cache.fetch(key, exe_file):
+            with open(source_file, "w") as f:
+                f.write(judge_script)
+
+            cmd_args = shlex.split(CHECKER_COMPILE_COMMAND.format(source=source_file, output=exe_file))
+            result = subprocess.run(
+                cmd_args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=30
+            )
+            if result.returncode != 0:
+                return None, f"Checker Compilation Error: {result.stderr[:CHECKER_MSG_LIMIT]}"
+
+            compile_cache.store(key, exe_file)
+
+        os.chmod(exe_file, 0o755)
+        os.replace(exe_file, checker_path)
+        return checker_path, ""
+
+    except subprocess.TimeoutExpired:
+        return None, "Checker compilation timeout"
+    except Exception as e:
+        return None, f"Checker System Error: {e}"
+    finally:
+        for name in ("checker.cpp", "checker"):
+            path = os.path.join(build_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(build_dir)
+
+
+def run_checker(checker_path: str, input_path: str, user_output_path: str, expected_path: str) -> Tuple[str, str]:
+    """Returns ("AC" | "WA" | "ERR", checker message)."""
+    try:
+        result = subprocess.run(
+            [checker_path, input_path, user_output_path, expected_path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=CHECKER_TIMEOUT
+        )
+    except subprocess.TimeoutExpired:
+        return "ERR", "Checker timeout"
+    except Exception as e:
+        return "ERR", f"Checker System Error: {e}"
+
+    msg = (result.stderr or result.stdout)[:CHECKER_MSG_LIMIT].decode(errors="replace").strip()
+
+    if result.returncode == 0:
+        return "AC", msg
+    if result.returncode == 1:
+        return "WA", msg
+    return "ERR", f"Checker exited with code {result.returncode}: {msg}"
@@ -0,0 +1,248 @@
+import math
+import re
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple
+
+CHUNK_SIZE = 1024 * 1024
+SNIPPET_SIZE = 100
+
+WHITESPACE = b" \t\n\r\x0b\x0c"
+TOKEN_RE = re.compile(rb"[^ \t\n\r\x0b\x0c]+")
+
+# compare modes
+EXACT = "exact"                 # equal after normalizing newlines and stripping leading/trailing whitespace
+WHITESPACE_MODE = "whitespace"  # same whitespace-separated tokens
+FLOAT = "float"                 # like whitespace, numeric tokens within tolerance
+
+
+class CompareResult(NamedTuple):
+    ok: bool
+    line: int = 0            # 1-based line of the first difference in the user output
+    offset: int = 0          # byte offset of the first difference in the user output (exact mode: after newline normalization)
+    user: str = ""
+    expected: str = ""
+    msg: str = ""
+
+
+def _snippet(data: bytes) -> str:
+    text = data[:SNIPPET_SIZE].decode(errors="replace")
+    return text + "..." if len(data) > SNIPPET_SIZE else text
+
+
+class _NewlineReader:
+    """
+    Reads a binary file the way text mode would see it: \r\n and a lone \r
+    both become \n, including a \r\n split across two reads.
+    """
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.buffer = b""
+        self.pending = b""   # a trailing \r whose \n may be in the next chunk
+        self.eof = False
+
+    def _fill(self) -> None:
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            raw, self.pending = self.pending, b""
+        else:
+            raw = self.pending + chunk
+            self.pending = b""
+            if raw.endswith(b"\r"):
+                raw, self.pending = raw[:-1], b"\r"
+        if b"\r" in raw:
+            raw = raw.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        self.buffer += raw
+
+    def read(self, size: int) -> bytes:
+        while len(self.buffer) < size and not self.eof:
+            self._fill()
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def unread(self, data: bytes) -> None:
+        self.buffer = data + self.buffer
+
+
+def _skip_whitespace(f: _NewlineReader) -> int:
+    """Moves f past leading whitespace, returns how much was skipped."""
+    pos = 0
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            return pos
+        stripped = chunk.lstrip(WHITESPACE)
+        if stripped:
+            pos += len(chunk) - len(stripped)
+            f.unread(stripped)
+            return pos
+        pos += len(chunk)
+
+
+def _rest_is_whitespace(head: bytes, f: _NewlineReader) -> bool:
+    if head.strip(WHITESPACE):
+        return False
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            return True
+        if chunk.strip(WHITESPACE):
+            return False
+
+
+def _first_diff(a: bytes, b: bytes) -> int:
+    n = min(len(a), len(b))
+    lo, hi = 0, n
+    # bisect on prefix equality; slices compare in C
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if a[lo:mid + 1] == b[lo:mid + 1]:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _compare_exact(uf: _NewlineReader, ef: _NewlineReader) -> CompareResult:
+    offset = _skip_whitespace(uf)
+    _skip_whitespace(ef)
+    line = 1
+
+    while True:
+        a = uf.read(CHUNK_SIZE)
+        b = ef.read(CHUNK_SIZE)
+
+        if a == b:
+            if not a:
+                return CompareResult(True)
+            line += a.count(b"\n")
+            offset += len(a)
+            continue
+
+        i = _first_diff(a, b)
+        # trailing whitespace never counts, same as str.strip()
+        if _rest_is_whitespace(a[i:], uf) and _rest_is_whitespace(b[i:], ef):
+            return CompareResult(True)
+
+        return CompareResult(
+            False,
+            line=line + a[:i].count(b"\n"),
+            offset=offset + i,
+            user=_snippet(a[i:]),
+            expected=_snippet(b[i:]),
+        )
+
+
+def _tokens(f: BinaryIO) -> Iterator[bytes]:
+    """Whitespace-separated tokens, one chunk in memory at a time."""
+    carry = b""
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            if carry:
+                yield carry
+            return
+
+        data = carry + chunk
+        parts = data.split()
+        # the last token may continue in the next chunk
+        carry = parts.pop() if parts and data[-1] not in WHITESPACE else b""
+        yield from parts
+
+
+def _token_position(f: BinaryIO, index: int) -> Tuple[int, int]:
+    """(line, offset) of the index-th token; only called once, on a mismatch."""
+    f.seek(0)
+    line = 1
+    offset = 0
+    seen = 0
+    carry = b""
+
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        data = carry + chunk
+        matches = list(TOKEN_RE.finditer(data))
+
+        carry = b""
+        if chunk and matches and matches[-1].end() == len(data):
+            carry = data[matches[-1].start():]
+            matches.pop()
+
+        for m in matches:
+            if seen == index:
+                return line + data[:m.start()].count(b"\n"), offset + m.start()
+            seen += 1
+
+        consumed = len(data) - len(carry)
+        line += data[:consumed].count(b"\n")
+        offset += consumed
+        if not chunk:
+            return line, offset
+
+
+def _tokens_equal(a: bytes, b: bytes, tolerance: Optional[float]) -> bool:
+    if a == b:
+        return True
+    if tolerance is None:
+        return False
+    try:
+        x = float(a)
+        y = float(b)
+    except ValueError:
+        return False
+    if math.isnan(x) or math.isnan(y):
+        return math.isnan(x) and math.isnan(y)
+    # absolute or relative error, whichever is more lenient
+    return abs(x - y) <= tolerance * max(1.0, abs(y))
+
+
+def _compare_tokens(uf: BinaryIO, ef: BinaryIO, tolerance: Optional[float]) -> CompareResult:
+    user_tokens = _tokens(uf)
+    expected_tokens = _tokens(ef)
+    index = 0
+
+    while True:
+        u = next(user_tokens, None)
+        e = next(expected_tokens, None)
+
+        if u is None and e is None:
+            return CompareResult(True)
+
+        if u is not None and e is not None and _tokens_equal(u, e, tolerance):
+            index += 1
+            continue
+
+        if u is None:
+            msg = f"Output ended early, expected more at token {index + 1}"
+        elif e is None:
+            msg = f"Extra output at token {index + 1}"
+        else:
+            msg = f"Token {index + 1} differs"
+
+        line, offset = _token_position(uf, index)
+        return CompareResult(
+            False,
+            line=line,
+            offset=offset,
+            user=_snippet(u) if u is not None else "",
+            expected=_snippet(e) if e is not None else "",
+            msg=msg,
+        )
+
+
+def compare_files(
+    user_path: str,
+    expected_path: str,
+    mode: str = EXACT,
+    float_tolerance: Optional[float] = None
+) -> CompareResult:
+    """
+    Compares two output files chunk by chunk, stopping at the first difference,
+    so memory use is bounded by CHUNK_SIZE regardless of output size.
+    """
+    with open(user_path, "rb") as uf, open(expected_path, "rb") as ef:
+        if mode == WHITESPACE_MODE:
+            return _compare_tokens(uf, ef, None)
+        if mode == FLOAT:
+            return _compare_tokens(uf, ef, float_tolerance if float_tolerance is not None else 1e-6)
+        return _compare_exact(_NewlineReader(uf), _NewlineReader(ef))
@@ -0,0 +1,100 @@
+import functools
+import hashlib
+import os
+import shlex
+import shutil
+import subprocess
+import uuid
+from typing import Optional
+
+from app.worker.cache_utils import evict_lru
+from app.worker.metrics import COMPILE_CACHE_EVENTS
+
+DATA_DIR = os.getenv("DATA_DIR", "/data")
+COMPILE_CACHE_DIR = os.getenv("COMPILE_CACHE_DIR", os.path.join(DATA_DIR, "compile_cache"))
+COMPILE_CACHE_MAX_BYTES = int(os.getenv("COMPILE_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+COMPILE_CACHE_ENABLED = os.getenv("COMPILE_CACHE_ENABLED", "true").lower() == "true"
+
+@functools.lru_cache(maxsize=32)
+def compiler_version(compiler: str) -> str:
+    """First line of `<compiler> --version`, looked up once per worker process."""
+    try:
+        result = subprocess.run(
+            [compiler, "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=5
+        )
+        lines = (result.stdout or result.stderr).strip().splitlines()
+        return lines[0] if lines else "unknown"
+    except Exception:
+        return "unknown"
+
+
+def cache_key(code: str, language: str, compile_cmd_template: str) -> str:
+    try:
+        compiler = shlex.split(compile_cmd_template)[0]
+    except (ValueError, IndexError):
+        compiler = ""
+
+    h = hashlib.sha256()
+    for part in (code, language or "", compile_cmd_template, compiler_version(compiler)):
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(COMPILE_CACHE_DIR, key[:2], key)
+
+
+def fetch(key: str, exe_file: str) -> bool:
+    """Copy a cached binary to exe_file. Returns False on a miss."""
+    if not COMPILE_CACHE_ENABLED:
+        return False
+
+    entry = _entry_path(key)
+    try:
+        shutil.copyfile(entry, exe_file)
+    except OSError:
+        COMPILE_CACHE_EVENTS.labels("miss").inc()
+        return False
+
+    # mtime doubles as the LRU timestamp
+    try:
+        os.utime(entry, None)
+    except OSError:
+        pass
+
+    COMPILE_CACHE_EVENTS.labels("hit").inc()
+    return True
+
+
+def store(key: str, exe_file: str) -> None:
+    if not COMPILE_CACHE_ENABLED or not os.path.exists(exe_file):
+        return
+
+    entry = _entry_path(key)
+    tmp_path = f"{entry}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        shutil.copyfile(exe_file, tmp_path)
+        # atomic, so concurrent workers never see a half-written binary
+        os.replace(tmp_path, entry)
+    except OSError as e:
+        print(f"[CompileCache] Failed to store {key}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+
+    COMPILE_CACHE_EVENTS.labels("store").inc()
+    evict()
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """Drop least recently used binaries until the cache fits in max_bytes."""
+    max_bytes = COMPILE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    removed = evict_lru(COMPILE_CACHE_DIR, max_bytes)
+    COMPILE_CACHE_EVENTS.labels("eviction").inc(removed)
+    return removed
@@ -0,0 +1,87 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from celery.signals import worker_init, worker_process_shutdown
+from prometheus_client import CollectorRegistry, Counter, Histogram, start_http_server
+from prometheus_client import multiprocess
+
+# Prefork workers: each child writes its samples to PROMETHEUS_MULTIPROC_DIR
+# and the parent serves the aggregate on WORKER_METRICS_PORT (0 disables).
+# The directory is cleaned and created by worker.sh before Celery starts.
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Phases of one judge, in pipeline order:
+#   queue_wait        enqueue (or submit) -> compile task start
+#   source_write      writing the source file
+#   compile           compiler run, or compile cache fetch
+#   run_queue_wait    compile done -> run task start
+#   slurm_submit      sbatch round trip
+#   slurm_queue_wait  sacct Submit -> first Start
+#   slurm_run         sacct first Start -> last End
+#   slurm_wait        blocking `sbatch --wait` (sync mode: queue + run together)
+#   check_queue_wait  poller claim -> check task start
+#   output_read       hash check and expected-output fetch
+#   compare           comparator or special judge
+#   db_commit         final status commit (histogram only; it cannot store itself)
+JUDGE_PHASE_SECONDS = Histogram(
+    "poj_judge_phase_seconds",
+    "Time spent in each phase of judging a submission",
+    ["phase"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
+# compile cache outcomes (hit / miss / store / eviction), shared by submissions
+# and special judge checkers
+COMPILE_CACHE_EVENTS = Counter(
+    "poj_compile_cache_events",
+    "Compile cache lookups, stores and evicted binaries",
+    ["event"],
+)
+
+
+class PhaseTimer:
+    """Accumulates seconds per phase for one submission and feeds the histogram."""
+
+    def __init__(self, phases: Optional[Dict[str, float]] = None):
+        self.phases: Dict[str, float] = dict(phases or {})
+
+    def add(self, phase: str, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        self.phases[phase] = round(self.phases.get(phase, 0.0) + seconds, 6)
+        JUDGE_PHASE_SECONDS.labels(phase).observe(seconds)
+
+    def since(self, phase: str, started_at: Optional[float]) -> None:
+        """Wall-clock phase that began in another process, e.g. a queue wait."""
+        if started_at is not None:
+            self.add(phase, time.time() - started_at)
+
+    @contextmanager
+    def span(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    if not WORKER_METRICS_PORT:
+        return
+
+    if not PROMETHEUS_MULTIPROC_DIR:
+        start_http_server(WORKER_METRICS_PORT)
+        return
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    start_http_server(WORKER_METRICS_PORT, registry=registry)
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid or os.getpid())
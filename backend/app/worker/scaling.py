@@ -0,0 +1,58 @@
+import os
+from typing import List, Optional, Sequence, Tuple
+
+from app.models.problem import Problem
+
+# Scaling mode: once a submission is accepted, every case is rerun on each of
+# Problem.scaling_cores as concurrent Slurm array jobs, and the speedup
+# T_ref / T_p is graded against Problem.scaling_min_efficiency.
+SCALING_POLL_INTERVAL = float(os.getenv("SCALING_POLL_INTERVAL", "5"))
+SCALING_TIMEOUT = int(os.getenv("SCALING_TIMEOUT", "3600"))
+
+
+def run_dir(work_dir: str, cores: int) -> str:
+    return os.path.join(work_dir, f"scale_{cores}")
+
+
+def time_limit(problem: Problem, cores: int) -> int:
+    """time_limit is set for core_number; fewer cores get proportionally longer."""
+    return int(problem.time_limit * max(1.0, (problem.core_number or 1) / cores))
+
+
+def measure(cores: int, runs: Sequence[Tuple]) -> dict:
+    """Total wall time of one core count over all cases; status of the first run that did not finish OK."""
+    status = next((run[0] for run in runs if run[0] != "OK"), "OK")
+    return {"cores": cores, "time": sum(run[2] for run in runs), "status": status}
+
+
+def summarize(problem: Problem, points: List[dict]) -> dict:
+    """
+    Speedup and efficiency of each core count. Without a configured
+    scaling_reference_time the reference is the smallest count's time, scaled
+    as if that count had been perfectly efficient (T_1 itself when 1 is listed).
+    """
+    points = sorted(points, key=lambda point: point["cores"])
+    base = points[0]
+    reference: Optional[int] = problem.scaling_reference_time or base["time"] * base["cores"]
+    min_efficiency = problem.scaling_min_efficiency
+
+    passed = True
+    for point in points:
+        if point["status"] != "OK" or not point["time"]:
+            point["speedup"] = None
+            point["efficiency"] = None
+            passed = False
+            continue
+
+        speedup = reference / point["time"]
+        point["speedup"] = round(speedup, 3)
+        point["efficiency"] = round(speedup / point["cores"], 3)
+        if min_efficiency is not None and point["efficiency"] < min_efficiency:
+            passed = False
+
+    return {
+        "reference_time": reference,
+        "min_efficiency": min_efficiency,
+        "passed": passed,
+        "points": points,
+    }
@@ -0,0 +1,666 @@
+import math
+import os
+import shlex
+import subprocess
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from app.models.problem import Problem
+from app.worker.transport import get_transport
+
+# Submit all test cases of a submission as one job array instead of one job per case
+SLURM_ARRAY_MODE = os.getenv("SLURM_ARRAY_MODE", "true").lower() == "true"
+
+# Only the head of stderr is shown to the user
+ERROR_READ_LIMIT = 64 * 1024
+
+# The run command is killed in-job at the problem's time limit; Slurm's own
+# --time (checked by slurmctld only every ~30 s) is just a backstop this far above it
+SLURM_TIME_GRACE = int(os.getenv("SLURM_TIME_GRACE", "30"))
+# How long `sbatch --wait` may sit in the queue on top of the jobs' --time
+SLURM_QUEUE_SLACK = int(os.getenv("SLURM_QUEUE_SLACK", "120"))
+# exit code of `timeout` when it had to kill the command
+TIMEOUT_EXIT_CODE = 124
+
+# States after which a job (or array task) will not change anymore
+TERMINAL_STATES = {
+    "COMPLETED", "FAILED", "TIMEOUT", "OUT_OF_MEMORY", "CANCELLED",
+    "NODE_FAIL", "PREEMPTED", "BOOT_FAIL", "DEADLINE",
+}
+# Terminal states that mean the user's program failed (CANCELLED is usually us)
+FAILURE_STATES = {"FAILED", "TIMEOUT", "OUT_OF_MEMORY", "NODE_FAIL", "BOOT_FAIL", "DEADLINE"}
+
+class CpuTime(NamedTuple):
+    """CPU time of one job (or array task) summed over its processes, in ms (sacct TotalCPU/UserCPU/SystemCPU)."""
+    total_ms: int = 0
+    user_ms: int = 0
+    system_ms: int = 0
+
+NO_CPU = CpuTime()
+
+def parse_slurm_memory(mem_str: str) -> int:
+    if not mem_str:
+        return 0
+    
+    mem_str = mem_str.strip()
+    if not mem_str or mem_str == "0":
+        return 0
+
+    units = {'K': 1, 'M': 1024, 'G': 1024*1024, 'T': 1024*1024*1024}
+    suffix = mem_str[-1].upper()
+    
+    try:
+        if suffix in units:
+            value = float(mem_str[:-1])
+            return int(value * units[suffix])
+        else:
+            return int(float(mem_str))
+    except:
+        return 0
+
+def parse_slurm_duration(value: str) -> int:
+    """`[DD-[HH:]]MM:SS[.mmm]` (as in TotalCPU) -> ms; 0 when empty or malformed."""
+    value = (value or "").strip()
+    if not value:
+        return 0
+
+    try:
+        days = 0
+        if "-" in value:
+            day_part, value = value.split("-", 1)
+            days = int(day_part)
+
+        seconds = 0.0
+        for part in value.split(":"):
+            seconds = seconds * 60 + float(part)
+        return int(round((days * 86400 + seconds) * 1000))
+    except ValueError:
+        return 0
+
+def load_task_stat(stat: Sequence) -> Tuple[str, int, int, CpuTime]:
+    """Task stats come back from JSON (Celery) as nested lists."""
+    cpu = CpuTime(*stat[3]) if len(stat) > 3 and stat[3] else NO_CPU
+    return stat[0], int(stat[1]), int(stat[2]), cpu
+
+class Placement(NamedTuple):
+    """Where one run's MPI ranks go: ntasks ranks over nodes, cpus_per_task threads each."""
+    nodes: int
+    ntasks: int
+    tasks_per_node: Optional[int]
+    cpus_per_task: int
+    exclusive: bool
+
+def placement(problem: Problem, core_number: Optional[int] = None) -> Placement:
+    """
+    core_number (the problem's unless overridden, e.g. by a scaling run) is
+    the number of MPI ranks. With tasks_per_node the node count follows from
+    it; otherwise ranks are spread over at most problem.nodes nodes.
+    """
+    ntasks = core_number or problem.core_number or 1
+    tasks_per_node = problem.tasks_per_node
+    if tasks_per_node:
+        nodes = math.ceil(ntasks / tasks_per_node)
+        tasks_per_node = min(tasks_per_node, ntasks)
+    else:
+        nodes = min(problem.nodes or 1, ntasks)
+    return Placement(
+        nodes=nodes,
+        ntasks=ntasks,
+        tasks_per_node=tasks_per_node,
+        cpus_per_task=problem.cpus_per_task or 1,
+        exclusive=problem.placement == "exclusive",
+    )
+
+def _resource_directives(where: Placement) -> str:
+    lines = [f"#SBATCH --nodes={where.nodes}", f"#SBATCH --ntasks={where.ntasks}"]
+    if where.tasks_per_node:
+        lines.append(f"#SBATCH --ntasks-per-node={where.tasks_per_node}")
+    if where.cpus_per_task > 1:
+        lines.append(f"#SBATCH --cpus-per-task={where.cpus_per_task}")
+    if where.exclusive:
+        lines.append("#SBATCH --exclusive")
+    return "\n".join(lines)
+
+def format_run_command(run_cmd_template: str, exe: str, input: str, where: Placement) -> str:
+    """
+    run_command placeholders: {exe}, {input}, {core_number} (MPI ranks),
+    {nodes}, {tasks_per_node} and {cpus_per_task}, e.g.
+    `mpirun -np {core_number} {exe} < {input}` or
+    `srun --ntasks-per-node={tasks_per_node} --cpus-per-task={cpus_per_task} {exe} {input}`.
+    """
+    return run_cmd_template.format(
+        exe=exe,
+        input=input,
+        core_number=where.ntasks,
+        nodes=where.nodes,
+        tasks_per_node=where.tasks_per_node or math.ceil(where.ntasks / where.nodes),
+        cpus_per_task=where.cpus_per_task
+    )
+
+def slurm_time_seconds(time_limit_ms: int) -> int:
+    return math.ceil(time_limit_ms / 1000) + SLURM_TIME_GRACE
+
+def slurm_time_limit(time_limit_ms: int) -> str:
+    """--time value (minutes:seconds) a grace period above the problem's limit."""
+    seconds = slurm_time_seconds(time_limit_ms)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+def sbatch_wait_timeout(time_limit_ms: int, n_tasks: int = 1) -> int:
+    """
+    Subprocess timeout for `sbatch --wait`: Slurm's own --time for each task,
+    as if the cluster had room for a single task at a time, plus queue slack.
+    Anything shorter gives up on jobs Slurm would still let finish.
+    """
+    return slurm_time_seconds(time_limit_ms) * n_tasks + SLURM_QUEUE_SLACK
+
+def timed_run_command(real_run_cmd: str, time_limit_ms: int, time_file: str) -> str:
+    """
+    Job script body that runs the command under `timeout` at time_limit_ms
+    and writes "<wall ms> <exit code>" to time_file, so the wall
+    time has ms resolution instead of sacct's whole seconds. The command runs
+    in its own bash so pipes and redirections in run_command keep working;
+    `timeout` signals the whole process group, mpirun children included.
+    time_file is expanded by bash (it may reference $SLURM_ARRAY_TASK_ID).
+    """
+    limit = f"{time_limit_ms / 1000:.3f}"
+    return f"""__start=$(date +%s%N)
+timeout --kill-after=1 {limit} bash -c {shlex.quote(real_run_cmd)}
+__rc=$?
+__end=$(date +%s%N)
+echo "$(( (__end - __start) / 1000000 )) $__rc" > "{time_file}"
+exit $__rc"""
+
+def _read_time_file(time_file: str) -> Tuple[Optional[int], Optional[int]]:
+    """(wall ms, exit code) written by timed_run_command, (None, None) if the job never got there."""
+    try:
+        with open(time_file, "r") as f:
+            wall_ms, rc = f.read().split()
+        return int(wall_ms), int(rc)
+    except (OSError, ValueError):
+        return None, None
+
+def _query_sacct(job_ids: str, fields: str, retries: int = 3) -> str:
+    sacct_cmd = ["sacct", "-j", job_ids, f"--format={fields}", "-n", "-p"]
+
+    result = None
+    for attempt in range(retries):
+        result = get_transport().run(sacct_cmd)
+        if result.stdout.strip() or attempt == retries - 1:
+            break
+        time.sleep(1)
+
+    return result.stdout.strip()
+
+def _split_array_job_id(raw_job_id: str) -> Tuple[str, Optional[int]]:
+    """`123_4.batch` -> ("123", 4); pending ranges such as `123_[2-5]` -> ("123", None)."""
+    base_id = raw_job_id.split('.')[0]
+    job_id, _, task = base_id.partition('_')
+    try:
+        return job_id, int(task)
+    except ValueError:
+        return job_id, None
+
+def _array_range_tasks(raw_job_id: str) -> List[int]:
+    """Task ids of a range row: `123_[0-3]`, `123_[0-3%1]`, `123_[1,4-5]` -> [..]; [] otherwise."""
+    _, _, task = raw_job_id.split('.')[0].partition('_')
+    if not (task.startswith('[') and task.endswith(']')):
+        return []
+
+    task_ids = []
+    try:
+        for part in task[1:-1].split('%')[0].split(','):
+            first, _, last = part.partition('-')
+            task_ids.extend(range(int(first), int(last or first) + 1))
+    except ValueError:
+        return []
+    return task_ids
+
+def _summarize_job_steps(rows: List[List[str]]) -> Tuple[str, int, int, CpuTime]:
+    # rows: [State, ElapsedRaw, MaxRSS, TotalCPU, UserCPU, SystemCPU] of every
+    # step belonging to one job (or one array task)
+    max_time_sec = 0
+    max_mem_kb = 0
+    # the job's own row already sums its steps, so the max is the job's total
+    cpu = NO_CPU
+    final_state = "COMPLETED"
+
+    for parts in rows:
+        if len(parts) < 3 or not parts[0].strip():
+            continue
+
+        state = parts[0].split()[0]
+        time_raw = parts[1]
+        mem_raw = parts[2]
+
+        if "TIMEOUT" in state:
+            final_state = "TIMEOUT"
+        elif "OUT_OF_MEMORY" in state and final_state != "TIMEOUT":
+            final_state = "OUT_OF_MEMORY"
+        elif "FAILED" in state and final_state not in ["TIMEOUT", "OUT_OF_MEMORY"]:
+            final_state = "FAILED"
+        elif "CANCELLED" in state:
+            final_state = "CANCELLED"
+
+        try:
+            t = int(float(time_raw))
+            if t > max_time_sec:
+                max_time_sec = t
+        except:
+            pass
+
+        m = parse_slurm_memory(mem_raw)
+        if m > max_mem_kb:
+            max_mem_kb = m
+
+        if len(parts) >= 6:
+            step_cpu = CpuTime(*(parse_slurm_duration(v) for v in parts[3:6]))
+            if step_cpu.total_ms > cpu.total_ms:
+                cpu = step_cpu
+
+    return final_state, max_time_sec * 1000, max_mem_kb, cpu
+
+def get_job_stats(job_id: str) -> Tuple[str, int, int, CpuTime]:
+    try:
+        output = _query_sacct(job_id, "State,ElapsedRaw,MaxRSS,TotalCPU,UserCPU,SystemCPU")
+        rows = [line.split('|') for line in output.split('\n')]
+        return _summarize_job_steps(rows)
+
+    except Exception as e:
+        print(f"Error parsing sacct: {e}")
+        return "ERR", 0, 0, NO_CPU
+
+def get_array_job_stats(job_id: str) -> Dict[int, Tuple[str, int, int, CpuTime]]:
+    """
+    One sacct query for a whole job array. JobIDs come back as `<job>_<task>`,
+    `<job>_<task>.batch`, ... and are grouped by task index.
+    """
+    try:
+        output = _query_sacct(job_id, "JobID,State,ElapsedRaw,MaxRSS,TotalCPU,UserCPU,SystemCPU")
+    except Exception as e:
+        print(f"Error parsing sacct: {e}")
+        return {}
+
+    task_rows: Dict[int, List[List[str]]] = {}
+    for line in output.split('\n'):
+        parts = line.split('|')
+        if len(parts) < 4:
+            continue
+
+        _, task_id = _split_array_job_id(parts[0])
+        if task_id is None:
+            continue
+
+        task_rows.setdefault(task_id, []).append(parts[1:7])
+
+    return {task_id: _summarize_job_steps(rows) for task_id, rows in task_rows.items()}
+
+def _parse_sacct_time(value: str) -> Optional[datetime]:
+    # "Unknown" / "None" until the job gets that far
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+
+def poll_array_jobs(
+    job_ids: List[str]
+) -> Tuple[Dict[str, List[Optional[Tuple[str, int, int, CpuTime]]]], Set[str], Dict[str, Tuple[float, float]]]:
+    """
+    Check many job arrays with a single sacct call (no retries, meant to be
+    called every poll tick). Returns
+      - finished: job id -> per-task stats as a list indexed by array task id,
+        for every job whose tasks have all reached a terminal state;
+      - failing: ids of jobs still in flight that already have a failed task,
+        which fail-fast policies cancel early;
+      - timelines: finished job id -> (seconds queued in Slurm before the
+        first task started, seconds from the first start to the last end).
+    Jobs not yet visible to accounting appear in none of them. Tasks that
+    never started only show up inside a range row (`123_[2-5]`); a terminal
+    range row (e.g. the array was cancelled while pending) counts for every
+    task it covers.
+    """
+    finished: Dict[str, List[Optional[Tuple[str, int, int, CpuTime]]]] = {}
+    failing: Set[str] = set()
+    timelines: Dict[str, Tuple[float, float]] = {}
+    if not job_ids:
+        return finished, failing, timelines
+
+    try:
+        output = _query_sacct(
+            ",".join(job_ids),
+            "JobID,State,ElapsedRaw,MaxRSS,TotalCPU,UserCPU,SystemCPU,Submit,Start,End",
+            retries=1
+        )
+    except Exception as e:
+        print(f"Error polling sacct: {e}")
+        return finished, failing, timelines
+
+    wanted = set(job_ids)
+    job_rows: Dict[str, Dict[int, List[List[str]]]] = {}
+    # job id -> [first Submit, first Start, last End]
+    job_times: Dict[str, List[Optional[datetime]]] = {}
+    unfinished = set()
+    for line in output.split('\n'):
+        parts = line.split('|')
+        if len(parts) < 4 or not parts[1].strip():
+            continue
+
+        job_id, task_id = _split_array_job_id(parts[0])
+        if job_id not in wanted:
+            continue
+
+        state = parts[1].split()[0]
+        if state not in TERMINAL_STATES:
+            unfinished.add(job_id)
+        elif state in FAILURE_STATES:
+            failing.add(job_id)
+        if task_id is not None:
+            job_rows.setdefault(job_id, {}).setdefault(task_id, []).append(parts[1:7])
+        elif state in TERMINAL_STATES:
+            for range_task_id in _array_range_tasks(parts[0]):
+                job_rows.setdefault(job_id, {}).setdefault(range_task_id, []).append(parts[1:7])
+
+        if len(parts) >= 10:
+            times = job_times.setdefault(job_id, [None, None, None])
+            for i, pick in ((0, min), (1, min), (2, max)):
+                value = _parse_sacct_time(parts[7 + i])
+                if value is not None:
+                    times[i] = value if times[i] is None else pick(times[i], value)
+
+    for job_id, task_rows in job_rows.items():
+        if job_id in unfinished:
+            continue
+        stats: List[Optional[Tuple[str, int, int, CpuTime]]] = [None] * (max(task_rows) + 1)
+        for task_id, rows in task_rows.items():
+            stats[task_id] = _summarize_job_steps(rows)
+        finished[job_id] = stats
+
+        submitted, started, ended = job_times.get(job_id, [None, None, None])
+        if submitted and started and ended:
+            timelines[job_id] = (
+                max(0.0, (started - submitted).total_seconds()),
+                max(0.0, (ended - started).total_seconds()),
+            )
+
+    return finished, failing & unfinished, timelines
+
+
+def cancel_jobs(job_ids: List[str]) -> None:
+    if not job_ids:
+        return
+    try:
+        get_transport().run(["scancel"] + list(job_ids), timeout=30)
+    except Exception as e:
+        print(f"Error cancelling jobs {job_ids}: {e}")
+
+
+def _collect_run_result(
+    slurm_state: str,
+    time_ms: int,
+    memory_kb: int,
+    cpu: CpuTime,
+    output_file: str,
+    error_file: str,
+    time_file: str,
+    problem: Problem,
+    returncode: int = 0,
+    time_limit: Optional[int] = None
+) -> Tuple[str, str, int, int, CpuTime]:
+    """
+    Maps a finished job to (status, output, time_ms, memory_kb, cpu). For "OK"
+    the output is the path of the user's output file, which is never loaded
+    into memory here; for every other status it is the message to show.
+    time_ms is the in-job wall time from time_file, falling back to sacct's
+    whole seconds; memory_kb is the peak RSS from sacct (MaxRSS), 0 when unknown.
+    time_limit overrides the problem's (ms), e.g. for scaling runs on fewer cores.
+    """
+    time_limit = time_limit or problem.time_limit
+    wall_ms, exit_code = _read_time_file(time_file)
+    if wall_ms is not None:
+        time_ms = wall_ms
+
+    err_msg = ""
+    if os.path.exists(error_file):
+        with open(error_file, "r", errors="replace") as f:
+            raw_err = f.read(ERROR_READ_LIMIT).strip()
+            if raw_err and "slurm" not in raw_err.lower():
+                err_msg = raw_err
+
+    timed_out = exit_code == TIMEOUT_EXIT_CODE or (wall_ms is not None and wall_ms > time_limit)
+    if "TIMEOUT" in slurm_state or timed_out:
+        return "TLE", "", int(time_limit), memory_kb, cpu
+
+    # the cgroup limit is not exact, so also compare the measured peak
+    if "OUT_OF_MEMORY" in slurm_state or (
+        problem.memory_limit and memory_kb > problem.memory_limit * 1024
+    ):
+        return "MLE", "", time_ms, memory_kb, cpu
+
+    if "FAILED" in slurm_state or (returncode != 0 and returncode != 255):
+        return "RE", err_msg if err_msg else "Runtime Error", time_ms, memory_kb, cpu
+
+    if "CANCELLED" in slurm_state:
+        return "CANCELLED", "Cancelled", time_ms, memory_kb, cpu
+
+    if err_msg:
+        return "RE", err_msg, time_ms, memory_kb, cpu
+
+    if not os.path.exists(output_file):
+        open(output_file, "w").close()
+
+    return "OK", output_file, time_ms, memory_kb, cpu
+
+
+def run_with_slurm(work_dir: str, input_path: str, problem: Problem, run_cmd_template: str, nice: int = 0) -> Tuple[str, str, int, int, CpuTime]:
+    slurm_script_path = os.path.join(work_dir, "job.slurm")
+    output_file = os.path.join(work_dir, "slurm.out")
+    error_file = os.path.join(work_dir, "slurm.err")
+    time_file = os.path.join(work_dir, "slurm.time")
+    exe_file = os.path.join(work_dir, "main")
+
+    where = placement(problem)
+    try:
+        real_run_cmd = format_run_command(run_cmd_template, exe_file, input_path, where)
+    except Exception as e:
+        return "ERR", f"Run Command Format Error: {e}", 0, 0, NO_CPU
+
+    # the same work dir runs one case after another
+    if os.path.exists(time_file):
+        os.remove(time_file)
+
+    slurm_content = f"""#!/bin/bash
+#SBATCH --job-name=judge_{os.path.basename(work_dir)}
+{_resource_directives(where)}
+#SBATCH --output={output_file}
+#SBATCH --error={error_file}
+#SBATCH --time={slurm_time_limit(problem.time_limit)}
+#SBATCH --mem={problem.memory_limit}M
+#SBATCH --nice={nice}
+
+export OMP_NUM_THREADS={where.cpus_per_task}
+
+{timed_run_command(real_run_cmd, problem.time_limit, time_file)}
+"""
+    try:
+        with open(slurm_script_path, "w") as f:
+            f.write(slurm_content)
+    except Exception as e:
+        return "ERR", f"Failed to write slurm script: {e}", 0, 0, NO_CPU
+
+
+    cmd = ["sbatch", "--parsable", "--wait", slurm_script_path]
+
+    try:
+        result = get_transport().run(cmd, timeout=sbatch_wait_timeout(problem.time_limit))
+        
+        job_id = result.stdout.strip()
+        
+        slurm_state, time_ms, memory_kb, cpu = get_job_stats(job_id)
+
+        return _collect_run_result(
+            slurm_state, time_ms, memory_kb, cpu, output_file, error_file, time_file, problem, result.returncode
+        )
+
+    except subprocess.TimeoutExpired:
+        job_name = f"judge_{os.path.basename(work_dir)}"
+        get_transport().run(["scancel", "--name", job_name])
+        return "TLE", "", int(problem.time_limit), 0, NO_CPU
+        
+    except Exception as e:
+        return "ERR", str(e), 0, 0, NO_CPU
+
+
+def write_array_script(
+    work_dir: str,
+    input_paths: List[str],
+    problem: Problem,
+    run_cmd_template: str,
+    max_parallel: Optional[int] = None,
+    nice: int = 0,
+    core_number: Optional[int] = None,
+    time_limit: Optional[int] = None
+) -> Tuple[Optional[str], str]:
+    """
+    Returns (script_path, "") or (None, error message). max_parallel caps how
+    many array tasks Slurm runs at once (`--array=0-N%max_parallel`); nice is
+    the lane/fair-share adjustment from app.core.judge_queue. core_number and
+    time_limit (ms) override the problem's, for scaling runs.
+    """
+    where = placement(problem, core_number)
+    time_limit = time_limit or problem.time_limit
+    slurm_script_path = os.path.join(work_dir, "job_array.slurm")
+    output_pattern = os.path.join(work_dir, "slurm_%a.out")
+    error_pattern = os.path.join(work_dir, "slurm_%a.err")
+    # bash, unlike #SBATCH, has no %a
+    time_file = os.path.join(work_dir, "slurm_${SLURM_ARRAY_TASK_ID}.time")
+    exe_file = os.path.join(work_dir, "main")
+
+    try:
+        real_run_cmd = format_run_command(run_cmd_template, exe_file, '"$INPUT"', where)
+    except Exception as e:
+        return None, f"Run Command Format Error: {e}"
+
+    # a rejudge reuses the work dir; a task that dies early must not pick up the last run's time
+    for task_id in range(len(input_paths)):
+        stale = os.path.join(work_dir, f"slurm_{task_id}.time")
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    inputs = "\n".join(f"    {shlex.quote(path)}" for path in input_paths)
+    array_spec = f"0-{len(input_paths) - 1}"
+    if max_parallel:
+        array_spec += f"%{max_parallel}"
+
+    slurm_content = f"""#!/bin/bash
+#SBATCH --job-name=judge_{os.path.basename(work_dir)}
+#SBATCH --array={array_spec}
+{_resource_directives(where)}
+#SBATCH --output={output_pattern}
+#SBATCH --error={error_pattern}
+#SBATCH --time={slurm_time_limit(time_limit)}
+#SBATCH --mem={problem.memory_limit}M
+#SBATCH --nice={nice}
+
+INPUTS=(
+{inputs}
+)
+export INPUT="${{INPUTS[$SLURM_ARRAY_TASK_ID]}}"
+export OMP_NUM_THREADS={where.cpus_per_task}
+
+{timed_run_command(real_run_cmd, time_limit, time_file)}
+"""
+    try:
+        with open(slurm_script_path, "w") as f:
+            f.write(slurm_content)
+    except Exception as e:
+        return None, f"Failed to write slurm script: {e}"
+
+    return slurm_script_path, ""
+
+
+def submit_array_job(
+    work_dir: str,
+    input_paths: List[str],
+    problem: Problem,
+    run_cmd_template: str,
+    max_parallel: Optional[int] = None,
+    nice: int = 0,
+    core_number: Optional[int] = None,
+    time_limit: Optional[int] = None
+) -> Tuple[Optional[str], str]:
+    """Submit without waiting. Returns (job_id, "") or (None, error message)."""
+    script_path, err = write_array_script(
+        work_dir, input_paths, problem, run_cmd_template, max_parallel, nice, core_number, time_limit
+    )
+    if script_path is None:
+        return None, err
+
+    try:
+        result = get_transport().run(["sbatch", "--parsable", script_path], timeout=30)
+    except Exception as e:
+        return None, f"sbatch failed: {e}"
+
+    # --parsable prints `<job_id>` or `<job_id>;<cluster>`
+    job_id = result.stdout.strip().split(';')[0]
+    if result.returncode != 0 or not job_id:
+        return None, result.stderr.strip() or "sbatch failed"
+
+    return job_id, ""
+
+
+def collect_array_results(
+    work_dir: str,
+    n_tasks: int,
+    task_stats: Dict[int, Tuple[str, int, int, CpuTime]],
+    problem: Problem,
+    time_limit: Optional[int] = None
+) -> List[Tuple[str, str, int, int, CpuTime]]:
+    results = []
+    for task_id in range(n_tasks):
+        if task_stats.get(task_id) is None:
+            results.append(("ERR", f"No accounting record for array task {task_id}", 0, 0, NO_CPU))
+            continue
+
+        slurm_state, time_ms, memory_kb, cpu = task_stats[task_id]
+        results.append(_collect_run_result(
+            slurm_state,
+            time_ms,
+            memory_kb,
+            cpu,
+            os.path.join(work_dir, f"slurm_{task_id}.out"),
+            os.path.join(work_dir, f"slurm_{task_id}.err"),
+            os.path.join(work_dir, f"slurm_{task_id}.time"),
+            problem,
+            time_limit=time_limit
+        ))
+
+    return results
+
+
+def run_array_with_slurm(work_dir: str, input_paths: List[str], problem: Problem, run_cmd_template: str, nice: int = 0) -> List[Tuple[str, str, int, int, CpuTime]]:
+    """
+    Run every test case of a submission as one Slurm job array (task i reads input_paths[i]).
+    A single `sbatch --wait` and a single sacct query replace one round-trip per case.
+    """
+    if not input_paths:
+        return []
+
+    slurm_script_path, err = write_array_script(work_dir, input_paths, problem, run_cmd_template, nice=nice)
+    if slurm_script_path is None:
+        return [("ERR", err, 0, 0, NO_CPU)] * len(input_paths)
+
+    cmd = ["sbatch", "--parsable", "--wait", slurm_script_path]
+
+    try:
+        result = get_transport().run(cmd, timeout=sbatch_wait_timeout(problem.time_limit, len(input_paths)))
+    except subprocess.TimeoutExpired:
+        job_name = f"judge_{os.path.basename(work_dir)}"
+        get_transport().run(["scancel", "--name", job_name])
+        return [("TLE", "", int(problem.time_limit), 0, NO_CPU)] * len(input_paths)
+    except Exception as e:
+        return [("ERR", str(e), 0, 0, NO_CPU)] * len(input_paths)
+
+    job_id = result.stdout.strip().split(';')[0]
+    task_stats = get_array_job_stats(job_id)
+
+    return collect_array_results(work_dir, len(input_paths), task_stats, problem)
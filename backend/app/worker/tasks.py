@@ -2,102 +2,64 @@ import os
 import shutil
 import subprocess
 import time
+import calendar
 import shlex
 import json
+from datetime import datetime, timedelta
 from uuid import UUID
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterator, Optional
+
+from celery.signals import worker_process_shutdown
 
 from app.core.celery_app import celery_app
+from app.core.events import publish_status
+from app.core.judge_queue import LANE_NORMAL, LANE_REJUDGE, enqueue_judge, record_wait
 from app.db.session import SessionLocal
 from app.models.submission import Submission, SubmissionStatus
 from app.models.problem import Problem, TestCase
+from app.schemas.problem import ExecutionPolicy, JudgeType
+from app.services.rejudge_service import RejudgeService
+from app.services.scoreboard_service import ScoreboardService
+from app.worker import compile_cache, scaling
+from app.worker.checker import get_checker, run_checker
+from app.worker.compare import EXACT, compare_files
+from app.worker.metrics import PhaseTimer
+from app.worker.testdata import expected_output_path, matches_expected
+from app.worker.slurm import (
+    NO_CPU,
+    SLURM_ARRAY_MODE,
+    CpuTime,
+    cancel_jobs,
+    collect_array_results,
+    load_task_stat,
+    poll_array_jobs,
+    run_array_with_slurm,
+    run_with_slurm,
+    slurm_time_seconds,
+    submit_array_job,
+)
+from app.worker.transport import set_transport
 
 DATA_DIR = os.getenv("DATA_DIR", "/data")
 SUBMISSION_DIR = os.path.join(DATA_DIR, "submissions")
 
-# Slurm Settings
-SLURM_HOST = os.getenv("SLURM_HOST", "slurm")
-SLURM_USER = os.getenv("SLURM_USER", "admin")
-SLURM_PASSWORD = os.getenv("SLURM_PASSWORD", "admin")
-
-def parse_slurm_memory(mem_str: str) -> int:
-    if not mem_str:
-        return 0
-    
-    mem_str = mem_str.strip()
-    if not mem_str or mem_str == "0":
-        return 0
-
-    units = {'K': 1, 'M': 1024, 'G': 1024*1024, 'T': 1024*1024*1024}
-    suffix = mem_str[-1].upper()
-    
-    try:
-        if suffix in units:
-            value = float(mem_str[:-1])
-            return int(value * units[suffix])
-        else:
-            return int(float(mem_str))
-    except:
-        return 0
-
-def get_job_stats(job_id: str) -> Tuple[str, int, int]:
+# Two-phase judging: submit without `sbatch --wait`, then poll_slurm_jobs finishes the job
+JUDGE_ASYNC_MODE = os.getenv("JUDGE_ASYNC_MODE", "true").lower() == "true"
+SLURM_POLL_BATCH = int(os.getenv("SLURM_POLL_BATCH", "500"))
+# a submitted array may take its --time (time limit plus SLURM_TIME_GRACE) x
+# cases (one task at a time) plus this much queueing before the poller gives up on it
+SLURM_JOB_MARGIN = int(os.getenv("SLURM_JOB_MARGIN", "600"))
+JOB_META_FILE = "job_array.json"
+
+def compile_code(
+    work_dir: str,
+    code: str,
+    compile_cmd_template: str,
+    language: str,
+    timer: Optional[PhaseTimer] = None
+) -> Tuple[bool, str]:
+    timer = timer or PhaseTimer()
 
-    sacct_cmd = [
-        "sshpass", "-p", SLURM_PASSWORD,
-        "ssh", "-o", "StrictHostKeyChecking=no", f"{SLURM_USER}@{SLURM_HOST}",
-        f"sacct -j {job_id} --format=State,ElapsedRaw,MaxRSS -n -p"
-    ]
-
-    try:
-        for _ in range(3):
-            result = subprocess.run(sacct_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            if result.stdout.strip():
-                break
-            time.sleep(1)
-
-        output = result.stdout.strip()
-        
-        max_time_sec = 0
-        max_mem_kb = 0
-        final_state = "COMPLETED"
-
-        for line in output.split('\n'):
-            parts = line.split('|')
-            if len(parts) < 3:
-                continue
-            
-            state = parts[0].split()[0]
-            time_raw = parts[1]
-            mem_raw = parts[2]
-
-            if "TIMEOUT" in state:
-                final_state = "TIMEOUT"
-            elif "OUT_OF_MEMORY" in state and final_state != "TIMEOUT":
-                final_state = "OUT_OF_MEMORY"
-            elif "FAILED" in state and final_state not in ["TIMEOUT", "OUT_OF_MEMORY"]:
-                final_state = "FAILED"
-            elif "CANCELLED" in state:
-                final_state = "CANCELLED"
-
-            try:
-                t = int(float(time_raw))
-                if t > max_time_sec:
-                    max_time_sec = t
-            except:
-                pass
-
-            m = parse_slurm_memory(mem_raw)
-            if m > max_mem_kb:
-                max_mem_kb = m
-
-        return final_state, max_time_sec * 1000, max_mem_kb
-
-    except Exception as e:
-        print(f"Error parsing sacct: {e}")
-        return "ERR", 0, 0
-
-
-def compile_code(work_dir: str, code: str, compile_cmd_template: str, language: str) -> Tuple[bool, str]:
     if language == "cpp":
         source_filename = "source.cpp"
     elif language == "c":
@@ -109,7 +71,7 @@ def compile_code(work_dir: str, code: str, compile_cmd_template: str, language:
     exe_file = os.path.join(work_dir, "main")
 
     try:
-        with open(source_file, "w") as f:
+        with timer.span("source_write"), open(source_file, "w") as f:
             f.write(code)
     except Exception as e:
         return False, f"System Error: Failed to write source code. {str(e)}"
@@ -122,6 +84,15 @@ def compile_code(work_dir: str, code: str, compile_cmd_template: str, language:
         cmd_args = shlex.split(cmd_str)
     except Exception as e:
         return False, f"Command Format Error: {e}"
+
+    with timer.span("compile"):
+        return _compile(code, language, compile_cmd_template, cmd_args, exe_file)
+
+
+def _compile(code: str, language: str, compile_cmd_template: str, cmd_args: List[str], exe_file: str) -> Tuple[bool, str]:
+    key = compile_cache.cache_key(code, language, compile_cmd_template)
+    if compile_cache.fetch(key, exe_file):
+        return True, "Compilation cached"
         
     try:
         result = subprocess.run(
@@ -135,6 +106,7 @@ def compile_code(work_dir: str, code: str, compile_cmd_template: str, language:
         if result.returncode != 0:
             return False, result.stderr
         
+        compile_cache.store(key, exe_file)
         return True, "Compilation successful"
     
     except subprocess.TimeoutExpired:
@@ -144,98 +116,279 @@ def compile_code(work_dir: str, code: str, compile_cmd_template: str, language:
         return False, f"Compiler System Error: {str(e)}"
 
 
-def run_with_slurm(work_dir: str, input_path: str, problem: Problem, run_cmd_template: str) -> Tuple[str, str, int]:
-    slurm_script_path = os.path.join(work_dir, "job.slurm")
-    output_file = os.path.join(work_dir, "slurm.out")
-    error_file = os.path.join(work_dir, "slurm.err")
-    exe_file = os.path.join(work_dir, "main")
-
-    try:
-        real_run_cmd = run_cmd_template.format(
-            exe=exe_file, 
-            input=input_path, 
-            core_number=problem.core_number
-        )
-    except Exception as e:
-        return "ERR", f"Run Command Format Error: {e}", 0
-
-
-    slurm_content = f"""#!/bin/bash
-#SBATCH --job-name=judge_{os.path.basename(work_dir)}
-#SBATCH --nodes=1
-#SBATCH --ntasks={problem.core_number}
-#SBATCH --output={output_file}
-#SBATCH --error={error_file}
-#SBATCH --time=00:01:00
-#SBATCH --mem={problem.memory_limit}M
-
-{real_run_cmd}
-"""
-    try:
-        with open(slurm_script_path, "w") as f:
-            f.write(slurm_content)
-    except Exception as e:
-        return "ERR", f"Failed to write slurm script: {e}", 0
-
-
-    cmd = [
-        "sshpass", "-p", SLURM_PASSWORD,
-        "ssh", "-o", "StrictHostKeyChecking=no", f"{SLURM_USER}@{SLURM_HOST}",
-        "sbatch", "--parsable", "--wait", slurm_script_path
-    ]
-
-    try:
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=(problem.time_limit / 1000) + 15 
+@worker_process_shutdown.connect
+def close_slurm_transport(**kwargs):
+    set_transport(None)
+
+
+def _finished(sub: Submission) -> None:
+    """Runs once a submission has reached its final status."""
+    publish_status(str(sub.id), sub.status, score=sub.score, time=sub.execute_time, memory=sub.memory_usage)
+    ScoreboardService.record(sub)
+    RejudgeService.mark_done(str(sub.id))
+
+
+def _fail(db, sub: Submission, error: str) -> None:
+    """Final System Error. Whatever an earlier phase scored (e.g. before scaling) no longer counts."""
+    db.rollback()
+    sub.status = SubmissionStatus.ERR
+    sub.score = 0
+    sub.result_details = {"error": error}
+    db.commit()
+    _finished(sub)
+
+
+def _runnable_cases(problem: Problem, sample_only: bool = False) -> Tuple[List[TestCase], List[str]]:
+    """Test cases in judge order plus the input paths of the leading cases whose input exists."""
+    test_cases = problem.test_cases
+    if sample_only:
+        test_cases = [case for case in test_cases if case.is_sample]
+
+    input_paths = []
+    for case in test_cases:
+        input_full_path = os.path.join(DATA_DIR, case.input_path)
+        if not os.path.exists(input_full_path):
+            break
+        input_paths.append(input_full_path)
+
+    return test_cases, input_paths
+
+
+def _cpu_fields(cpu: CpuTime, wall_ms: int, cores: int) -> dict:
+    """CPU time and parallel efficiency (CPU time / (wall time x cores)) of one run."""
+    if not cpu.total_ms:
+        return {}
+    fields = {"cpu_time": cpu.total_ms, "user_time": cpu.user_ms, "sys_time": cpu.system_ms}
+    if wall_ms > 0:
+        fields["efficiency"] = round(cpu.total_ms / (wall_ms * max(1, cores or 1)), 3)
+    return fields
+
+
+def _grade_case(
+    problem: Problem,
+    case: TestCase,
+    run: Tuple[str, str, int, int, CpuTime],
+    checker_path: Optional[str],
+    timer: PhaseTimer
+) -> dict:
+    status, output, duration, memory_kb, cpu = run
+    case_result = {
+        "status": status,
+        "time": duration,
+        "memory": memory_kb,
+        # every rank may run cpus_per_task threads
+        **_cpu_fields(cpu, duration, (problem.core_number or 1) * (problem.cpus_per_task or 1)),
+    }
+
+    if status != "OK":
+        case_result["msg"] = output
+        return case_result
+
+    with timer.span("output_read"):
+        if not checker_path and matches_expected(output, case):
+            case_result["status"] = "AC"
+            return case_result
+
+        output_full_path = expected_output_path(case)
+        if not os.path.exists(output_full_path):
+            output_full_path = os.devnull
+
+    if checker_path:
+        input_full_path = os.path.join(DATA_DIR, case.input_path)
+        with timer.span("compare"):
+            verdict, checker_msg = run_checker(checker_path, input_full_path, output, output_full_path)
+
+        case_result["status"] = verdict
+        if checker_msg:
+            case_result["msg"] = checker_msg
+        return case_result
+
+    with timer.span("compare"):
+        verdict = compare_files(
+            output,
+            output_full_path,
+            mode=problem.compare_mode or EXACT,
+            float_tolerance=problem.float_tolerance
         )
-        
-        job_id = result.stdout.strip()
-        
-        slurm_state, time_ms, memory_kb = get_job_stats(job_id)
-
-        user_output = ""
-        if os.path.exists(output_file):
-            with open(output_file, "r") as f:
-                user_output = f.read().strip()
-        
-        err_msg = ""
-        if os.path.exists(error_file):
-            with open(error_file, "r") as f:
-                raw_err = f.read().strip()
-                if raw_err and "slurm" not in raw_err.lower():
-                    err_msg = raw_err
-
-        if "TIMEOUT" in slurm_state:
-            return "TLE", "", int(problem.time_limit)
-        
-        if "OUT_OF_MEMORY" in slurm_state:
-            return "MLE", "", time_ms
-        
-        if "FAILED" in slurm_state or (result.returncode != 0 and result.returncode != 255): 
-            return "RE", err_msg if err_msg else "Runtime Error", time_ms
-        
-        if err_msg:
-            return "RE", err_msg, time_ms
+    if verdict.ok:
+        case_result["status"] = "AC"
+    else:
+        case_result["status"] = "WA"
+        case_result["user_out"] = verdict.user
+        case_result["expected"] = verdict.expected
+        case_result["line"] = verdict.line
+        case_result["offset"] = verdict.offset
+        if verdict.msg:
+            case_result["msg"] = verdict.msg
+
+    return case_result
+
+
+def _verdict_status(case_status: str) -> SubmissionStatus:
+    if case_status == "WA":
+        return SubmissionStatus.WA
+    if case_status == "TLE":
+        return SubmissionStatus.TLE
+    if case_status == "MLE":
+        return SubmissionStatus.MLE
+    if case_status == "RE":
+        return SubmissionStatus.RE
+    return SubmissionStatus.ERR
+
+
+def _grade_cases(
+    problem: Problem,
+    test_cases: List[TestCase],
+    n_runnable: int,
+    run_results: Iterator[Tuple[str, str, int, int, CpuTime]],
+    submission_id: Optional[str] = None,
+    timer: Optional[PhaseTimer] = None
+) -> Tuple[SubmissionStatus, int, List[dict], int, int]:
+    """
+    `run_results` yields one run per case for the first `n_runnable` cases.
+    Returns (status, total time, per-case details, score, peak memory in KB
+    over all cases). The status is the
+    verdict of the first failing case; fail-fast policies stop grading there
+    and score all or nothing, parallel_all grades every case and scores each
+    accepted one.
+    Each graded case is published to `submission_id` as soon as it is known.
+    """
+    policy = problem.execution_policy or ExecutionPolicy.parallel_fail_fast
+    fail_fast = policy != ExecutionPolicy.parallel_all
+    timer = timer or PhaseTimer()
+
+    final_status = SubmissionStatus.AC
+    total_time = 0
+    max_memory = 0
+    details = []
+    score = 0
+    skipped = False
+
+    checker_path = None
+    if problem.judge_type == JudgeType.special:
+        checker_path, err = get_checker(problem.judge_script)
+        if checker_path is None:
+            return SubmissionStatus.ERR, 0, [{"status": "ERR", "msg": err}], 0, 0
+
+    for index, case in enumerate(test_cases):
+        if index >= n_runnable:
+            if final_status == SubmissionStatus.AC:
+                final_status = SubmissionStatus.ERR
+            details.append({"status": "ERR", "msg": "Input file missing"})
+            break
+
+        run = next(run_results)
+        total_time += run[2]
+        max_memory = max(max_memory, run[3])
+
+        if run[0] == "CANCELLED":
+            # cancelled by a fail-fast policy once another case had failed
+            skipped = True
+            details.append({"status": "Skipped", "time": run[2]})
+            continue
+
+        case_result = _grade_case(problem, case, run, checker_path, timer)
+        details.append(case_result)
+        if submission_id:
+            publish_status(submission_id, SubmissionStatus.CHECKING, case={"index": index, **case_result})
+
+        if case_result["status"] == "AC":
+            score += case.score or 0
+            continue
+
+        if final_status == SubmissionStatus.AC:
+            final_status = _verdict_status(case_result["status"])
+        if fail_fast:
+            break
+
+    if final_status == SubmissionStatus.AC and skipped:
+        # nothing failed, yet some cases never ran
+        final_status = SubmissionStatus.ERR
+
+    if fail_fast and final_status != SubmissionStatus.AC:
+        # which cases passed before the first failure depends on case order and,
+        # in parallel, on which result came back first: no partial score
+        score = 0
+    elif final_status == SubmissionStatus.ERR:
+        # some cases never ran, so even parallel_all's partial score is not a result
+        score = 0
+
+    return final_status, total_time, details, score, max_memory
+
+
+def _store_verdict(
+    db,
+    sub: Submission,
+    timer: PhaseTimer,
+    graded: Tuple[SubmissionStatus, int, List[dict], int, int]
+) -> None:
+    """
+    Persists the result of _grade_cases. An accepted submission of a problem
+    with scaling_cores stays Checking until collect_scaling has graded its speedup.
+    Sample runs keep their verdict but score nothing and are never scaled.
+    """
+    final_status, total_time, details, score, max_memory = graded
+    scaling_run = (
+        not sub.sample_only and final_status == SubmissionStatus.AC and bool(sub.problem.scaling_cores)
+    )
+
+    sub.status = SubmissionStatus.CHECKING if scaling_run else final_status
+    sub.score = 0 if sub.sample_only else score
+    sub.execute_time = total_time
+    sub.memory_usage = max_memory
+    sub.result_details = details
+    sub.scaling = None
+    sub.timings = timer.phases
+    with timer.span("db_commit"):
+        db.commit()
 
-        return "OK", user_output, time_ms
+    if scaling_run:
+        scale_submission.delay(str(sub.id))
+        print(f"Judge Accepted, measuring speedup: {sub.id}")
+        return
 
-    except subprocess.TimeoutExpired:
-        job_name = f"judge_{os.path.basename(work_dir)}"
-        subprocess.run(["sshpass", "-p", SLURM_PASSWORD, "ssh", f"{SLURM_USER}@{SLURM_HOST}", "scancel", "--name", job_name])
-        return "TLE", "", int(problem.time_limit)
-        
-    except Exception as e:
-        return "ERR", str(e), 0
+    _finished(sub)
+    print(f"Judge Finished: {final_status}")
 
 
 @celery_app.task(name="judge_submission")
-def judge_submission(submission_id: str):
-    print(f"[Worker] Processing Submission: {submission_id}")
+def judge_submission(
+    submission_id: str,
+    lane: str = LANE_NORMAL,
+    nice: int = 0,
+    priority: Optional[int] = None,
+    enqueued_at: Optional[float] = None
+):
+    """
+    Entry point for judging (see app.core.judge_queue.enqueue_judge); runs the
+    compile phase on the compile queue.
+    """
+    record_wait(lane, enqueued_at)
+    return compile_submission(submission_id, lane=lane, nice=nice, priority=priority, enqueued_at=enqueued_at)
+
+
+def _timed(runs: Iterator, timer: PhaseTimer, phase: str) -> Iterator:
+    """Times each step of a lazy iterator of runs (sync mode runs a case per step)."""
+    runs = iter(runs)
+    while True:
+        with timer.span(phase):
+            run = next(runs, None)
+        if run is None:
+            return
+        yield run
+
+
+@celery_app.task(name="compile_submission")
+def compile_submission(
+    submission_id: str,
+    lane: str = LANE_NORMAL,
+    nice: int = 0,
+    priority: Optional[int] = None,
+    enqueued_at: Optional[float] = None
+):
+    print(f"[Worker] Compiling Submission: {submission_id} ({lane})")
     db = SessionLocal()
+    timer = PhaseTimer()
     
     work_dir = os.path.join(SUBMISSION_DIR, submission_id)
     if not os.path.exists(work_dir):
@@ -251,96 +404,358 @@ def judge_submission(submission_id: str):
         problem = sub.problem
         if not problem:
             print("Problem not found")
-            sub.status = SubmissionStatus.ERR
-            db.commit()
+            _fail(db, sub, "Problem not found")
             return
 
+        if enqueued_at is None and sub.submit_time:
+            enqueued_at = calendar.timegm(sub.submit_time.utctimetuple())
+        timer.since("queue_wait", enqueued_at)
+
         sub.status = SubmissionStatus.JUDGING
+        sub.slurm_job_id = None
+        sub.slurm_deadline = None
         db.commit()
+        publish_status(submission_id, SubmissionStatus.JUDGING)
 
-        compile_cmd_template = problem.compile_command 
-        run_cmd_template = problem.run_command
-
-        is_compiled, msg = compile_code(work_dir, sub.code, compile_cmd_template, sub.language)
+        is_compiled, msg = compile_code(work_dir, sub.code, problem.compile_command, sub.language, timer=timer)
         if not is_compiled:
             sub.status = SubmissionStatus.CE
-            sub.result_details = json.dumps({"msg": msg})
-            db.commit()
+            sub.result_details = {"msg": msg}
+            sub.timings = timer.phases
+            with timer.span("db_commit"):
+                db.commit()
+            _finished(sub)
             return
 
         exe_path = os.path.join(work_dir, "main")
         if os.path.exists(exe_path):
             os.chmod(exe_path, 0o777)
 
-        test_cases = problem.test_cases
-        
-        final_status = SubmissionStatus.AC
-        total_time = 0
-        details = []
-
-        for case in test_cases:
-            input_full_path = os.path.join(DATA_DIR, case.input_path)
-            output_full_path = os.path.join(DATA_DIR, case.output_path)
-            
-            if not os.path.exists(input_full_path):
-                final_status = SubmissionStatus.ERR
-                details.append({"status": "ERR", "msg": "Input file missing"})
-                break
-
-            status, output, duration = run_with_slurm(
-                work_dir, 
-                input_full_path, 
-                problem, 
-                run_cmd_template
+        # keep the lane's priority on the run queue as well; timings travel
+        # with the task and are stored with the next commit
+        run_submission.apply_async(
+            args=[submission_id],
+            kwargs={"lane": lane, "nice": nice, "timings": timer.phases, "queued_at": time.time()},
+            priority=priority
+        )
+
+    except Exception as e:
+        print(f"Worker Exception: {e}")
+        _fail(db, sub, str(e))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="run_submission")
+def run_submission(
+    submission_id: str,
+    lane: str = LANE_NORMAL,
+    nice: int = 0,
+    timings: Optional[Dict[str, float]] = None,
+    queued_at: Optional[float] = None
+):
+    print(f"[Worker] Running Submission: {submission_id} ({lane})")
+    db = SessionLocal()
+    work_dir = os.path.join(SUBMISSION_DIR, submission_id)
+    timer = PhaseTimer(timings)
+    timer.since("run_queue_wait", queued_at)
+
+    try:
+        sub = db.query(Submission).filter(Submission.id == UUID(submission_id)).first()
+        if not sub:
+            print("Submission not found")
+            return
+
+        problem = sub.problem
+        run_cmd_template = problem.run_command
+
+        # the lane only decides priority; what runs follows the stored flag
+        test_cases, input_paths = _runnable_cases(problem, sample_only=sub.sample_only)
+        if sub.sample_only and not test_cases:
+            # nothing to run must not come out Accepted
+            raise RuntimeError("Problem has no sample test cases")
+        sequential = problem.execution_policy == ExecutionPolicy.sequential
+
+        if JUDGE_ASYNC_MODE and input_paths:
+            # sequential: one array task at a time, the poller cancels the rest on failure
+            with timer.span("slurm_submit"):
+                job_id, err = submit_array_job(
+                    work_dir, input_paths, problem, run_cmd_template,
+                    max_parallel=1 if sequential else None,
+                    nice=nice
+                )
+            if job_id:
+                with open(os.path.join(work_dir, JOB_META_FILE), "w") as f:
+                    json.dump({
+                        "job_id": job_id,
+                        "case_ids": [str(case.id) for case in test_cases],
+                        "n_tasks": len(input_paths),
+                    }, f)
+
+                # check_submission takes over once poll_slurm_jobs sees the array finish
+                sub.slurm_job_id = job_id
+                sub.slurm_deadline = datetime.utcnow() + timedelta(
+                    seconds=slurm_time_seconds(problem.time_limit) * len(input_paths) + SLURM_JOB_MARGIN
+                )
+                sub.timings = timer.phases
+                db.commit()
+                print(f"Submitted Slurm job {job_id}")
+                return
+
+            run_results = iter([("ERR", err, 0, 0, NO_CPU)] * len(input_paths))
+        elif SLURM_ARRAY_MODE and not sequential:
+            with timer.span("slurm_wait"):
+                run_results = iter(run_array_with_slurm(work_dir, input_paths, problem, run_cmd_template, nice=nice))
+        else:
+            run_results = _timed((
+                run_with_slurm(work_dir, path, problem, run_cmd_template, nice=nice)
+                for path in input_paths
+            ), timer, "slurm_wait")
+
+        graded = _grade_cases(problem, test_cases, len(input_paths), run_results, submission_id, timer)
+        _store_verdict(db, sub, timer, graded)
+
+    except Exception as e:
+        print(f"Worker Exception: {e}")
+        _fail(db, sub, str(e))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="poll_slurm_jobs")
+def poll_slurm_jobs():
+    """
+    Periodic (celery beat). One sacct call covers every submission that is
+    waiting on the cluster; finished ones are claimed (JUDGING -> CHECKING)
+    and handed to check_submission. Jobs still unfinished past their
+    slurm_deadline (never scheduled, lost by accounting, ...) are cancelled
+    and the submission fails with a System Error.
+    """
+    db = SessionLocal()
+    try:
+        in_flight = (
+            db.query(Submission.id, Submission.slurm_job_id, Problem.execution_policy, Submission.slurm_deadline)
+            .join(Problem, Submission.problem_id == Problem.id)
+            .filter(
+                Submission.status == SubmissionStatus.JUDGING,
+                Submission.slurm_job_id.isnot(None)
+            )
+            # oldest deadlines first, so a backlog larger than one batch still
+            # reaches every job instead of polling an arbitrary subset
+            .order_by(Submission.slurm_deadline, Submission.id)
+            .limit(SLURM_POLL_BATCH)
+            .all()
+        )
+        if not in_flight:
+            return
+
+        finished, failing, timelines = poll_array_jobs([job_id for _, job_id, _, _ in in_flight])
+
+        # fail-fast: stop the remaining array tasks as soon as one has failed
+        cancel_jobs([
+            job_id for _, job_id, policy, _ in in_flight
+            if job_id in failing and policy != ExecutionPolicy.parallel_all
+        ])
+
+        now = datetime.utcnow()
+        for sub_id, job_id, _, deadline in in_flight:
+            task_stats = finished.get(job_id)
+            if task_stats is None:
+                if deadline is not None and deadline < now:
+                    _expire_slurm_job(db, sub_id, job_id)
+                continue
+
+            claimed = (
+                db.query(Submission)
+                .filter(
+                    Submission.id == sub_id,
+                    Submission.status == SubmissionStatus.JUDGING,
+                    Submission.slurm_job_id == job_id
+                )
+                .update({Submission.status: SubmissionStatus.CHECKING}, synchronize_session=False)
+            )
+            db.commit()
+
+            if claimed:
+                publish_status(str(sub_id), SubmissionStatus.CHECKING)
+                check_submission.delay(str(sub_id), task_stats, timelines.get(job_id), time.time())
+
+    finally:
+        db.close()
+
+
+def _expire_slurm_job(db, sub_id: UUID, job_id: str) -> None:
+    cancel_jobs([job_id])
+    sub = (
+        db.query(Submission)
+        .filter(
+            Submission.id == sub_id,
+            Submission.status == SubmissionStatus.JUDGING,
+            Submission.slurm_job_id == job_id
+        )
+        .first()
+    )
+    if not sub:
+        return
+
+    _fail(db, sub, f"Slurm job {job_id} did not finish before its deadline")
+    print(f"Expired Slurm job {job_id}")
+
+
+@celery_app.task(name="check_submission")
+def check_submission(
+    submission_id: str,
+    task_stats: List[Optional[List]],
+    timeline: Optional[List[float]] = None,
+    claimed_at: Optional[float] = None
+):
+    """timeline: (Slurm queue wait, Slurm run) seconds from poll_array_jobs."""
+    print(f"[Worker] Checking Submission: {submission_id}")
+    db = SessionLocal()
+    work_dir = os.path.join(SUBMISSION_DIR, submission_id)
+
+    try:
+        sub = db.query(Submission).filter(Submission.id == UUID(submission_id)).first()
+        if not sub:
+            print("Submission not found")
+            return
+
+        problem = sub.problem
+
+        with open(os.path.join(work_dir, JOB_META_FILE), "r") as f:
+            meta = json.load(f)
+
+        cases_by_id = {str(case.id): case for case in problem.test_cases}
+        test_cases = [cases_by_id[case_id] for case_id in meta["case_ids"] if case_id in cases_by_id]
+        if len(test_cases) != len(meta["case_ids"]):
+            raise RuntimeError("Test cases changed while the submission was running")
+
+        n_tasks = meta["n_tasks"]
+        stats = {
+            task_id: load_task_stat(stat)
+            for task_id, stat in enumerate(task_stats)
+            if stat is not None
+        }
+        run_results = iter(collect_array_results(work_dir, n_tasks, stats, problem))
+
+        timer = PhaseTimer(sub.timings)
+        timer.since("check_queue_wait", claimed_at)
+        if timeline:
+            timer.add("slurm_queue_wait", timeline[0])
+            timer.add("slurm_run", timeline[1])
+
+        graded = _grade_cases(problem, test_cases, n_tasks, run_results, submission_id, timer)
+        _store_verdict(db, sub, timer, graded)
+
+    except Exception as e:
+        print(f"Worker Exception: {e}")
+        _fail(db, sub, str(e))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="scale_submission")
+def scale_submission(submission_id: str):
+    """Reruns an accepted submission on every core count of scaling_cores, as concurrent array jobs."""
+    print(f"[Worker] Scaling Submission: {submission_id}")
+    db = SessionLocal()
+    work_dir = os.path.join(SUBMISSION_DIR, submission_id)
+
+    try:
+        sub = db.query(Submission).filter(Submission.id == UUID(submission_id)).first()
+        if not sub or sub.status != SubmissionStatus.CHECKING:
+            return
+
+        problem = sub.problem
+        _, input_paths = _runnable_cases(problem)
+
+        jobs = {}
+        for cores in problem.scaling_cores:
+            # one directory per core count, so outputs and timings do not collide
+            cores_dir = scaling.run_dir(work_dir, cores)
+            os.makedirs(cores_dir, exist_ok=True)
+            exe_link = os.path.join(cores_dir, "main")
+            if not os.path.lexists(exe_link):
+                os.symlink(os.path.join("..", "main"), exe_link)
+
+            job_id, err = submit_array_job(
+                cores_dir, input_paths, problem, problem.run_command,
+                core_number=cores,
+                time_limit=scaling.time_limit(problem, cores)
             )
-            
-            total_time += duration
-            case_result = {"status": status, "time": duration}
-
-            if status == "OK":
-                expected_output = ""
-                if os.path.exists(output_full_path):
-                    with open(output_full_path, "r") as f:
-                        expected_output = f.read().strip()
-                
-                if output == expected_output:
-                    case_result["status"] = "AC"
-                else:
-                    case_result["status"] = "WA"
-                    case_result["user_out"] = output[:100] + "..." if len(output) > 100 else output
-                    case_result["expected"] = expected_output[:100] + "..." if len(expected_output) > 100 else expected_output
-                    final_status = SubmissionStatus.WA
-            else:
-                case_result["status"] = status
-                case_result["msg"] = output
-                if status == "TLE":
-                    final_status = SubmissionStatus.TLE
-                elif status == "MLE":
-                    try:
-                        final_status = SubmissionStatus(status)
-                    except:
-                        final_status = SubmissionStatus.RE
-                elif status == "RE":
-                    final_status = SubmissionStatus.RE
-                else:
-                    final_status = SubmissionStatus.ERR
-
-            details.append(case_result)
-
-            if case_result["status"] != "AC":
-                break
-
-        sub.status = final_status
-        sub.execute_time = total_time
-        sub.result_details = json.dumps(details)
+            if not job_id:
+                cancel_jobs(list(jobs.values()))
+                raise RuntimeError(f"Scaling run on {cores} cores: {err}")
+            jobs[str(cores)] = job_id
+
+        sub.scaling = {"jobs": jobs, "n_tasks": len(input_paths), "submitted_at": time.time()}
         db.commit()
-        print(f"Judge Finished: {final_status}")
+        collect_scaling.apply_async(args=[submission_id], countdown=scaling.SCALING_POLL_INTERVAL)
+        print(f"Submitted scaling jobs {jobs}")
 
     except Exception as e:
         print(f"Worker Exception: {e}")
-        db.rollback()
-        sub.status = SubmissionStatus.ERR
-        sub.result_details = json.dumps({"error": str(e)})
+        _fail(db, sub, str(e))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="collect_scaling")
+def collect_scaling(submission_id: str):
+    """Polls the scaling jobs of a submission until all have finished, then grades the speedup."""
+    db = SessionLocal()
+    work_dir = os.path.join(SUBMISSION_DIR, submission_id)
+
+    try:
+        sub = db.query(Submission).filter(Submission.id == UUID(submission_id)).first()
+        # a rejudge (or a timeout) may have taken the submission over meanwhile
+        if not sub or sub.status != SubmissionStatus.CHECKING or not (sub.scaling or {}).get("jobs"):
+            return
+
+        problem = sub.problem
+        jobs = {int(cores): job_id for cores, job_id in sub.scaling["jobs"].items()}
+        finished, _, _ = poll_array_jobs(list(jobs.values()))
+
+        if any(job_id not in finished for job_id in jobs.values()):
+            if time.time() - sub.scaling["submitted_at"] > scaling.SCALING_TIMEOUT:
+                cancel_jobs(list(jobs.values()))
+                raise RuntimeError("Scaling runs did not finish in time")
+            collect_scaling.apply_async(args=[submission_id], countdown=scaling.SCALING_POLL_INTERVAL)
+            return
+
+        points = []
+        for cores, job_id in jobs.items():
+            stats = {task_id: stat for task_id, stat in enumerate(finished[job_id]) if stat is not None}
+            runs = collect_array_results(
+                scaling.run_dir(work_dir, cores),
+                sub.scaling["n_tasks"],
+                stats,
+                problem,
+                time_limit=scaling.time_limit(problem, cores)
+            )
+            points.append(scaling.measure(cores, runs))
+
+        result = scaling.summarize(problem, points)
+        sub.scaling = result
+        if result["passed"]:
+            sub.status = SubmissionStatus.AC
+        else:
+            sub.status = SubmissionStatus.SLOW
+            sub.score = 0
         db.commit()
+        _finished(sub)
+        print(f"Judge Finished: {sub.status}")
+
+    except Exception as e:
+        print(f"Worker Exception: {e}")
+        _fail(db, sub, str(e))
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+@celery_app.task(name="enqueue_rejudge_chunk")
+def enqueue_rejudge_chunk(submissions: List[List[str]]):
+    """Fan one chunk of a bulk rejudge out onto the rejudge lane: [[submission_id, user_id], ...]."""
+    for submission_id, user_id in submissions:
+        publish_status(submission_id, SubmissionStatus.PENDING, user_id=user_id)
+        enqueue_judge(submission_id, user_id, lane=LANE_REJUDGE)
@@ -0,0 +1,169 @@
+import os
+import shlex
+import subprocess
+import threading
+from typing import Callable, Dict, List, Optional, Union
+
+# Slurm Settings
+SLURM_HOST = os.getenv("SLURM_HOST", "slurm")
+SLURM_USER = os.getenv("SLURM_USER", "admin")
+SLURM_PASSWORD = os.getenv("SLURM_PASSWORD", "admin")
+
+# ssh | local | stub
+SLURM_TRANSPORT = os.getenv("SLURM_TRANSPORT", "ssh")
+SSH_CONTROL_DIR = os.getenv("SSH_CONTROL_DIR", "/tmp/poj-ssh")
+SSH_CONTROL_PERSIST = os.getenv("SSH_CONTROL_PERSIST", "600")
+
+
+class SlurmTransport:
+    """
+    How the worker reaches the Slurm controller. `run` takes the argv of a
+    Slurm command (sbatch, sacct, squeue, scancel, ...) and behaves like
+    `subprocess.run(..., text=True)`, including raising TimeoutExpired.
+    """
+
+    name = "base"
+
+    def run(self, args: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class LocalTransport(SlurmTransport):
+    """Worker runs on a login node: call the Slurm binaries directly."""
+
+    name = "local"
+
+    def run(self, args: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=timeout
+        )
+
+
+class SSHTransport(SlurmTransport):
+    """
+    One multiplexed SSH master connection per worker process (OpenSSH
+    ControlMaster). Only the first command pays for the key exchange and the
+    password login; later commands open a new channel on the existing socket.
+    """
+
+    name = "ssh"
+
+    def __init__(
+        self,
+        host: str = SLURM_HOST,
+        user: str = SLURM_USER,
+        password: str = SLURM_PASSWORD,
+        control_dir: str = SSH_CONTROL_DIR,
+        control_persist: str = SSH_CONTROL_PERSIST
+    ):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.control_dir = control_dir
+        self.control_persist = control_persist
+
+        os.makedirs(self.control_dir, mode=0o700, exist_ok=True)
+        self.control_path = os.path.join(self.control_dir, f"{user}@{host}-{os.getpid()}")
+
+    @property
+    def target(self) -> str:
+        return f"{self.user}@{self.host}"
+
+    def _ssh_args(self) -> List[str]:
+        return [
+            "ssh",
+            "-o", "StrictHostKeyChecking=no",
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self.control_path}",
+            "-o", f"ControlPersist={self.control_persist}",
+        ]
+
+    def run(self, args: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        cmd = self._ssh_args() + [self.target, shlex.join(args)]
+        if self.password:
+            cmd = ["sshpass", "-p", self.password] + cmd
+
+        return subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=timeout
+        )
+
+    def close(self) -> None:
+        subprocess.run(
+            self._ssh_args() + ["-O", "exit", self.target],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+
+StubResponse = Union[subprocess.CompletedProcess, Callable[[List[str]], subprocess.CompletedProcess]]
+
+class StubTransport(SlurmTransport):
+    """
+    No cluster at all. Responses are looked up by command name (`sbatch`,
+    `sacct`, ...); every call is recorded in `calls` for inspection.
+    """
+
+    name = "stub"
+
+    def __init__(self, responses: Optional[Dict[str, StubResponse]] = None):
+        self.responses = responses or {}
+        self.calls: List[List[str]] = []
+
+    def run(self, args: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        self.calls.append(list(args))
+
+        response = self.responses.get(args[0])
+        if response is None:
+            return subprocess.CompletedProcess(args, 0, stdout="", stderr="")
+        if callable(response):
+            return response(args)
+        return response
+
+
+TRANSPORTS = {
+    "ssh": SSHTransport,
+    "local": LocalTransport,
+    "stub": StubTransport,
+}
+
+_transport: Optional[SlurmTransport] = None
+_transport_pid: Optional[int] = None
+_transport_lock = threading.Lock()
+
+def get_transport() -> SlurmTransport:
+    """
+    Lazily build the transport for this process. Celery prefork children get
+    their own instance (and their own SSH master) instead of the parent's.
+    """
+    global _transport, _transport_pid
+
+    with _transport_lock:
+        if _transport is None or _transport_pid != os.getpid():
+            try:
+                transport_cls = TRANSPORTS[SLURM_TRANSPORT]
+            except KeyError:
+                raise ValueError(f"Unknown SLURM_TRANSPORT: {SLURM_TRANSPORT}")
+            _transport = transport_cls()
+            _transport_pid = os.getpid()
+
+        return _transport
+
+def set_transport(transport: Optional[SlurmTransport]) -> None:
+    global _transport, _transport_pid
+
+    with _transport_lock:
+        if _transport is not None and _transport_pid == os.getpid():
+            _transport.close()
+        _transport = transport
+        _transport_pid = os.getpid() if transport is not None else None
@@ -0,0 +1,186 @@
+"""
+Login latency under a burst of concurrent logins.
+
+    python scripts/bench_login.py --url http://localhost:8000 --concurrency 200 --register
+
+Each of the N workers logs in as its own account (bench<i>@example.com) so the
+per-account throttle is not what is being measured; the per-IP limit
+(LOGIN_RATE_LIMIT_IP) has to be raised above N for the run. Prints latency
+percentiles for accepted logins and the count of every status code; 429s
+show admission control kicking in.
+
+--local times only the password check, in-process, before (`threads`:
+asyncio.to_thread) and after (`pool`: app.core.password_pool) the process
+pool; run it from backend/ with the app's settings in the environment:
+
+    PYTHONPATH=. python scripts/bench_login.py --local threads -n 200
+    PYTHONPATH=. python scripts/bench_login.py --local pool -n 200
+
+On a 1-CPU container (one bcrypt check ~330 ms, default settings):
+
+    mode     n    200   429   p50 ms   p99 ms   wall s   worst loop stall
+    threads  50   50    0      8122    16398    16.4     20 ms
+    pool     50   50    0      7948    15875    15.9      5 ms
+    threads  200  200   0     35237    67925    68.0     40 ms
+    pool     200  65    135   11723    21644    22.0     20 ms
+
+One core bounds throughput either way; what the pool changes is that past
+workers + PASSWORD_HASH_QUEUE_LIMIT the rest are refused at once instead of
+queueing for over a minute. More cores add pool workers; the HTTP numbers
+depend on the deployment and were not taken here.
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _post(url: str, data: bytes, content_type: str):
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": content_type})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as resp:
+            resp.read()
+            code = resp.status
+    except urllib.error.HTTPError as e:
+        code = e.code
+    except urllib.error.URLError:
+        code = 0
+    return code, time.perf_counter() - start
+
+
+def register(base: str, i: int, password: str):
+    body = json.dumps({
+        "email": f"bench{i}@example.com",
+        "student_id": f"bench{i}",
+        "password": password,
+    }).encode()
+    return _post(f"{base}/api/v1/users/", body, "application/json")
+
+
+def login(base: str, i: int, password: str):
+    body = urllib.parse.urlencode({
+        "username": f"bench{i}@example.com",
+        "password": password,
+    }).encode()
+    return _post(f"{base}/api/v1/login/access-token", body, "application/x-www-form-urlencoded")
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def report(results, concurrency: int, wall: float, what: str = "logins") -> None:
+    codes = Counter(code for code, _ in results)
+    ok = [latency * 1000 for code, latency in results if code == 200]
+    print(f"{len(results)} {what}, {concurrency} concurrent, {wall:.2f}s wall")
+    print(f"status: {dict(sorted(codes.items()))}")
+    print(
+        f"latency ms (200 only): p50={percentile(ok, 50):.0f} "
+        f"p95={percentile(ok, 95):.0f} p99={percentile(ok, 99):.0f} max={max(ok, default=0):.0f}"
+    )
+
+
+async def local_burst(mode: str, concurrency: int, password: str):
+    """
+    Just the bcrypt step of `concurrency` simultaneous logins inside one API
+    process, without HTTP, Postgres or Redis. `threads` is how login hashed
+    before (asyncio.to_thread), `pool` is app.core.password_pool; a refused
+    hash counts as a 429. Returns (results, wall seconds, worst event loop stall).
+    """
+    from app.core import password_pool
+    from app.core.security import get_password_hash, verify_password
+
+    hashed = get_password_hash(password)
+    if mode == "pool":
+        verify = lambda: password_pool.verify(password, hashed)
+        # start the worker processes outside the measurement
+        await asyncio.gather(*(verify() for _ in range(password_pool._workers())))
+    else:
+        verify = lambda: asyncio.to_thread(verify_password, password, hashed)
+
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal stall
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stall = max(stall, time.perf_counter() - start - 0.01)
+
+    async def one():
+        start = time.perf_counter()
+        try:
+            await verify()
+            code = 200
+        except password_pool.PasswordPoolBusy:
+            code = 429
+        return code, time.perf_counter() - start
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    done.set()
+    await tick
+    password_pool.shutdown()
+    return results, wall, stall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", "-n", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=1, help="logins per account")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--register", action="store_true", help="create the bench accounts first")
+    parser.add_argument(
+        "--local", choices=["threads", "pool"],
+        help="time only the password check in-process instead of logging in over HTTP"
+    )
+    args = parser.parse_args()
+
+    if args.local:
+        results, wall, stall = asyncio.run(local_burst(args.local, args.concurrency, args.password))
+        report(results, args.concurrency, wall, what=f"password checks ({args.local})")
+        print(f"worst event loop stall: {stall * 1000:.0f} ms")
+        return
+
+    if args.register:
+        with ThreadPoolExecutor(max_workers=min(args.concurrency, 32)) as pool:
+            codes = Counter(code for code, _ in pool.map(
+                lambda i: register(args.url, i, args.password), range(args.concurrency)
+            ))
+        print(f"register: {dict(codes)}")
+
+    # release every worker at once, the way a contest start does
+    barrier = threading.Barrier(args.concurrency)
+
+    def run(i):
+        results = []
+        barrier.wait()
+        for _ in range(args.rounds):
+            results.append(login(args.url, i, args.password))
+        return results
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = [r for batch in pool.map(run, range(args.concurrency)) for r in batch]
+    wall = time.perf_counter() - start
+
+    report(results, args.concurrency, wall)
+
+
+if __name__ == "__main__":
+    main()
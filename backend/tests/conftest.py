@@ -0,0 +1,12 @@
+import os
+
+# app.core.config requires these; nothing in the unit tests connects anywhere
+for name, value in {
+    "POSTGRES_USER": "poj",
+    "POSTGRES_PASSWORD": "poj",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_DB": "poj",
+    "SECRET_KEY": "test",
+    "ALGORITHM": "HS256",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,40 @@
+from uuid import uuid4
+
+import pytest
+
+from app.core import user_cache
+from app.core.config import settings
+from app.core.user_cache import CachedUser
+
+
+def _user() -> CachedUser:
+    return CachedUser(id=uuid4(), email="a@b.c", student_id="1", is_active=True, is_superuser=False)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(settings, "USER_CACHE_LOCAL_MAX", 2)
+    user_cache._local.clear()
+    yield
+    user_cache._local.clear()
+
+
+def test_local_cache_evicts_least_recently_used():
+    a, b, c = _user(), _user(), _user()
+    user_cache._local_put("a", a)
+    user_cache._local_put("b", b)
+    # touching a makes b the oldest
+    assert user_cache._local_get("a") == a
+
+    user_cache._local_put("c", c)
+
+    assert list(user_cache._local) == ["a", "c"]
+    assert user_cache._local_get("b") is None
+
+
+def test_local_cache_drops_expired_entries(monkeypatch):
+    monkeypatch.setattr(settings, "USER_CACHE_LOCAL_TTL", -1)
+    user_cache._local_put("a", _user())
+
+    assert user_cache._local_get("a") is None
+    assert "a" not in user_cache._local
@@ -0,0 +1,43 @@
+from uuid import uuid4
+
+import fakeredis
+import pytest
+
+from app.services import rejudge_service
+from app.services.rejudge_service import RejudgeService
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    r = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(rejudge_service, "get_redis", lambda: r)
+    monkeypatch.setattr(rejudge_service.celery_app, "send_task", lambda *args, **kwargs: None)
+    monkeypatch.setattr(rejudge_service.crud_testcase, "refresh_manifests", lambda db, problem_id: 0)
+    return r
+
+
+def _start(monkeypatch, rows) -> str:
+    monkeypatch.setattr(
+        rejudge_service.crud_submission, "reset_for_rejudge", lambda db, problem_id, statuses: rows
+    )
+    return RejudgeService.start(None, uuid4())["batch_id"]
+
+
+def test_submission_in_two_batches_counts_for_both(redis, monkeypatch):
+    shared, other = (uuid4(), uuid4()), (uuid4(), uuid4())
+    first = _start(monkeypatch, [shared, other])
+    second = _start(monkeypatch, [shared])
+
+    RejudgeService.mark_done(str(shared[0]))
+
+    assert RejudgeService.progress(first)["done"] == 1
+    assert RejudgeService.progress(second)["done"] == 1
+    # finishing again (e.g. a late duplicate task) does not count twice
+    RejudgeService.mark_done(str(shared[0]))
+    assert RejudgeService.progress(second)["done"] == 1
+
+
+def test_mark_done_ignores_submissions_outside_a_rejudge(redis):
+    RejudgeService.mark_done(str(uuid4()))
+
+    assert redis.keys() == []
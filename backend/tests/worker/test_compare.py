@@ -0,0 +1,106 @@
+import pytest
+
+from app.worker import compare
+from app.worker.compare import EXACT, FLOAT, WHITESPACE_MODE, compare_files
+
+
+@pytest.fixture
+def write(tmp_path):
+    def write(user: bytes, expected: bytes):
+        user_path = tmp_path / "user.out"
+        expected_path = tmp_path / "expected.out"
+        user_path.write_bytes(user)
+        expected_path.write_bytes(expected)
+        return str(user_path), str(expected_path)
+
+    return write
+
+
+@pytest.mark.parametrize("user, expected", [
+    (b"1 2\n3\n", b"1 2\n3\n"),
+    (b"\n  1 2\n3", b"1 2\n3\n\n"),
+    (b"", b"\n \n"),
+])
+def test_exact_ignores_surrounding_whitespace(write, user, expected):
+    assert compare_files(*write(user, expected), EXACT).ok
+
+
+@pytest.mark.parametrize("user, expected", [
+    (b"1 2\n3\n", b"1 2\r\n3\r\n"),
+    (b"1 2\r\n3", b"1 2\n3\n"),
+    (b"1 2\r3\r", b"1 2\r\n3\r\n\r\n"),
+])
+def test_exact_normalizes_newlines(write, user, expected):
+    # the same as reading both files in text mode
+    assert compare_files(*write(user, expected), EXACT).ok
+
+
+def test_exact_crlf_split_across_chunks(write, monkeypatch):
+    monkeypatch.setattr(compare, "CHUNK_SIZE", 4)
+
+    assert compare_files(*write(b"abc\nde\nf\n", b"abc\r\nde\r\nf\r\n"), EXACT).ok
+    # \r\n is one line break, not two
+    assert not compare_files(*write(b"abc\n\nde", b"abc\r\nde"), EXACT).ok
+
+
+def test_exact_reports_first_difference(write):
+    result = compare_files(*write(b"1 2\n3 4\n", b"1 2\n3 5\n"), EXACT)
+
+    assert not result.ok
+    assert (result.line, result.offset) == (2, 6)
+    assert (result.user, result.expected) == ("4\n", "5\n")
+
+
+def test_exact_is_strict_inside(write):
+    assert not compare_files(*write(b"1  2\n", b"1 2\n"), EXACT).ok
+
+
+def test_exact_across_chunks(write, monkeypatch):
+    monkeypatch.setattr(compare, "CHUNK_SIZE", 4)
+    data = b"abcdefghij\nklmnop\n"
+
+    assert compare_files(*write(data, data), EXACT).ok
+    result = compare_files(*write(data.replace(b"m", b"M"), data), EXACT)
+    assert (result.ok, result.line, result.offset) == (False, 2, 13)
+
+
+def test_whitespace_mode_compares_tokens(write):
+    assert compare_files(*write(b"1   2\n\n3", b"1 2 3\n"), WHITESPACE_MODE).ok
+
+    result = compare_files(*write(b"1 2\n4\n", b"1 2\n3\n"), WHITESPACE_MODE)
+    assert not result.ok
+    assert result.msg == "Token 3 differs"
+    assert (result.line, result.offset) == (2, 4)
+
+
+@pytest.mark.parametrize("user, expected, msg", [
+    (b"1 2", b"1 2 3", "Output ended early, expected more at token 3"),
+    (b"1 2 3", b"1 2", "Extra output at token 3"),
+])
+def test_whitespace_mode_length_mismatch(write, user, expected, msg):
+    result = compare_files(*write(user, expected), WHITESPACE_MODE)
+
+    assert not result.ok
+    assert result.msg == msg
+
+
+def test_whitespace_mode_across_chunks(write, monkeypatch):
+    monkeypatch.setattr(compare, "CHUNK_SIZE", 3)
+
+    assert compare_files(*write(b"12345 678\n9", b"12345\n678 9"), WHITESPACE_MODE).ok
+    assert not compare_files(*write(b"12345 678\n9", b"1234 5678 9"), WHITESPACE_MODE).ok
+
+
+@pytest.mark.parametrize("user, expected, tolerance, ok", [
+    (b"1.0000001", b"1.0", None, True),
+    (b"1.001", b"1.0", None, False),
+    (b"1.001", b"1.0", 1e-2, True),
+    # relative error for large values
+    (b"1000001", b"1000000", 1e-6, True),
+    (b"nan", b"nan", None, True),
+    (b"nan", b"1.0", None, False),
+    (b"abc", b"abc", None, True),
+    (b"abc", b"abd", 1.0, False),
+])
+def test_float_mode(write, user, expected, tolerance, ok):
+    assert compare_files(*write(user, expected), FLOAT, tolerance).ok is ok
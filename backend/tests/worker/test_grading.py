@@ -0,0 +1,162 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.submission import SubmissionStatus
+from app.schemas.problem import ExecutionPolicy, JudgeType
+from app.worker.slurm import NO_CPU
+from app.services.scoreboard_service import ScoreboardService
+from app.worker import tasks
+from app.worker.tasks import _grade_cases, _store_verdict
+
+
+@pytest.fixture
+def cases(tmp_path):
+    """Three cases of 10, 20 and 30 points, all expecting "ok"."""
+    result = []
+    for index, score in enumerate((10, 20, 30)):
+        expected = tmp_path / f"{index}.out"
+        expected.write_text("ok\n")
+        result.append(SimpleNamespace(
+            input_path=f"{index}.in", output_path=str(expected), score=score, order=index,
+            output_sha256=None, output_size=None
+        ))
+    return result
+
+
+def _problem(policy: ExecutionPolicy) -> SimpleNamespace:
+    # _grade_cases only reads attributes; a plain namespace keeps the ORM out of it
+    return SimpleNamespace(
+        time_limit=1000,
+        memory_limit=128,
+        core_number=1,
+        judge_type=JudgeType.standard,
+        compare_mode="exact",
+        execution_policy=policy,
+        float_tolerance=None,
+        cpus_per_task=1,
+    )
+
+
+def _runs(tmp_path, outputs):
+    """Run results as _grade_cases gets them: an output file per "OK" run, else a status."""
+    runs = []
+    for index, output in enumerate(outputs):
+        if output in ("TLE", "CANCELLED"):
+            runs.append((output, "", 1000, 0, NO_CPU))
+            continue
+        path = tmp_path / f"user_{index}.out"
+        path.write_text(output)
+        runs.append(("OK", str(path), 5, 1024, NO_CPU))
+    return iter(runs)
+
+
+@pytest.mark.parametrize("policy", [ExecutionPolicy.sequential, ExecutionPolicy.parallel_fail_fast])
+def test_fail_fast_accepted_scores_every_case(tmp_path, cases, policy):
+    status, _, details, score, _ = _grade_cases(
+        _problem(policy), cases, len(cases), _runs(tmp_path, ["ok\n", "ok\n", "ok\n"])
+    )
+    assert status == SubmissionStatus.AC
+    assert score == 60
+    assert [d["status"] for d in details] == ["AC", "AC", "AC"]
+
+
+@pytest.mark.parametrize("policy", [ExecutionPolicy.sequential, ExecutionPolicy.parallel_fail_fast])
+def test_fail_fast_failure_scores_nothing(tmp_path, cases, policy):
+    status, _, details, score, _ = _grade_cases(
+        _problem(policy), cases, len(cases), _runs(tmp_path, ["ok\n", "wrong\n", "ok\n"])
+    )
+    assert status == SubmissionStatus.WA
+    assert score == 0
+    # grading stops at the first failure
+    assert [d["status"] for d in details] == ["AC", "WA"]
+
+
+def test_parallel_fail_fast_cancelled_cases_score_nothing(tmp_path, cases):
+    status, _, details, score, _ = _grade_cases(
+        _problem(ExecutionPolicy.parallel_fail_fast), cases, len(cases),
+        _runs(tmp_path, ["ok\n", "CANCELLED", "TLE"])
+    )
+    assert status == SubmissionStatus.TLE
+    assert score == 0
+    assert [d["status"] for d in details] == ["AC", "Skipped", "TLE"]
+
+
+def test_parallel_all_keeps_partial_score(tmp_path, cases):
+    status, _, details, score, _ = _grade_cases(
+        _problem(ExecutionPolicy.parallel_all), cases, len(cases), _runs(tmp_path, ["ok\n", "wrong\n", "ok\n"])
+    )
+    assert status == SubmissionStatus.WA
+    assert score == 40
+    assert [d["status"] for d in details] == ["AC", "WA", "AC"]
+
+
+def test_missing_input_scores_nothing(tmp_path, cases):
+    status, _, details, score, _ = _grade_cases(
+        _problem(ExecutionPolicy.parallel_all), cases, 2, _runs(tmp_path, ["ok\n", "ok\n"])
+    )
+    assert status == SubmissionStatus.ERR
+    assert score == 0
+    assert details[-1] == {"status": "ERR", "msg": "Input file missing"}
+
+
+@pytest.fixture
+def finished(monkeypatch):
+    calls = []
+    monkeypatch.setattr(tasks, "_finished", calls.append)
+    return calls
+
+
+def _submission(sample_only: bool) -> SimpleNamespace:
+    return SimpleNamespace(
+        id="s1", sample_only=sample_only, status=None, score=None,
+        problem=SimpleNamespace(scaling_cores=[1, 2]),
+    )
+
+
+@pytest.mark.parametrize("sample_only, status, score", [
+    (False, SubmissionStatus.CHECKING, 60),
+    (True, SubmissionStatus.AC, 0),
+])
+def test_store_verdict_never_scores_sample_runs(finished, sample_only, status, score, monkeypatch):
+    scaled = []
+    monkeypatch.setattr(tasks.scale_submission, "delay", scaled.append)
+    sub = _submission(sample_only)
+    db = SimpleNamespace(commit=lambda: None)
+
+    _store_verdict(db, sub, tasks.PhaseTimer(), (SubmissionStatus.AC, 10, [], 60, 1024))
+
+    assert (sub.status, sub.score) == (status, score)
+    # only a full judge goes on to the scaling runs; a sample run is final
+    assert scaled == ([] if sample_only else ["s1"])
+    assert finished == ([sub] if sample_only else [])
+
+
+def test_scoreboard_ignores_sample_runs(monkeypatch):
+    monkeypatch.setattr(ScoreboardService, "_state", lambda: pytest.fail("sample run reached Redis"))
+    sub = _submission(True)
+    sub.score = 100
+
+    ScoreboardService.record(sub)
+
+
+def test_fail_drops_an_earlier_score(finished):
+    # scored before the scaling phase, which then failed
+    sub = _submission(False)
+    sub.status, sub.score = SubmissionStatus.CHECKING, 60
+    db = SimpleNamespace(rollback=lambda: None, commit=lambda: None)
+
+    tasks._fail(db, sub, "scaling run failed")
+
+    assert (sub.status, sub.score) == (SubmissionStatus.ERR, 0)
+    assert sub.result_details == {"error": "scaling run failed"}
+    assert finished == [sub]
+
+
+@pytest.mark.parametrize("status", [SubmissionStatus.ERR, SubmissionStatus.CHECKING, "System Error"])
+def test_scoreboard_ignores_unscored_statuses(monkeypatch, status):
+    monkeypatch.setattr(ScoreboardService, "_state", lambda: pytest.fail(f"{status} reached Redis"))
+    sub = _submission(False)
+    sub.status, sub.score = status, 60
+
+    ScoreboardService.record(sub)
@@ -0,0 +1,244 @@
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from app.worker import slurm
+from app.worker.slurm import CpuTime, NO_CPU
+from app.worker.transport import StubTransport, set_transport
+
+
+def _problem(**overrides) -> SimpleNamespace:
+    fields = dict(
+        time_limit=1000,
+        memory_limit=128,
+        core_number=1,
+        nodes=1,
+        tasks_per_node=None,
+        cpus_per_task=1,
+        placement="shared",
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def _completed(stdout: str = "", returncode: int = 0, stderr: str = ""):
+    return lambda args: subprocess.CompletedProcess(args, returncode, stdout=stdout, stderr=stderr)
+
+
+@pytest.fixture
+def stub():
+    def install(responses):
+        transport = StubTransport(responses)
+        set_transport(transport)
+        return transport
+
+    yield install
+    set_transport(None)
+
+
+# sbatch
+
+@pytest.mark.parametrize("stdout", ["123\n", "123;cluster\n"])
+def test_submit_array_job_parses_parsable_output(tmp_path, stub, stdout):
+    transport = stub({"sbatch": _completed(stdout)})
+
+    job_id, err = slurm.submit_array_job(str(tmp_path), ["a.in", "b.in"], _problem(), "{exe} < {input}")
+
+    assert (job_id, err) == ("123", "")
+    assert transport.calls[0][:2] == ["sbatch", "--parsable"]
+    script = (tmp_path / "job_array.slurm").read_text()
+    assert "#SBATCH --array=0-1" in script
+
+
+@pytest.mark.parametrize("n_inputs", [1, 3])
+def test_sbatch_wait_timeout_covers_slurm_time_limit(tmp_path, stub, n_inputs):
+    class TimingOut(StubTransport):
+        def run(self, args, timeout=None):
+            if args[0] == "sbatch":
+                timeouts.append(timeout)
+                raise subprocess.TimeoutExpired(args, timeout)
+            return super().run(args, timeout)
+
+    timeouts = []
+    transport = TimingOut()
+    set_transport(transport)
+    inputs = [f"{i}.in" for i in range(n_inputs)]
+
+    if n_inputs == 1:
+        slurm.run_with_slurm(str(tmp_path), inputs[0], _problem(time_limit=2500), "{exe} < {input}")
+    else:
+        slurm.run_array_with_slurm(str(tmp_path), inputs, _problem(time_limit=2500), "{exe} < {input}")
+
+    # 3 s limit + --time grace per task, as if they ran one at a time, plus queue slack
+    assert timeouts[0] == (3 + slurm.SLURM_TIME_GRACE) * n_inputs + slurm.SLURM_QUEUE_SLACK
+    assert transport.calls[-1][:2] == ["scancel", "--name"]
+
+
+def test_submit_array_job_reports_sbatch_error(tmp_path, stub):
+    stub({"sbatch": _completed("", returncode=1, stderr="sbatch: error: invalid partition")})
+
+    job_id, err = slurm.submit_array_job(str(tmp_path), ["a.in"], _problem(), "{exe} < {input}")
+
+    assert job_id is None
+    assert err == "sbatch: error: invalid partition"
+
+
+def test_submit_array_job_rejects_bad_run_command(tmp_path, stub):
+    transport = stub({})
+
+    job_id, err = slurm.submit_array_job(str(tmp_path), ["a.in"], _problem(), "{exe} < {missing}")
+
+    assert job_id is None
+    assert err.startswith("Run Command Format Error")
+    assert transport.calls == []
+
+
+# sacct
+
+SACCT_ROWS = "\n".join([
+    "123_0|COMPLETED|2|||||2026-10-18T10:00:00|2026-10-18T10:00:05|2026-10-18T10:00:07",
+    "123_0.batch|COMPLETED|2|2048K|00:01.500|00:01.200|00:00.300|2026-10-18T10:00:05|2026-10-18T10:00:05|2026-10-18T10:00:07",
+    "123_1|FAILED|1|||||2026-10-18T10:00:00|2026-10-18T10:00:05|2026-10-18T10:00:06",
+    "123_1.batch|FAILED|1|1M|00:00.500|00:00.400|00:00.100|2026-10-18T10:00:05|2026-10-18T10:00:05|2026-10-18T10:00:06",
+    "124_0|RUNNING|3|||||2026-10-18T10:00:00|2026-10-18T10:00:04|Unknown",
+    "124_1|FAILED|0|||||2026-10-18T10:00:00|2026-10-18T10:00:04|2026-10-18T10:00:04",
+    "999_0|COMPLETED|1|||||2026-10-18T10:00:00|2026-10-18T10:00:01|2026-10-18T10:00:02",
+])
+
+
+def test_poll_array_jobs_groups_task_rows(stub):
+    stub({"sacct": _completed(SACCT_ROWS)})
+
+    finished, failing, timelines = slurm.poll_array_jobs(["123", "124"])
+
+    # 124 still has a running task, 999 was not asked for
+    assert set(finished) == {"123"}
+    ok, failed = finished["123"]
+    assert ok == ("COMPLETED", 2000, 2048, CpuTime(1500, 1200, 300))
+    assert failed[0] == "FAILED"
+    assert failed[2] == 1024
+    assert failing == {"124"}
+    assert timelines == {"123": (5.0, 2.0)}
+
+
+@pytest.mark.parametrize("raw, tasks", [
+    ("124_[0-1]", [0, 1]),
+    ("124_[0-3%1]", [0, 1, 2, 3]),
+    ("124_[1,4-5]", [1, 4, 5]),
+    ("124_2", []),
+    ("124", []),
+])
+def test_array_range_tasks(raw, tasks):
+    assert slurm._array_range_tasks(raw) == tasks
+
+
+def test_poll_array_jobs_finishes_cancelled_range_row(stub):
+    # cancelled while pending: sacct only ever reports the range row
+    stub({"sacct": _completed("124_[0-1]|CANCELLED by 0|0|||||2026-10-18T10:00:00|None|2026-10-18T10:01:00")})
+
+    finished, failing, timelines = slurm.poll_array_jobs(["124"])
+
+    assert finished == {"124": [("CANCELLED", 0, 0, NO_CPU), ("CANCELLED", 0, 0, NO_CPU)]}
+    assert failing == set()
+    assert timelines == {}
+
+
+def test_poll_array_jobs_waits_on_pending_range_row(stub):
+    stub({"sacct": _completed("\n".join([
+        "125_0|COMPLETED|1|||||2026-10-18T10:00:00|2026-10-18T10:00:01|2026-10-18T10:00:02",
+        "125_[1-2]|PENDING|0|||||2026-10-18T10:00:00|Unknown|Unknown",
+    ]))})
+
+    finished, failing, _ = slurm.poll_array_jobs(["125"])
+
+    assert finished == {}
+    assert failing == set()
+
+
+def test_poll_array_jobs_survives_sacct_error(stub):
+    def boom(args):
+        raise subprocess.TimeoutExpired(args, 30)
+
+    stub({"sacct": boom})
+
+    assert slurm.poll_array_jobs(["123"]) == ({}, set(), {})
+
+
+# _collect_run_result
+
+@pytest.fixture
+def files(tmp_path):
+    return SimpleNamespace(
+        output=str(tmp_path / "slurm.out"),
+        error=str(tmp_path / "slurm.err"),
+        time=str(tmp_path / "slurm.time"),
+    )
+
+
+def _collect(files, state="COMPLETED", time_ms=1000, memory_kb=1024, returncode=0, **problem):
+    return slurm._collect_run_result(
+        state, time_ms, memory_kb, NO_CPU, files.output, files.error, files.time, _problem(**problem), returncode
+    )
+
+
+def _write(path: str, text: str) -> None:
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_collect_ok_prefers_time_file(files):
+    _write(files.output, "42\n")
+    _write(files.time, "317 0\n")
+
+    assert _collect(files) == ("OK", files.output, 317, 1024, NO_CPU)
+
+
+def test_collect_ok_creates_missing_output(files):
+    status, output, *_ = _collect(files)
+
+    assert status == "OK"
+    assert open(output).read() == ""
+
+
+@pytest.mark.parametrize("state, time_file", [
+    ("TIMEOUT", None),
+    ("COMPLETED", f"1000 {slurm.TIMEOUT_EXIT_CODE}"),
+    ("COMPLETED", "1500 0"),
+])
+def test_collect_tle(files, state, time_file):
+    if time_file:
+        _write(files.time, time_file)
+
+    assert _collect(files, state=state)[:3] == ("TLE", "", 1000)
+
+
+@pytest.mark.parametrize("state, memory_kb", [("OUT_OF_MEMORY", 1024), ("COMPLETED", 129 * 1024)])
+def test_collect_mle(files, state, memory_kb):
+    assert _collect(files, state=state, memory_kb=memory_kb)[0] == "MLE"
+
+
+def test_collect_re_shows_stderr(files):
+    _write(files.error, "Segmentation fault\n")
+
+    assert _collect(files, state="FAILED")[:2] == ("RE", "Segmentation fault")
+
+
+def test_collect_re_hides_slurm_messages(files):
+    _write(files.error, "slurmstepd: error: task 0 exited with exit code 1\n")
+
+    assert _collect(files, returncode=1)[:2] == ("RE", "Runtime Error")
+
+
+def test_collect_cancelled(files):
+    assert _collect(files, state="CANCELLED")[:2] == ("CANCELLED", "Cancelled")
+
+
+def test_collect_time_limit_override(files):
+    _write(files.time, "1500 0")
+
+    assert _collect(files)[0] == "TLE"
+    result = slurm._collect_run_result(
+        "COMPLETED", 0, 0, NO_CPU, files.output, files.error, files.time, _problem(), time_limit=2000
+    )
+    assert result[:3] == ("OK", files.output, 1500)
@@ -0,0 +1,63 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.testdata_service import file_manifest
+from app.worker import testdata
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(testdata, "DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(testdata, "TESTDATA_CACHE_DIR", str(tmp_path / "cache"))
+    os.makedirs(tmp_path / "data")
+    return tmp_path / "data"
+
+
+def _case(data_dir, content: bytes) -> SimpleNamespace:
+    (data_dir / "1.out").write_bytes(content)
+    info = file_manifest(str(data_dir / "1.out"))
+    return SimpleNamespace(
+        output_path="1.out", output_size=info["size"], output_sha256=info["sha256"], output_mtime_ns=info["mtime_ns"]
+    )
+
+
+def _user_output(tmp_path, content: bytes) -> str:
+    path = tmp_path / "user.out"
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_matches_expected_by_hash(tmp_path, data_dir):
+    case = _case(data_dir, b"42\n")
+
+    assert testdata.matches_expected(_user_output(tmp_path, b"42\n"), case)
+    assert not testdata.matches_expected(_user_output(tmp_path, b"43\n"), case)
+
+
+def test_replaced_test_data_is_not_matched_by_its_old_hash(tmp_path, data_dir):
+    case = _case(data_dir, b"42\n")
+    # same size, new answer, as after a data fix on disk
+    (data_dir / "1.out").write_bytes(b"43\n")
+    os.utime(data_dir / "1.out", ns=(case.output_mtime_ns + 10**9, case.output_mtime_ns + 10**9))
+
+    assert not testdata.matches_expected(_user_output(tmp_path, b"42\n"), case)
+    # and the checker reads the new file, not a copy cached under the old hash
+    assert testdata.expected_output_path(case) == str(data_dir / "1.out")
+
+
+def test_manifest_without_mtime_is_not_trusted(tmp_path, data_dir):
+    case = _case(data_dir, b"42\n")
+    case.output_mtime_ns = None
+
+    assert not testdata.matches_expected(_user_output(tmp_path, b"42\n"), case)
+
+
+def test_expected_output_is_cached_by_hash(data_dir):
+    case = _case(data_dir, b"42\n")
+
+    local_path = testdata.expected_output_path(case)
+
+    assert local_path == os.path.join(testdata.TESTDATA_CACHE_DIR, case.output_sha256)
+    assert open(local_path, "rb").read() == b"42\n"
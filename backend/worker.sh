@@ -0,0 +1,13 @@
+#!/bin/sh
+
+set -e
+
+# prometheus_client (multiprocess mode) opens its per-process files as soon as
+# the task modules are imported, before any Celery signal fires, so the
+# directory has to be emptied of the previous run and created here.
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+exec "$@"